@@ -1,18 +1,18 @@
 """Entrypoint for quiz-api application."""
 
 import json
+import time
 from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import Depends, FastAPI
-from sqlalchemy import update
-from sqlmodel import Session
 
 from quiz_api.config import config
 from quiz_api.const import API_PREFIX
-from quiz_api.db import Database, db_engine
-from quiz_api.log import logger
-from quiz_api.models import User
+from quiz_api.db import QueryStatsMiddleware
+from quiz_api.jobs import job_runner
+from quiz_api.log import RequestLogMiddleware, logger
+from quiz_api.metrics import MetricsMiddleware, get_metrics
 from quiz_api.routers.assignment_answer_router import assignment_answer_router
 from quiz_api.routers.assignment_option_router import assignment_option_router
 from quiz_api.routers.assignment_question_router import assignment_question_router
@@ -21,6 +21,7 @@ from quiz_api.routers.gap_text_answer_router import gap_text_answer_router
 from quiz_api.routers.gap_text_option_router import gap_text_option_router
 from quiz_api.routers.gap_text_question_router import gap_text_question_router
 from quiz_api.routers.gap_text_sub_question_router import gap_text_sub_question_router
+from quiz_api.routers.job_router import job_router
 from quiz_api.routers.label_router import label_router
 from quiz_api.routers.multiple_choice_answer_router import multiple_choice_answer_router
 from quiz_api.routers.multiple_choice_option_router import multiple_choice_option_router
@@ -36,7 +37,8 @@ from quiz_api.routers.single_choice_answer_router import single_choice_answer_ro
 from quiz_api.routers.single_choice_option_router import single_choice_option_router
 from quiz_api.routers.single_choice_question_router import single_choice_question_router
 from quiz_api.routers.user_router import user_router
-from quiz_api.security import get_current_user, get_password_hash, get_user
+from quiz_api.security import get_current_user, hash_pool
+from quiz_api.startup import run_startup
 
 
 @asynccontextmanager
@@ -45,70 +47,31 @@ async def lifespan(app: FastAPI):
 
     logger.info("Starting application.")
 
-    Database.create_db()
+    start = time.perf_counter()
+    timings = await run_startup()
+    report = ", ".join(f"{name}: {seconds:.3f}s" for name, seconds in timings.items())
 
-    try:
-        Database.run_migrations()
-    except Exception as e:
-        logger.error(f"Error running migrations: {e}")
-
-    test_user = get_user(config.test_username)
-    test_password_hash = get_password_hash(config.test_password)
-
-    if test_user is not None:
-        test_user.hashed_password = test_password_hash
-
-        with Session(db_engine) as session:
-            session.exec(
-                update(User)
-                .where(User.username == config.test_username)
-                .values(hashed_password=test_password_hash)
-            )
-            session.commit()
-    else:
-        test_user = User(
-            username=config.test_username,
-            hashed_password=test_password_hash,
-            is_admin=False,
-        )
-
-        with Session(db_engine) as session:
-            session.add(test_user)
-            session.commit()
-
-    admin_user = get_user(config.admin_username)
-    admin_password_hash = get_password_hash(config.admin_password)
-
-    if admin_user is not None:
-        admin_user.hashed_password = admin_password_hash
-
-        with Session(db_engine) as session:
-            session.exec(
-                update(User)
-                .where(User.username == config.admin_username)
-                .values(hashed_password=admin_password_hash)
-            )
-            session.commit()
-    else:
-        admin_user = User(
-            username=config.admin_username,
-            hashed_password=admin_password_hash,
-            is_admin=True,
-        )
-
-        with Session(db_engine) as session:
-            session.add(admin_user)
-            session.commit()
+    logger.info(
+        f"Application started in {time.perf_counter() - start:.3f}s ({report})."
+    )
 
-    logger.info("Application started.")
+    job_runner.start()
 
     yield
 
     logger.info("Stopping application.")
+
+    await job_runner.stop()
+    hash_pool.shutdown()
+
     logger.info("Application stopped.")
 
 
 app = FastAPI(title="quiz-api", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(RequestLogMiddleware)
+app.add_route("/metrics", get_metrics, include_in_schema=False)
 
 app.include_router(auth_router, prefix=API_PREFIX)
 app.include_router(
@@ -199,6 +162,9 @@ app.include_router(
 app.include_router(
     label_router, prefix=API_PREFIX, dependencies=[Depends(get_current_user)]
 )
+app.include_router(
+    job_router, prefix=API_PREFIX, dependencies=[Depends(get_current_user)]
+)
 
 
 def start():
@@ -209,7 +175,11 @@ def start():
             app,
             host=config.host,
             port=config.port,
-            log_level="warning",
+            # Keep the queued handlers and levels of the application, which
+            # logs requests itself.
+            log_config=None,
+            log_level=None,
+            access_log=False,
         )
     except KeyboardInterrupt:
         pass
@@ -1 +1,7 @@
-from quiz_api.__main__ import app as app
+from quiz_api.processes import prepare_metrics_path
+
+# Servers like Unit run several worker processes, which share their metrics
+# through files. This has to be set up before the metrics are created.
+prepare_metrics_path()
+
+from quiz_api.__main__ import app as app  # noqa: E402
@@ -0,0 +1 @@
+"""Benchmarks for the quiz-api application."""
@@ -0,0 +1,496 @@
+"""Synthetic dataset generator for scale testing the quiz-api application.
+
+Rows are written with multi-row INSERTs straight into the tables of
+``quiz_api.models``, bypassing the API. Quiz popularity and user activity
+follow Zipf distributions, question counts, difficulties and user skill vary,
+and every answer is scored by the rules of the grading engine, so results
+look like the ones ``submit_quiz`` stores.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Sequence
+
+from sqlalchemy import func, insert
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from quiz_api.db import async_db_engine
+from quiz_api.deletion import OPTION_MODELS
+from quiz_api.grading import get_weight
+from quiz_api.models import (
+    ANSWER_MODELS,
+    QUESTION_MODELS_BY_TYPE,
+    GapTextOption,
+    GapTextSubQuestion,
+    Label,
+    Quiz,
+    QuizLabelRelation,
+    Result,
+    User,
+)
+from quiz_api.security import hash_password
+from quiz_api.startup import prepare_db
+
+DATASET_PASSWORD = "dataset"
+DIFFICULTY_SHARES = {"easy": 5, "medium": 3, "hard": 2}
+DIFFICULTY_SUCCESS = {"easy": 1.0, "medium": 0.8, "hard": 0.6}
+PRACTICE_SHARE = 0.2
+SKIP_SHARE = 0.05
+ZIPF_EXPONENT = 1.1
+MAX_LABELS_PER_QUIZ = 3
+GAPS_PER_QUESTION = (2, 4)
+OPTIONS_PER_GAP = 3
+RESULT_BATCH_SIZE = 5000
+RESULT_PERIOD = timedelta(days=365)
+
+
+@dataclass
+class DatasetSize:
+    """Volumes of a synthetic dataset.
+
+    Quizzes get between none and twice ``questions_per_type`` questions of
+    every type, so with the defaults every result has about ten answers.
+    """
+
+    quizzes: int = 10_000
+    questions_per_type: int = 2
+    options: int = 4
+    users: int = 1_000
+    labels: int = 500
+    results: int = 100_000
+
+
+@dataclass
+class GeneratedQuestion:
+    """A generated question with what its answers need to know about it."""
+
+    question_type: str
+    quiz_id: int
+    index: int
+    difficulty: str
+    values: dict
+    options: list[dict]
+    correct: Any
+    gaps: list[list[dict]] = field(default_factory=list)
+    id: int | None = None
+
+    @property
+    def max_score(self) -> int:
+        # Every gap is weighted like a question of its own.
+        return get_weight(self.difficulty) * max(len(self.gaps), 1)
+
+
+def get_zipf_weights(count: int, rng: random.Random) -> list[float]:
+    """Get cumulative Zipf weights for items in a random popularity order."""
+
+    weights = [1 / rank**ZIPF_EXPONENT for rank in range(1, count + 1)]
+    rng.shuffle(weights)
+
+    return list(itertools.accumulate(weights))
+
+
+def build_question(
+    question_type: str, quiz_id: int, index: int, size: DatasetSize, rng: random.Random
+) -> GeneratedQuestion:
+    """Build a question of a type with its options and solution."""
+
+    option_count = rng.randint(max(2, size.options - 2), size.options + 2)
+    options = [{} for _ in range(option_count)]
+    gaps = []
+    values: dict = {}
+
+    if question_type == "single_choice":
+        correct = values["correct_index"] = rng.randrange(option_count)
+    elif question_type == "multiple_choice":
+        correct = sorted(
+            rng.sample(range(option_count), rng.randint(1, option_count - 1))
+        )
+        values["correct_indices"] = correct
+    elif question_type == "open":
+        correct = [f"keyword{number}" for number in range(rng.randint(1, 2))]
+        options = [{"text": keyword} for keyword in correct]
+    elif question_type == "assignment":
+        correct = values["correct_indices"] = rng.sample(
+            range(option_count), option_count
+        )
+        options = [{"correct_index": option_index} for option_index in correct]
+    else:
+        gaps = [
+            [{} for _ in range(OPTIONS_PER_GAP)]
+            for _ in range(rng.randint(*GAPS_PER_QUESTION))
+        ]
+        correct = values["correct_indices"] = [
+            rng.randrange(OPTIONS_PER_GAP) for _ in gaps
+        ]
+        options = []
+
+    return GeneratedQuestion(
+        question_type=question_type,
+        quiz_id=quiz_id,
+        index=index,
+        difficulty=rng.choices(
+            list(DIFFICULTY_SHARES), weights=list(DIFFICULTY_SHARES.values())
+        )[0],
+        values=values,
+        options=options,
+        correct=correct,
+        gaps=gaps,
+    )
+
+
+def build_response(
+    question: GeneratedQuestion, is_correct: bool, rng: random.Random
+) -> dict:
+    """Build the response columns of a correct or wrong answer to a question."""
+
+    if question.question_type == "single_choice":
+        wrong = [
+            index for index in range(len(question.options)) if index != question.correct
+        ]
+        return {"selected_index": question.correct if is_correct else rng.choice(wrong)}
+
+    if question.question_type == "open":
+        return {"text": " ".join(question.correct) if is_correct else "No idea."}
+
+    selected = list(question.correct)
+
+    if not is_correct and question.question_type == "multiple_choice":
+        selected = sorted(set(selected) ^ {rng.randrange(len(question.options))})
+    elif not is_correct:
+        selected[0] = (selected[0] + 1) % OPTIONS_PER_GAP
+
+    return {"selected_indices": selected}
+
+
+async def insert_rows(
+    session: AsyncSession, model: type[SQLModel], values: Sequence[dict]
+) -> None:
+    """Insert rows of one model.
+
+    The rows are sent as one executemany, which SQLAlchemy batches into
+    multi-row INSERTs without compiling a new statement for every batch.
+    """
+
+    if values:
+        await session.exec(insert(model), params=list(values))
+
+
+async def insert_ids(
+    session: AsyncSession, model: type[SQLModel], values: Sequence[dict]
+) -> list[int]:
+    """Insert rows of one model and get their IDs in the order of the values."""
+
+    if not values:
+        return []
+
+    result = await session.exec(insert(model).returning(model.id), params=list(values))
+
+    # The generated database has no other writers, so the IDs of the rows are
+    # ascending. Sorting them keeps the batches that sort_by_parameter_order
+    # would split into single rows on SQLite.
+    return sorted(result.scalars())
+
+
+async def insert_options(
+    session: AsyncSession,
+    model: type[SQLModel],
+    options: list[tuple[int, list[dict]]],
+    foreign_key: str,
+) -> int:
+    """Insert the options of parents, numbered per parent."""
+
+    values = [
+        {
+            "text": f"Option {index}",
+            "index": index,
+            **option,
+            foreign_key: parent_id,
+        }
+        for parent_id, parent_options in options
+        for index, option in enumerate(parent_options)
+    ]
+    await insert_rows(session, model, values)
+
+    return len(values)
+
+
+async def generate_quizzes(
+    session: AsyncSession, size: DatasetSize, rng: random.Random, counts: dict
+) -> dict[int, list[GeneratedQuestion]]:
+    """Insert quizzes with their labels, questions and options."""
+
+    quiz_ids = await insert_ids(
+        session,
+        Quiz,
+        [
+            {"title": f"Quiz {index}", "is_practice": rng.random() < PRACTICE_SHARE}
+            for index in range(size.quizzes)
+        ],
+    )
+    counts[Quiz.__tablename__] = len(quiz_ids)
+
+    # Label texts are unique, so they continue after the existing labels.
+    label_offset = (await session.exec(select(func.count(Label.id)))).one()
+    label_ids = await insert_ids(
+        session,
+        Label,
+        [{"text": f"Label {label_offset + index}"} for index in range(size.labels)],
+    )
+    counts[Label.__tablename__] = len(label_ids)
+
+    if label_ids:
+        label_weights = get_zipf_weights(len(label_ids), rng)
+        relations = [
+            {"quiz_id": quiz_id, "label_id": label_id}
+            for quiz_id in quiz_ids
+            for label_id in set(
+                rng.choices(
+                    label_ids,
+                    cum_weights=label_weights,
+                    k=rng.randint(0, MAX_LABELS_PER_QUIZ),
+                )
+            )
+        ]
+        await insert_rows(session, QuizLabelRelation, relations)
+        counts[QuizLabelRelation.__tablename__] = len(relations)
+
+    questions: dict[int, list[GeneratedQuestion]] = {
+        quiz_id: [] for quiz_id in quiz_ids
+    }
+
+    for question_type, question_model in QUESTION_MODELS_BY_TYPE.items():
+        generated = [
+            build_question(question_type, quiz_id, index, size, rng)
+            for quiz_id in quiz_ids
+            for index in range(rng.randint(0, 2 * size.questions_per_type))
+        ]
+        question_ids = await insert_ids(
+            session,
+            question_model,
+            [
+                {
+                    "quiz_id": question.quiz_id,
+                    "title": f"Question {question.index}",
+                    "text": "Answer the question.",
+                    "index": question.index,
+                    "difficulty": question.difficulty,
+                    **question.values,
+                }
+                for question in generated
+            ],
+        )
+        counts[question_model.__tablename__] = len(question_ids)
+
+        for question, question_id in zip(generated, question_ids):
+            question.id = question_id
+            questions[question.quiz_id].append(question)
+
+        if question_model in OPTION_MODELS:
+            option_model = OPTION_MODELS[question_model]
+            counts[option_model.__tablename__] = await insert_options(
+                session,
+                option_model,
+                [(question.id, question.options) for question in generated],
+                "question_id",
+            )
+            continue
+
+        gaps = [(question.id, question.gaps) for question in generated]
+        sub_question_ids = await insert_ids(
+            session,
+            GapTextSubQuestion,
+            [
+                {"question_id": question_id, "index": index}
+                for question_id, question_gaps in gaps
+                for index in range(len(question_gaps))
+            ],
+        )
+        counts[GapTextSubQuestion.__tablename__] = len(sub_question_ids)
+        counts[GapTextOption.__tablename__] = await insert_options(
+            session,
+            GapTextOption,
+            list(
+                zip(
+                    sub_question_ids,
+                    (gap for _, question_gaps in gaps for gap in question_gaps),
+                )
+            ),
+            "sub_question_id",
+        )
+
+    return questions
+
+
+async def generate_users(
+    session: AsyncSession, size: DatasetSize, counts: dict
+) -> list[int]:
+    """Insert non-admin users sharing the dataset password."""
+
+    user_offset = (await session.exec(select(func.count(User.id)))).one()
+    hashed_password = await hash_password(DATASET_PASSWORD)
+    user_ids = await insert_ids(
+        session,
+        User,
+        [
+            {
+                "username": f"user{user_offset + index}",
+                "hashed_password": hashed_password,
+                "is_admin": False,
+            }
+            for index in range(size.users)
+        ],
+    )
+    counts[User.__tablename__] = len(user_ids)
+
+    return user_ids
+
+
+async def generate_results(
+    session: AsyncSession,
+    size: DatasetSize,
+    rng: random.Random,
+    questions: dict[int, list[GeneratedQuestion]],
+    user_ids: list[int],
+    counts: dict,
+) -> None:
+    """Insert results with scored answers, oldest first, in batches."""
+
+    quiz_ids = list(questions)
+    quiz_weights = get_zipf_weights(len(quiz_ids), rng)
+    user_weights = get_zipf_weights(len(user_ids), rng)
+    skills = {user_id: rng.betavariate(4, 2) for user_id in user_ids}
+    end = datetime.now(timezone.utc)
+    offsets = sorted(
+        (rng.uniform(0, RESULT_PERIOD.total_seconds()) for _ in range(size.results)),
+        reverse=True,
+    )
+    counts[Result.__tablename__] = 0
+
+    for question_type in ANSWER_MODELS:
+        counts[ANSWER_MODELS[question_type].__tablename__] = 0
+
+    for start in range(0, size.results, RESULT_BATCH_SIZE):
+        results = []
+        answers: dict[str, list[dict]] = {
+            question_type: [] for question_type in ANSWER_MODELS
+        }
+
+        for offset in offsets[start : start + RESULT_BATCH_SIZE]:
+            quiz_id = rng.choices(quiz_ids, cum_weights=quiz_weights)[0]
+            user_id = rng.choices(user_ids, cum_weights=user_weights)[0]
+            result_answers = []
+
+            for question in questions[quiz_id]:
+                if rng.random() < SKIP_SHARE:
+                    continue
+
+                is_correct = (
+                    rng.random()
+                    < skills[user_id] * DIFFICULTY_SUCCESS[question.difficulty]
+                )
+                result_answers.append(
+                    (
+                        question.question_type,
+                        {
+                            "question_id": question.id,
+                            "score": question.max_score if is_correct else 0,
+                            "max_score": question.max_score,
+                            **build_response(question, is_correct, rng),
+                        },
+                    )
+                )
+
+            results.append(
+                (
+                    {
+                        "quiz_id": quiz_id,
+                        "user_id": user_id,
+                        "score": sum(answer["score"] for _, answer in result_answers),
+                        "max_score": sum(
+                            answer["max_score"] for _, answer in result_answers
+                        ),
+                        "created_at": end - timedelta(seconds=offset),
+                    },
+                    result_answers,
+                )
+            )
+
+        result_ids = await insert_ids(
+            session, Result, [result for result, _ in results]
+        )
+        counts[Result.__tablename__] += len(result_ids)
+
+        for result_id, (_, result_answers) in zip(result_ids, results):
+            for question_type, answer in result_answers:
+                answers[question_type].append({**answer, "result_id": result_id})
+
+        for question_type, answer_model in ANSWER_MODELS.items():
+            await insert_rows(session, answer_model, answers[question_type])
+            counts[answer_model.__tablename__] += len(answers[question_type])
+
+
+async def generate(
+    session: AsyncSession, size: DatasetSize, seed: int = 0
+) -> dict[str, int]:
+    """Insert a synthetic dataset and get the number of rows by table.
+
+    The caller commits, so the dataset is written in one transaction.
+    """
+
+    rng = random.Random(seed)
+    counts: dict[str, int] = {}
+    questions = await generate_quizzes(session, size, rng, counts)
+    user_ids = await generate_users(session, size, counts)
+
+    if user_ids and questions:
+        await generate_results(session, size, rng, questions, user_ids, counts)
+
+    return counts
+
+
+async def generate_dataset(size: DatasetSize, seed: int) -> dict[str, int]:
+    """Create or migrate the database and insert a synthetic dataset."""
+
+    prepare_db()
+
+    async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+        counts = await generate(session, size, seed)
+        await session.commit()
+
+    await async_db_engine.dispose()
+
+    return counts
+
+
+def main():
+    """Generate a synthetic dataset in the configured database."""
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+
+    for name, default in vars(DatasetSize()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    size = DatasetSize(**{name: getattr(args, name) for name in vars(DatasetSize())})
+    start = time.perf_counter()
+    counts = asyncio.run(generate_dataset(size, args.seed))
+
+    print(
+        json.dumps(
+            {"rows": counts, "seconds": round(time.perf_counter() - start, 3)},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Isolated application environments for the benchmarks."""
+
+from pathlib import Path
+
+import yaml
+
+ADMIN_PASSWORD = "benchmark-admin"
+TEST_PASSWORD = "benchmark-test"
+
+
+def write_config(path: Path, **overrides) -> Path:
+    """Write a config keeping the database and all state files in a directory."""
+
+    config_path = path / "config.yml"
+    config_dict = {
+        "secret_key": "benchmark-secret-key-benchmark-secret-key",
+        "admin_username": "admin",
+        "admin_password": ADMIN_PASSWORD,
+        "test_username": "test",
+        "test_password": TEST_PASSWORD,
+        "debug": False,
+        "log_level": "ERROR",
+        "db_url": f"sqlite:///{path}/quiz-api.db",
+        "log_path": str(path / "quiz-api.log"),
+        "startup_state_path": str(path / "quiz-api.startup.json"),
+        "metrics_path": str(path / "metrics"),
+        **overrides,
+    }
+
+    with open(config_path, "w", encoding="utf-8") as config_file:
+        yaml.safe_dump(config_dict, config_file)
+
+    return config_path
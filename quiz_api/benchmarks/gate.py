@@ -0,0 +1,206 @@
+"""Benchmark regression gate comparing a load test against a stored baseline.
+
+The load test report of every run is stored under the git revision it was run
+on. The run fails when the p95 latency or statements per request of an
+operation, or the memory per request of a scenario, grew beyond the tolerance
+compared to the baseline. Options after ``--`` are passed to the load test.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import NamedTuple
+
+DEFAULT_RESULTS_PATH = Path("benchmark-results")
+DEFAULT_BASELINE_PATH = Path("benchmark-baseline.json")
+
+# Metrics with the section of the report they are in, the tolerance option
+# applying to them and the least absolute increase counting as a regression.
+GATED_METRICS = {
+    "p95_ms": ("operations", "latency_tolerance", 1.0),
+    "statements_per_request": ("operations", "statements_tolerance", 0.5),
+    "memory_kb_per_request": ("scenarios", "memory_tolerance", 64.0),
+}
+
+
+class Comparison(NamedTuple):
+    """A metric of the current run compared to the baseline."""
+
+    name: str
+    metric: str
+    baseline: float | None
+    current: float | None
+    regressed: bool
+
+
+def get_revision() -> str:
+    """Get the checked out git revision, marked if the tree has changes."""
+
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    revision = git("rev-parse", "--short", "HEAD")
+
+    return f"{revision}-dirty" if git("status", "--porcelain") else revision
+
+
+def run_load_test(load_args: list[str]) -> dict:
+    """Run the load test and get its report."""
+
+    with tempfile.TemporaryDirectory() as path:
+        report_path = Path(path) / "report.json"
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "quiz_api.benchmarks.load",
+                *load_args,
+                "--output",
+                str(report_path),
+            ],
+            check=True,
+        )
+
+        return json.loads(report_path.read_text(encoding="utf-8"))
+
+
+def compare(baseline: dict, current: dict, tolerances: dict[str, float]) -> list:
+    """Compare the gated metrics of two load test reports."""
+
+    comparisons = []
+
+    for metric, (section, tolerance_name, min_increase) in GATED_METRICS.items():
+        names = sorted(set(baseline[section]) | set(current[section]))
+
+        for name in names:
+            baseline_value = baseline[section].get(name, {}).get(metric)
+            current_value = current[section].get(name, {}).get(metric)
+
+            if baseline_value is None:
+                regressed = False
+            elif current_value is None:
+                regressed = name not in current[section]
+            else:
+                increase = current_value - baseline_value
+                regressed = (
+                    increase >= min_increase
+                    and current_value
+                    > baseline_value * (1 + tolerances[tolerance_name])
+                )
+
+            comparisons.append(
+                Comparison(name, metric, baseline_value, current_value, regressed)
+            )
+
+    return comparisons
+
+
+def format_table(comparisons: list[Comparison]) -> str:
+    """Format comparisons as a table."""
+
+    def format_value(value: float | None) -> str:
+        return "-" if value is None else f"{value:.2f}"
+
+    def format_change(comparison: Comparison) -> str:
+        if comparison.baseline is None or comparison.current is None:
+            return "-"
+
+        if comparison.baseline == 0:
+            return "+inf%" if comparison.current > 0 else "0.0%"
+
+        return f"{(comparison.current / comparison.baseline - 1) * 100:+.1f}%"
+
+    rows = [("name", "metric", "baseline", "current", "change", "")]
+    rows.extend(
+        (
+            comparison.name,
+            comparison.metric,
+            format_value(comparison.baseline),
+            format_value(comparison.current),
+            format_change(comparison),
+            "REGRESSED" if comparison.regressed else "",
+        )
+        for comparison in comparisons
+    )
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+
+    return "\n".join(
+        "  ".join(
+            value.ljust(width) if column < 2 else value.rjust(width)
+            for column, (value, width) in enumerate(zip(row, widths))
+        ).rstrip()
+        for row in rows
+    )
+
+
+def main():
+    """Run the load test and compare it against the baseline."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=Path, default=DEFAULT_RESULTS_PATH)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store this run as the baseline instead of comparing against it.",
+    )
+    parser.add_argument("--latency-tolerance", type=float, default=0.25)
+    parser.add_argument("--statements-tolerance", type=float, default=0.1)
+    parser.add_argument("--memory-tolerance", type=float, default=0.5)
+    parser.add_argument("load_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    load_args = args.load_args[1:] if args.load_args[:1] == ["--"] else args.load_args
+    run = {
+        "revision": get_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "load_args": load_args,
+        "report": run_load_test(load_args),
+    }
+
+    args.results.mkdir(parents=True, exist_ok=True)
+    result_path = args.results / f"{run['revision']}.json"
+    result_path.write_text(json.dumps(run, indent=2) + "\n", encoding="utf-8")
+    print(f"Stored results of {run['revision']} in {result_path}.")
+
+    if args.update_baseline or not args.baseline.exists():
+        args.baseline.write_text(json.dumps(run, indent=2) + "\n", encoding="utf-8")
+        print(f"Stored results of {run['revision']} as baseline in {args.baseline}.")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    if baseline["load_args"] != load_args:
+        sys.exit(
+            f"The baseline of {baseline['revision']} was run with load test options "
+            f"{baseline['load_args']}, not {load_args}."
+        )
+
+    comparisons = compare(
+        baseline["report"],
+        run["report"],
+        {
+            "latency_tolerance": args.latency_tolerance,
+            "statements_tolerance": args.statements_tolerance,
+            "memory_tolerance": args.memory_tolerance,
+        },
+    )
+    print(f"Comparing {run['revision']} against baseline {baseline['revision']}:\n")
+    print(format_table(comparisons))
+
+    regressions = sum(comparison.regressed for comparison in comparisons)
+
+    if regressions:
+        sys.exit(f"\n{regressions} metrics regressed beyond the tolerance.")
+
+    print("\nNo metrics regressed beyond the tolerance.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark of the grading engine, isolated from the database."""
+
+import argparse
+import json
+import random
+import time
+
+from quiz_api.grading import AnswerKey, QuestionKey, grade_answer
+from quiz_api.models import (
+    AssignmentAnswerCreate,
+    GapTextAnswerCreate,
+    MultipleChoiceAnswerCreate,
+    OpenAnswerCreate,
+    SingleChoiceAnswerCreate,
+)
+
+QUESTIONS_PER_TYPE = 50
+
+
+def build_answer_key(rng: random.Random) -> AnswerKey:
+    """Build a synthetic answer key."""
+
+    question_ids = range(QUESTIONS_PER_TYPE)
+
+    return AnswerKey(
+        version=1,
+        questions={
+            "single_choice": {
+                i: QuestionKey(max_score=rng.randint(1, 3), correct=rng.randrange(4))
+                for i in question_ids
+            },
+            "multiple_choice": {
+                i: QuestionKey(
+                    max_score=rng.randint(1, 3),
+                    correct=frozenset(rng.sample(range(6), 3)),
+                )
+                for i in question_ids
+            },
+            "open": {
+                i: QuestionKey(
+                    max_score=rng.randint(1, 3),
+                    correct=tuple(f"keyword{j}" for j in range(rng.randint(1, 3))),
+                )
+                for i in question_ids
+            },
+            "assignment": {
+                i: QuestionKey(
+                    max_score=rng.randint(1, 3), correct=rng.sample(range(4), 4)
+                )
+                for i in question_ids
+            },
+            "gap_text": {
+                i: QuestionKey(max_score=rng.randint(1, 3) * 3, correct=[0, 1, 2])
+                for i in question_ids
+            },
+        },
+    )
+
+
+def build_answers(rng: random.Random, count: int) -> dict[str, list]:
+    """Build synthetic answers for every question type."""
+
+    def question_id() -> int:
+        return rng.randrange(QUESTIONS_PER_TYPE)
+
+    return {
+        "single_choice": [
+            SingleChoiceAnswerCreate(
+                question_id=question_id(), selected_index=rng.randrange(4)
+            )
+            for _ in range(count)
+        ],
+        "multiple_choice": [
+            MultipleChoiceAnswerCreate(
+                question_id=question_id(), selected_indices=rng.sample(range(6), 3)
+            )
+            for _ in range(count)
+        ],
+        "open": [
+            OpenAnswerCreate(
+                question_id=question_id(),
+                text=" ".join(f"Keyword{rng.randrange(3)}" for _ in range(8)),
+            )
+            for _ in range(count)
+        ],
+        "assignment": [
+            AssignmentAnswerCreate(
+                question_id=question_id(), selected_indices=rng.sample(range(4), 4)
+            )
+            for _ in range(count)
+        ],
+        "gap_text": [
+            GapTextAnswerCreate(
+                question_id=question_id(), selected_indices=rng.sample(range(3), 3)
+            )
+            for _ in range(count)
+        ],
+    }
+
+
+def run(count: int, repeat: int, seed: int) -> dict[str, float]:
+    """Grade the answers of every question type and get the best time per answer."""
+
+    rng = random.Random(seed)
+    answer_key = build_answer_key(rng)
+    answers = build_answers(rng, count)
+    results: dict[str, float] = {}
+
+    for question_type, type_answers in answers.items():
+        best = float("inf")
+
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+
+            for answer in type_answers:
+                grade_answer(answer_key, question_type, answer)
+
+            best = min(best, time.perf_counter_ns() - start)
+
+        results[question_type] = best / count
+
+    return results
+
+
+def main():
+    """Run the grading benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--answers", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    results = run(args.answers, args.repeat, args.seed)
+
+    if args.json:
+        print(json.dumps({"grading_ns_per_answer": results}, indent=2))
+        return
+
+    for question_type, ns_per_answer in results.items():
+        print(f"{question_type:<16} {ns_per_answer:>10.1f} ns/answer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark of quiz and result reads with and without the foreign key indexes.
+
+The database is filled with a synthetic dataset, then get_quiz and get_results
+are timed after downgrading to the revision before the indexes and again after
+upgrading to the latest revision.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from quiz_api.benchmarks.environment import ADMIN_PASSWORD, write_config
+
+REVISION_WITHOUT_INDEXES = "9f3d6b1a7c42"
+
+
+def measure(client, token: str, paths: list[str]) -> dict[str, float]:
+    """Get the median and maximum latency of GET requests in milliseconds."""
+
+    from quiz_api.documents import quiz_document_cache
+
+    latencies = []
+
+    for path in paths:
+        quiz_document_cache.clear()
+        start = time.perf_counter()
+        response = client.get(path, headers={"Authorization": f"Bearer {token}"})
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+
+    return {
+        "median_ms": round(statistics.median(latencies), 2),
+        "max_ms": round(max(latencies), 2),
+    }
+
+
+def run(quizzes: int, results: int, requests: int, seed: int) -> dict:
+    """Time get_quiz and get_results without and with the indexes."""
+
+    from alembic import command
+    from fastapi.testclient import TestClient
+
+    from quiz_api.__main__ import app
+    from quiz_api.benchmarks.dataset import DatasetSize, generate_dataset
+    from quiz_api.db import Database
+
+    rng = random.Random(seed)
+    asyncio.run(generate_dataset(DatasetSize(quizzes=quizzes, results=results), seed))
+
+    with TestClient(app) as client:
+        token = client.post(
+            "/api/token", data={"username": "admin", "password": ADMIN_PASSWORD}
+        ).json()["access_token"]
+        quiz_ids = [rng.randint(1, quizzes) for _ in range(requests)]
+        paths = {
+            "get_quiz": [f"/api/quiz/{quiz_id}" for quiz_id in quiz_ids],
+            "get_results": [f"/api/result?quiz_id={quiz_id}" for quiz_id in quiz_ids],
+        }
+        alembic_config = Database.get_alembic_config()
+        timings = {}
+
+        command.downgrade(alembic_config, REVISION_WITHOUT_INDEXES)
+        timings["without_indexes"] = {
+            name: measure(client, token, operation_paths)
+            for name, operation_paths in paths.items()
+        }
+
+        command.upgrade(alembic_config, "head")
+        timings["with_indexes"] = {
+            name: measure(client, token, operation_paths)
+            for name, operation_paths in paths.items()
+        }
+
+    return timings
+
+
+def main():
+    """Run the foreign key index benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quizzes", type=int, default=1000)
+    parser.add_argument("--results", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        # The config is read when the application is imported.
+        os.environ["CONFIG_PATH"] = str(write_config(Path(path)))
+        timings = run(args.quizzes, args.results, args.requests, args.seed)
+
+    if args.json:
+        print(json.dumps({"foreign_key_indexes": timings}, indent=2))
+        return
+
+    for name, operations in timings.items():
+        for operation, timing in operations.items():
+            print(
+                f"{name:<16} {operation:<12} {timing['median_ms']:>10.2f} ms median "
+                f"{timing['max_ms']:>10.2f} ms max"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+"""Load test of the HTTP API with latency percentiles per operation.
+
+The application is served by uvicorn from ``quiz_api.__main__:app`` against a
+temporary SQLite database filled with a synthetic dataset. Scenarios run one
+after another, each with a fixed number of concurrent clients against a newly
+started server, so the memory of one scenario does not depend on the ones
+before it. The report gives throughput, latency percentiles and statements
+per request by operation ID.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Iterable, NamedTuple
+
+import httpx
+
+from quiz_api.benchmarks.environment import ADMIN_PASSWORD, TEST_PASSWORD, write_config
+
+SERVER_START_TIMEOUT = 60.0
+REQUEST_TIMEOUT = 120.0
+SUBMITTED_QUIZZES = 50
+ADMIN_PAGES = {
+    "get_quiz_summaries": "/api/quiz/summary",
+    "get_results": "/api/result",
+    "read_users": "/api/user",
+}
+PERCENTILES = (50, 95, 99)
+STATEMENTS_PATTERN = re.compile(r'desc="(\d+) statements"')
+
+
+class LoadRequest(NamedTuple):
+    """A request of a scenario, labeled with the operation ID it calls."""
+
+    operation_id: str
+    method: str
+    path: str
+    options: dict
+
+
+@dataclass
+class Sample:
+    """The outcome of one request."""
+
+    operation_id: str
+    seconds: float
+    status: int
+    statements: int | None
+
+
+@dataclass
+class ScenarioSize:
+    """Number of requests of every scenario."""
+
+    logins: int = 100
+    quiz_reads: int = 2000
+    submissions: int = 500
+    admin_pages: int = 100
+
+
+@dataclass
+class Scenario:
+    """Requests run together with the same concurrency."""
+
+    name: str
+    requests: list[LoadRequest]
+    samples: list[Sample] = field(default_factory=list)
+    seconds: float = 0.0
+    memory_kb: int | None = None
+
+
+def get_free_port() -> int:
+    """Get a TCP port nobody listens on."""
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get_pids(pid: int) -> list[int]:
+    """Get a process with all its children."""
+
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", encoding="utf-8") as children:
+            child_pids = [int(child_pid) for child_pid in children.read().split()]
+    except OSError:
+        return [pid]
+
+    return [
+        pid,
+        *(process_pid for child in child_pids for process_pid in get_pids(child)),
+    ]
+
+
+def reset_peak_memory(pid: int) -> bool:
+    """Reset the peak resident memory of a process and its children.
+
+    The peak then starts over from the current resident memory. Returns
+    whether it could be reset, which needs Linux.
+    """
+
+    try:
+        for process_pid in get_pids(pid):
+            with open(f"/proc/{process_pid}/clear_refs", "w") as clear_refs:
+                clear_refs.write("5")
+    except OSError:
+        return False
+
+    return True
+
+
+def get_memory_kb(pid: int) -> int | None:
+    """Get the peak resident memory of a process and its children.
+
+    Returns None where /proc is not available.
+    """
+
+    memory_kb = 0
+
+    try:
+        for process_pid in get_pids(pid):
+            with open(f"/proc/{process_pid}/status", encoding="utf-8") as status:
+                memory_kb += next(
+                    int(line.split()[1]) for line in status if line.startswith("VmHWM:")
+                )
+    except (OSError, StopIteration):
+        return None
+
+    return memory_kb
+
+
+def get_percentile(values: list[float], percent: int) -> float:
+    """Get a nearest-rank percentile of sorted values."""
+
+    return values[max(0, -(-len(values) * percent // 100) - 1)]
+
+
+def get_auth(token: str) -> dict:
+    """Get the request options authenticating with a token."""
+
+    return {"headers": {"Authorization": f"Bearer {token}"}}
+
+
+def build_submission(quiz: dict) -> dict:
+    """Build a submission answering every question of a quiz document."""
+
+    return {
+        "single_choice_answers": [
+            {"question_id": question["id"], "selected_index": 0}
+            for question in quiz["single_choice_questions"]
+        ],
+        "multiple_choice_answers": [
+            {"question_id": question["id"], "selected_indices": [0]}
+            for question in quiz["multiple_choice_questions"]
+        ],
+        "open_answers": [
+            {"question_id": question["id"], "text": "keyword0"}
+            for question in quiz["open_questions"]
+        ],
+        "assignment_answers": [
+            {
+                "question_id": question["id"],
+                "selected_indices": list(range(len(question["assignment_options"]))),
+            }
+            for question in quiz["assignment_questions"]
+        ],
+        "gap_text_answers": [
+            {
+                "question_id": question["id"],
+                "selected_indices": [0] * len(question["gap_text_sub_questions"]),
+            }
+            for question in quiz["gap_text_questions"]
+        ],
+    }
+
+
+async def send(client: httpx.AsyncClient, request: LoadRequest) -> Sample:
+    """Send a request and measure it."""
+
+    start = time.perf_counter()
+    response = await client.request(request.method, request.path, **request.options)
+    seconds = time.perf_counter() - start
+    match = STATEMENTS_PATTERN.search(response.headers.get("server-timing", ""))
+
+    return Sample(
+        operation_id=request.operation_id,
+        seconds=seconds,
+        status=response.status_code,
+        statements=int(match.group(1)) if match else None,
+    )
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, concurrency: int, pid: int
+) -> None:
+    """Send the requests of a scenario from concurrent clients."""
+
+    pending = iter(scenario.requests)
+
+    async def run_client() -> None:
+        for request in pending:
+            scenario.samples.append(await send(client, request))
+
+    # Right after the reset the peak is the current resident memory.
+    memory_before = get_memory_kb(pid) if reset_peak_memory(pid) else None
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client() for _ in range(concurrency)))
+    scenario.seconds = time.perf_counter() - start
+    memory_after = get_memory_kb(pid)
+
+    if memory_before is not None and memory_after is not None:
+        scenario.memory_kb = memory_after - memory_before
+
+
+async def build_scenarios(
+    client: httpx.AsyncClient,
+    size: ScenarioSize,
+    quizzes: int,
+    users: int,
+    rng: random.Random,
+) -> list[Scenario]:
+    """Log in and build the requests of every scenario."""
+
+    from quiz_api.benchmarks.dataset import DATASET_PASSWORD, get_zipf_weights
+
+    tokens = {}
+
+    for username, password in (("admin", ADMIN_PASSWORD), ("test", TEST_PASSWORD)):
+        response = await client.post(
+            "/api/token", data={"username": username, "password": password}
+        )
+        response.raise_for_status()
+        tokens[username] = response.json()["access_token"]
+
+    quiz_ids = list(range(1, quizzes + 1))
+    quiz_weights = get_zipf_weights(len(quiz_ids), rng)
+    submitted = []
+
+    for quiz_id in sorted(
+        set(rng.choices(quiz_ids, cum_weights=quiz_weights, k=SUBMITTED_QUIZZES))
+    ):
+        response = await client.get(f"/api/quiz/{quiz_id}", **get_auth(tokens["test"]))
+        response.raise_for_status()
+        submitted.append((quiz_id, build_submission(response.json())))
+
+    admin_pages = itertools.cycle(ADMIN_PAGES.items())
+
+    return [
+        Scenario(
+            "login_burst",
+            [
+                LoadRequest(
+                    "login",
+                    "POST",
+                    "/api/token",
+                    {
+                        "data": {
+                            "username": f"user{rng.randrange(users)}",
+                            "password": DATASET_PASSWORD,
+                        }
+                    },
+                )
+                for _ in range(size.logins)
+            ],
+        ),
+        Scenario(
+            "quiz_reads",
+            [
+                LoadRequest(
+                    "get_quiz", "GET", f"/api/quiz/{quiz_id}", get_auth(tokens["test"])
+                )
+                for quiz_id in rng.choices(
+                    quiz_ids, cum_weights=quiz_weights, k=size.quiz_reads
+                )
+            ],
+        ),
+        Scenario(
+            "submit_storm",
+            [
+                LoadRequest(
+                    "submit_quiz",
+                    "POST",
+                    f"/api/quiz/{quiz_id}/submit",
+                    {**get_auth(tokens["test"]), "json": submission},
+                )
+                for quiz_id, submission in rng.choices(submitted, k=size.submissions)
+            ],
+        ),
+        Scenario(
+            "admin_pages",
+            [
+                LoadRequest(operation_id, "GET", path, get_auth(tokens["admin"]))
+                for operation_id, path in itertools.islice(
+                    admin_pages, size.admin_pages
+                )
+            ],
+        ),
+    ]
+
+
+def summarize(scenarios: Iterable[Scenario]) -> dict:
+    """Get the throughput and latency percentiles by scenario and operation."""
+
+    report: dict = {"scenarios": {}, "operations": {}}
+    samples_by_operation: dict[str, list[Sample]] = {}
+    seconds_by_operation: dict[str, float] = {}
+
+    for scenario in scenarios:
+        report["scenarios"][scenario.name] = {
+            "requests": len(scenario.samples),
+            "errors": sum(sample.status >= 400 for sample in scenario.samples),
+            "seconds": round(scenario.seconds, 3),
+            "requests_per_second": round(len(scenario.samples) / scenario.seconds, 1),
+            "memory_kb_per_request": (
+                round(scenario.memory_kb / len(scenario.samples), 2)
+                if scenario.memory_kb is not None
+                else None
+            ),
+        }
+
+        for operation_id in {sample.operation_id for sample in scenario.samples}:
+            seconds_by_operation[operation_id] = (
+                seconds_by_operation.get(operation_id, 0.0) + scenario.seconds
+            )
+
+        for sample in scenario.samples:
+            samples_by_operation.setdefault(sample.operation_id, []).append(sample)
+
+    for operation_id, samples in sorted(samples_by_operation.items()):
+        latencies = sorted(sample.seconds * 1000 for sample in samples)
+        statements = [
+            sample.statements for sample in samples if sample.statements is not None
+        ]
+        report["operations"][operation_id] = {
+            "requests": len(samples),
+            "errors": sum(sample.status >= 400 for sample in samples),
+            "requests_per_second": round(
+                len(samples) / seconds_by_operation[operation_id], 1
+            ),
+            "mean_ms": round(statistics.fmean(latencies), 2),
+            **{
+                f"p{percent}_ms": round(get_percentile(latencies, percent), 2)
+                for percent in PERCENTILES
+            },
+            "statements_per_request": (
+                round(statistics.fmean(statements), 2) if statements else None
+            ),
+        }
+
+    return report
+
+
+def start_server(config_path: Path, port: int, workers: int) -> subprocess.Popen:
+    """Start uvicorn serving the application."""
+
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "quiz_api.__main__:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env={**os.environ, "CONFIG_PATH": str(config_path)},
+    )
+
+
+async def wait_for_server(client: httpx.AsyncClient, server: subprocess.Popen) -> None:
+    """Wait until the server answers requests."""
+
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}.")
+
+        try:
+            await client.get("/metrics")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+
+    raise RuntimeError("Server did not start in time.")
+
+
+@asynccontextmanager
+async def serve(
+    config_path: Path, args: argparse.Namespace
+) -> AsyncIterator[tuple[httpx.AsyncClient, subprocess.Popen]]:
+    """Start a server and get a client for it, stopping the server afterwards."""
+
+    port = get_free_port()
+    server = start_server(config_path, port, args.workers)
+
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=args.concurrency),
+        ) as client:
+            await wait_for_server(client, server)
+            yield client, server
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def run_load_test(
+    config_path: Path, args: argparse.Namespace, size: ScenarioSize
+) -> dict:
+    """Run every scenario against a server of its own."""
+
+    async with serve(config_path, args) as (client, _):
+        scenarios = await build_scenarios(
+            client, size, args.quizzes, args.users, random.Random(args.seed)
+        )
+
+    scenarios = [scenario for scenario in scenarios if scenario.requests]
+
+    for scenario in scenarios:
+        async with serve(config_path, args) as (client, server):
+            await run_scenario(client, scenario, args.concurrency, server.pid)
+
+    return summarize(scenarios)
+
+
+def main():
+    """Run the load test and print the report as JSON."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--quizzes", type=int, default=200)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--results", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+
+    for name, default in vars(ScenarioSize()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+
+    parser.add_argument("--output", type=Path, help="Write the report to a file.")
+    args = parser.parse_args()
+
+    size = ScenarioSize(**{name: getattr(args, name) for name in vars(ScenarioSize())})
+
+    with tempfile.TemporaryDirectory() as path:
+        # The Server-Timing header of debug mode reports statement counts.
+        config_path = write_config(Path(path), debug=True)
+        os.environ["CONFIG_PATH"] = str(config_path)
+
+        from quiz_api.benchmarks.dataset import DatasetSize, generate_dataset
+
+        asyncio.run(
+            generate_dataset(
+                DatasetSize(
+                    quizzes=args.quizzes,
+                    users=args.users,
+                    labels=max(1, args.quizzes // 20),
+                    results=args.results,
+                ),
+                args.seed,
+            )
+        )
+        report = {
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            **asyncio.run(run_load_test(config_path, args, size)),
+        }
+
+    output = json.dumps(report, indent=2)
+
+    if args.output is None:
+        print(output)
+        return
+
+    args.output.write_text(output + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
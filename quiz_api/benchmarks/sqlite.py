@@ -0,0 +1,191 @@
+"""Benchmark of concurrent quiz submissions with and without the SQLite profile.
+
+Every worker is a separate process with its own instance of the application,
+like the processes of Nginx Unit, submitting to one shared database file.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from quiz_api.benchmarks.environment import ADMIN_PASSWORD, TEST_PASSWORD, write_config
+
+# SQLite defaults, like an engine without any PRAGMAs.
+BASELINE_PROFILE = {
+    "sqlite_journal_mode": None,
+    "sqlite_synchronous": None,
+    "sqlite_busy_timeout": None,
+    "sqlite_mmap_size": None,
+    "sqlite_cache_size": None,
+    "sqlite_foreign_keys": None,
+}
+
+
+def start_worker(config_path: Path, *args: str) -> subprocess.Popen:
+    """Start a process running a command of this module."""
+
+    return subprocess.Popen(
+        [sys.executable, "-m", __spec__.name, *args],
+        env={**os.environ, "CONFIG_PATH": str(config_path)},
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+
+def get_worker_result(process: subprocess.Popen) -> dict:
+    """Wait for a worker process and get its result."""
+
+    stdout, _ = process.communicate()
+
+    if process.returncode:
+        raise RuntimeError(f"Benchmark worker failed with code {process.returncode}.")
+
+    return json.loads(stdout.splitlines()[-1])
+
+
+def setup(questions: int) -> dict:
+    """Create the quiz submitted by the workers."""
+
+    from fastapi.testclient import TestClient
+
+    from quiz_api.__main__ import app
+
+    with TestClient(app) as client:
+        token = client.post(
+            "/api/token", data={"username": "admin", "password": ADMIN_PASSWORD}
+        ).json()["access_token"]
+        quiz = client.post(
+            "/api/quiz/import",
+            headers={"Authorization": f"Bearer {token}"},
+            json={
+                "title": "Benchmark",
+                "single_choice_questions": [
+                    {
+                        "title": f"Question {index}",
+                        "text": "Pick one.",
+                        "index": index,
+                        "correct_index": index % 4,
+                        "single_choice_options": [
+                            {"text": f"Option {option}", "index": option}
+                            for option in range(4)
+                        ],
+                    }
+                    for index in range(questions)
+                ],
+            },
+        ).json()
+        document = client.get(
+            f"/api/quiz/{quiz['id']}", headers={"Authorization": f"Bearer {token}"}
+        ).json()
+
+    return {
+        "quiz_id": quiz["id"],
+        "question_ids": [
+            question["id"] for question in document["single_choice_questions"]
+        ],
+    }
+
+
+def submit(quiz_id: int, question_ids: list[int], submissions: int) -> dict:
+    """Submit a quiz repeatedly and count the failed submissions."""
+
+    from fastapi.testclient import TestClient
+
+    from quiz_api.__main__ import app
+
+    with TestClient(app, raise_server_exceptions=False) as client:
+        token = client.post(
+            "/api/token", data={"username": "test", "password": TEST_PASSWORD}
+        ).json()["access_token"]
+        body = {
+            "single_choice_answers": [
+                {"question_id": question_id, "selected_index": index % 4}
+                for index, question_id in enumerate(question_ids)
+            ]
+        }
+        errors = 0
+        start = time.time()
+
+        for _ in range(submissions):
+            response = client.post(
+                f"/api/quiz/{quiz_id}/submit",
+                headers={"Authorization": f"Bearer {token}"},
+                json=body,
+            )
+            errors += response.status_code != 200
+
+        end = time.time()
+
+    return {"start": start, "end": end, "submissions": submissions, "errors": errors}
+
+
+def run(profile: dict, workers: int, submissions: int, questions: int) -> dict:
+    """Run concurrent submissions against a new database with a SQLite profile."""
+
+    with tempfile.TemporaryDirectory() as path:
+        config_path = write_config(Path(path), **profile)
+        quiz = get_worker_result(start_worker(config_path, "setup", str(questions)))
+        processes = [
+            start_worker(config_path, "submit", json.dumps(quiz), str(submissions))
+            for _ in range(workers)
+        ]
+        results = [get_worker_result(process) for process in processes]
+
+    seconds = max(result["end"] for result in results) - min(
+        result["start"] for result in results
+    )
+    total = sum(result["submissions"] for result in results)
+    errors = sum(result["errors"] for result in results)
+
+    return {
+        "submissions": total,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "submissions_per_second": round((total - errors) / seconds, 1),
+    }
+
+
+def main():
+    """Run the SQLite benchmark."""
+
+    if len(sys.argv) > 1 and sys.argv[1] == "setup":
+        print(json.dumps(setup(int(sys.argv[2]))))
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "submit":
+        quiz = json.loads(sys.argv[2])
+        print(
+            json.dumps(submit(quiz["quiz_id"], quiz["question_ids"], int(sys.argv[3])))
+        )
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--submissions", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    results = {
+        name: run(profile, args.workers, args.submissions, args.questions)
+        for name, profile in (("baseline", BASELINE_PROFILE), ("profile", {}))
+    }
+
+    if args.json:
+        print(json.dumps({"sqlite_submit": results}, indent=2))
+        return
+
+    for name, result in results.items():
+        print(
+            f"{name:<10} {result['submissions_per_second']:>8.1f} submissions/s "
+            f"{result['errors']:>6} errors of {result['submissions']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
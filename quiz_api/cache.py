@@ -0,0 +1,84 @@
+"""Caches for the quiz-api application."""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+from quiz_api.metrics import cache_lookups
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded least-recently-used cache with expiring entries.
+
+    The cache is local to the process, so entries invalidated in one worker
+    stay valid in other workers until they expire. Lookups are counted in the
+    metrics under the name of the cache.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._hit_counter = cache_lookups.labels(name, "hit")
+        self._miss_counter = cache_lookups.labels(name, "miss")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """Get a value from the cache."""
+
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self._miss_counter.inc()
+            return None
+
+        expires_at, value = entry
+
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._miss_counter.inc()
+            return None
+
+        self._entries.move_to_end(key)
+        self._hit_counter.inc()
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store a value, expiring after the given or default TTL."""
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """Remove a value from the cache."""
+
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[V], bool]) -> int:
+        """Remove all values matching a predicate."""
+
+        keys = [key for key, (_, value) in self._entries.items() if predicate(value)]
+
+        for key in keys:
+            del self._entries[key]
+
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all values from the cache."""
+
+        self._entries.clear()
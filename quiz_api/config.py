@@ -2,19 +2,45 @@
 
 import os
 from pathlib import Path
+from typing import Literal
 
 import yaml
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
 from quiz_api.const import (
+    DEFAULT_ANSWER_KEY_CACHE_SIZE,
     DEFAULT_CONFIG_PATH,
     DEFAULT_DB_URL,
     DEFAULT_DEBUG,
+    DEFAULT_HASH_EXECUTOR,
+    DEFAULT_HASH_QUEUE_SIZE,
+    DEFAULT_HASH_WORKERS,
     DEFAULT_HOST,
+    DEFAULT_JOB_HISTORY_SIZE,
+    DEFAULT_JOB_LEASE,
+    DEFAULT_JOB_POLL_INTERVAL,
+    DEFAULT_JOB_STORE,
+    DEFAULT_JOB_WORKERS,
+    DEFAULT_LOG_FORMAT,
     DEFAULT_LOG_LEVEL,
     DEFAULT_LOG_PATH,
+    DEFAULT_LOG_QUEUE_SIZE,
+    DEFAULT_METRICS_PATH,
     DEFAULT_PORT,
+    DEFAULT_PRINCIPAL_CACHE_SIZE,
+    DEFAULT_PRINCIPAL_CACHE_TTL,
+    DEFAULT_QUIZ_DOCUMENT_CACHE_SIZE,
+    DEFAULT_QUIZ_DOCUMENT_CACHE_TTL,
+    DEFAULT_SLOW_QUERY_THRESHOLD,
+    DEFAULT_SLOW_REQUEST_THRESHOLD,
+    DEFAULT_SQLITE_BUSY_TIMEOUT,
+    DEFAULT_SQLITE_CACHE_SIZE,
+    DEFAULT_SQLITE_FOREIGN_KEYS,
+    DEFAULT_SQLITE_JOURNAL_MODE,
+    DEFAULT_SQLITE_MMAP_SIZE,
+    DEFAULT_SQLITE_SYNCHRONOUS,
+    DEFAULT_STARTUP_STATE_PATH,
 )
 
 
@@ -25,8 +51,38 @@ class Config(BaseModel):
     port: int = DEFAULT_PORT
     debug: bool = DEFAULT_DEBUG
     log_level: str = DEFAULT_LOG_LEVEL
+    log_format: Literal["text", "json"] = DEFAULT_LOG_FORMAT
+    log_queue_size: int = DEFAULT_LOG_QUEUE_SIZE
     log_path: Path = DEFAULT_LOG_PATH
+    startup_state_path: Path = DEFAULT_STARTUP_STATE_PATH
+    metrics_path: Path = DEFAULT_METRICS_PATH
     db_url: str = DEFAULT_DB_URL
+    async_db_url: str | None = None
+    sqlite_journal_mode: (
+        Literal["delete", "truncate", "persist", "memory", "wal", "off"] | None
+    ) = DEFAULT_SQLITE_JOURNAL_MODE
+    sqlite_synchronous: Literal["off", "normal", "full", "extra"] | None = (
+        DEFAULT_SQLITE_SYNCHRONOUS
+    )
+    sqlite_busy_timeout: int | None = DEFAULT_SQLITE_BUSY_TIMEOUT
+    sqlite_mmap_size: int | None = DEFAULT_SQLITE_MMAP_SIZE
+    sqlite_cache_size: int | None = DEFAULT_SQLITE_CACHE_SIZE
+    sqlite_foreign_keys: bool | None = DEFAULT_SQLITE_FOREIGN_KEYS
+    principal_cache_size: int = DEFAULT_PRINCIPAL_CACHE_SIZE
+    principal_cache_ttl: float = DEFAULT_PRINCIPAL_CACHE_TTL
+    quiz_document_cache_size: int = DEFAULT_QUIZ_DOCUMENT_CACHE_SIZE
+    quiz_document_cache_ttl: float = DEFAULT_QUIZ_DOCUMENT_CACHE_TTL
+    answer_key_cache_size: int = DEFAULT_ANSWER_KEY_CACHE_SIZE
+    hash_executor: Literal["thread", "process"] = DEFAULT_HASH_EXECUTOR
+    hash_workers: int = DEFAULT_HASH_WORKERS
+    hash_queue_size: int = DEFAULT_HASH_QUEUE_SIZE
+    job_store: Literal["memory", "database"] = DEFAULT_JOB_STORE
+    job_workers: int = DEFAULT_JOB_WORKERS
+    job_poll_interval: float = DEFAULT_JOB_POLL_INTERVAL
+    job_lease: float = DEFAULT_JOB_LEASE
+    job_history_size: int = DEFAULT_JOB_HISTORY_SIZE
+    slow_query_threshold: float = DEFAULT_SLOW_QUERY_THRESHOLD
+    slow_request_threshold: float = DEFAULT_SLOW_REQUEST_THRESHOLD
     secret_key: str
     admin_username: str
     admin_password: str
@@ -50,6 +106,8 @@ class Config(BaseModel):
         config = Config()
         config.db_url = f"sqlite:///{path}/quiz-api.db"
         config.log_path = path / DEFAULT_LOG_PATH
+        config.startup_state_path = path / DEFAULT_STARTUP_STATE_PATH
+        config.metrics_path = path / DEFAULT_METRICS_PATH
 
         return config
 
@@ -10,11 +10,76 @@ DEFAULT_PORT = 8000
 DEFAULT_DEBUG = True
 DEFAULT_LOG_PATH = "quiz-api.log"
 DEFAULT_LOG_LEVEL = "INFO"
+DEFAULT_LOG_FORMAT = "text"
+DEFAULT_LOG_QUEUE_SIZE = 10000
+DEFAULT_STARTUP_STATE_PATH = "quiz-api.startup.json"
+DEFAULT_METRICS_PATH = "quiz-api.metrics"
 DEFAULT_DB_URL = "sqlite:///quiz-api.db"
 
+DEFAULT_SQLITE_JOURNAL_MODE = "wal"
+DEFAULT_SQLITE_SYNCHRONOUS = "normal"
+DEFAULT_SQLITE_BUSY_TIMEOUT = 5000
+DEFAULT_SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+DEFAULT_SQLITE_CACHE_SIZE = -64 * 1024
+# Deleting users, questions and options leaves their results and answers behind,
+# which enforced foreign keys would reject.
+DEFAULT_SQLITE_FOREIGN_KEYS = None
+
+ASYNC_DB_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+DEFAULT_RESULT_PAGE_SIZE = 100
+MAX_RESULT_PAGE_SIZE = 1000
+
+DEFAULT_REGRADE_CHUNK_SIZE = 500
+EXPORT_BATCH_SIZE = 500
+
 CRYPT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+DEFAULT_PRINCIPAL_CACHE_SIZE = 1024
+DEFAULT_PRINCIPAL_CACHE_TTL = 30.0
+
+DEFAULT_QUIZ_DOCUMENT_CACHE_SIZE = 256
+DEFAULT_QUIZ_DOCUMENT_CACHE_TTL = 3600.0
+
+DEFAULT_ANSWER_KEY_CACHE_SIZE = 256
+
+DEFAULT_HASH_EXECUTOR = "thread"
+DEFAULT_HASH_WORKERS = 2
+DEFAULT_HASH_QUEUE_SIZE = 32
+
+DEFAULT_JOB_STORE = "memory"
+DEFAULT_JOB_WORKERS = 1
+DEFAULT_JOB_POLL_INTERVAL = 1.0
+DEFAULT_JOB_LEASE = 60.0
+DEFAULT_JOB_HISTORY_SIZE = 100
+
+DEFAULT_SLOW_QUERY_THRESHOLD = 0.1
+DEFAULT_SLOW_REQUEST_THRESHOLD = 1.0
+SLOW_QUERY_LOG_WIDTH = 500
+
+REQUEST_ID_PATTERN = r"[\w.-]{1,64}"
+
+REQUEST_DURATION_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+POOL_CHECKOUT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
 
 class QuestionDifficulty(StrEnum):
     EASY = "easy"
@@ -22,6 +87,25 @@ class QuestionDifficulty(StrEnum):
     HARD = "hard"
 
 
+class JobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class ResultMode(StrEnum):
+    ALL = "all"
+    LATEST = "latest"
+    BEST = "best"
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 LOGGING_CONFIG: dict = {
     "version": 1,
     "disable_existing_loggers": False,
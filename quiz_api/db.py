@@ -1,15 +1,279 @@
 """Database for the quiz-api application."""
 
+import json
 import os
+import textwrap
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Sequence
 
 from alembic import command
 from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, PoolProxiedConnection
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from quiz_api.config import config
+from quiz_api.const import ASYNC_DB_DRIVERS, SLOW_QUERY_LOG_WIDTH
 from quiz_api.log import logger
+from quiz_api.metrics import (
+    db_pool_checked_out,
+    db_pool_checkout_duration,
+    get_scope_operation_id,
+)
+
+
+def get_async_db_url(db_url: str) -> str:
+    """Get the URL using the async driver for a database URL."""
+
+    url = make_url(db_url)
+    backend = url.get_backend_name()
+
+    if url.get_driver_name() in ASYNC_DB_DRIVERS.values():
+        return db_url
+
+    if backend not in ASYNC_DB_DRIVERS:
+        raise ValueError(f"No async driver available for database '{backend}'.")
+
+    return url.set(
+        drivername=f"{backend}+{ASYNC_DB_DRIVERS[backend]}"
+    ).render_as_string(hide_password=False)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Connection pool recording how long checkouts wait for a connection."""
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+
+        try:
+            return super().connect()
+        finally:
+            db_pool_checkout_duration.observe(time.perf_counter() - start)
+
+
+def get_pool_class(db_url: str) -> type[Pool]:
+    """Get the connection pool class for a database URL."""
+
+    url = make_url(db_url)
+    pool_class = url.get_dialect().get_pool_class(url)
+
+    # Pools without a queue, like the one of in-memory SQLite, never wait.
+    if issubclass(pool_class, AsyncAdaptedQueuePool):
+        return TimedQueuePool
+
+    return pool_class
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply the SQLite settings of the config to a new connection.
+
+    Settings that are not configured keep the defaults of SQLite.
+    """
+
+    pragmas = {
+        "journal_mode": config.sqlite_journal_mode,
+        "synchronous": config.sqlite_synchronous,
+        "busy_timeout": config.sqlite_busy_timeout,
+        "mmap_size": config.sqlite_mmap_size,
+        "cache_size": config.sqlite_cache_size,
+        "foreign_keys": config.sqlite_foreign_keys,
+    }
+    cursor = dbapi_connection.cursor()
+
+    for name, value in pragmas.items():
+        if value is not None:
+            cursor.execute(
+                f"PRAGMA {name} = {int(value) if isinstance(value, bool) else value}"
+            )
+
+    cursor.close()
+
 
 db_engine = create_engine(config.db_url)
+async_db_url = config.async_db_url or get_async_db_url(config.db_url)
+async_db_engine = create_async_engine(
+    async_db_url, poolclass=get_pool_class(async_db_url)
+)
+
+for engine in (db_engine, async_db_engine.sync_engine):
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", set_sqlite_pragmas)
+
+
+@event.listens_for(async_db_engine.sync_engine, "checkout")
+def count_checkout(*args) -> None:
+    db_pool_checked_out.inc()
+
+
+@event.listens_for(async_db_engine.sync_engine, "checkin")
+def count_checkin(*args) -> None:
+    db_pool_checked_out.dec()
+
+
+@dataclass
+class QueryStats:
+    """Statements issued while handling a request."""
+
+    scope: Scope
+    statements: int = 0
+    seconds: float = 0.0
+
+    @property
+    def request(self) -> str:
+        """Describe the request by its method and the operation it matched."""
+
+        return f"{self.scope['method']} {get_scope_operation_id(self.scope)}"
+
+
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def describe_parameters(parameters, executemany: bool) -> str:
+    """Describe the shape of statement parameters without their values."""
+
+    if executemany:
+        return f"{len(parameters)} parameter sets"
+
+    if isinstance(parameters, dict):
+        return f"parameters ({', '.join(parameters)})"
+
+    return f"{len(parameters)} parameters"
+
+
+def start_statement(conn, cursor, statement, parameters, context, executemany):
+    conn.info["statement_start"] = time.perf_counter()
+
+
+def finish_statement(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info.pop("statement_start")
+    stats = query_stats.get()
+
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += seconds
+
+    if seconds >= config.slow_query_threshold:
+        logger.warning(
+            f"Slow statement in {stats.request if stats else 'no request'} "
+            f"took {seconds:.3f}s with {describe_parameters(parameters, executemany)}: "
+            f"{textwrap.shorten(statement, SLOW_QUERY_LOG_WIDTH)}"
+        )
+
+
+for engine in (db_engine, async_db_engine.sync_engine):
+    event.listen(engine, "before_cursor_execute", start_statement)
+    event.listen(engine, "after_cursor_execute", finish_statement)
+
+
+class QueryStatsMiddleware:
+    """Count the statements issued by each request and log slow requests.
+
+    In debug mode the statement count and database time are sent in a
+    Server-Timing header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = query_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and config.debug:
+                MutableHeaders(scope=message).append(
+                    "Server-Timing",
+                    f'db;dur={stats.seconds * 1000:.1f};desc="{stats.statements} '
+                    f'statements", app;dur={(time.perf_counter() - start) * 1000:.1f}',
+                )
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_stats.reset(token)
+            seconds = time.perf_counter() - start
+
+            if seconds >= config.slow_request_threshold:
+                logger.warning(
+                    f"Slow request {stats.request} took {seconds:.3f}s with "
+                    f"{stats.statements} statements taking {stats.seconds:.3f}s."
+                )
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """Get the database session for the current request."""
+
+    async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+        yield session
+
+
+def get_row_key(row: Sequence) -> str:
+    """Get a key comparing the values of an inserted row."""
+
+    return json.dumps(list(row), default=str)
+
+
+async def insert_values(
+    session: AsyncSession, model: type[SQLModel], values: Sequence[dict]
+) -> list[int]:
+    """Insert rows of one model and get their IDs in the order of the rows.
+
+    The rows are sent in multi-row INSERTs. Databases like SQLite do not
+    return the IDs in the order of the rows, so the inserted values are
+    returned with each ID and matched to the rows. Rows with equal values are
+    interchangeable, so it does not matter which of them gets which ID.
+    """
+
+    if not values:
+        return []
+
+    columns = list(values[0])
+    result = await session.exec(
+        insert(model).returning(
+            model.id, *(model.__table__.c[column] for column in columns)
+        ),
+        params=list(values),
+    )
+    row_ids: defaultdict[str, deque[int]] = defaultdict(deque)
+
+    for row_id, *row in result:
+        row_ids[get_row_key(row)].append(row_id)
+
+    return [
+        row_ids[get_row_key([value[column] for column in columns])].popleft()
+        for value in values
+    ]
+
+
+async def insert_all(session: AsyncSession, rows: Sequence[SQLModel]) -> None:
+    """Insert rows of one model and set their IDs."""
+
+    if not rows:
+        return
+
+    row_ids = await insert_values(
+        session, type(rows[0]), [row.model_dump(exclude={"id"}) for row in rows]
+    )
+
+    for row, row_id in zip(rows, row_ids):
+        row.id = row_id
 
 
 class Database:
@@ -34,14 +298,44 @@ class Database:
             session.commit()
 
     @staticmethod
-    def run_migrations():
-        """Run database migrations."""
-
-        logger.info("Running database migrations.")
+    def get_alembic_config() -> Config:
+        """Get the Alembic configuration."""
 
         alembic_cfg = Config()
         alembic_cfg.set_main_option(
             "script_location", f"{os.path.dirname(__file__)}/migrations"
         )
         alembic_cfg.set_main_option("sqlalchemy.url", config.db_url)
-        command.upgrade(alembic_cfg, "head")
+        return alembic_cfg
+
+    @staticmethod
+    def is_empty() -> bool:
+        """Check whether the database has no tables yet."""
+
+        return not inspect(db_engine).get_table_names()
+
+    @staticmethod
+    def is_up_to_date() -> bool:
+        """Check whether all database migrations have been applied."""
+
+        script = ScriptDirectory.from_config(Database.get_alembic_config())
+
+        with db_engine.connect() as connection:
+            context = MigrationContext.configure(connection)
+            return set(context.get_current_heads()) == set(script.get_heads())
+
+    @staticmethod
+    def stamp_db():
+        """Mark the database as migrated to the latest revision."""
+
+        logger.info("Stamping database with the latest migration.")
+
+        command.stamp(Database.get_alembic_config(), "head")
+
+    @staticmethod
+    def run_migrations():
+        """Run database migrations."""
+
+        logger.info("Running database migrations.")
+
+        command.upgrade(Database.get_alembic_config(), "head")
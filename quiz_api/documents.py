@@ -0,0 +1,150 @@
+"""Cached quiz documents for the quiz-api application."""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Iterable
+
+from sqlalchemy import Select, update
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from quiz_api.cache import TTLCache
+from quiz_api.config import config
+from quiz_api.models import (
+    GapTextQuestion,
+    GapTextSubQuestion,
+    Quiz,
+    QuizLabelRelation,
+    QuizRead,
+)
+
+
+@dataclass(frozen=True)
+class QuizDocument:
+    """Serialized quiz with the version it was built from."""
+
+    version: int
+    etag: str
+    body: bytes
+
+
+quiz_document_cache: TTLCache[int, QuizDocument] = TTLCache(
+    "quiz_document",
+    maxsize=config.quiz_document_cache_size,
+    ttl=config.quiz_document_cache_ttl,
+)
+
+
+async def get_quiz_version(session: AsyncSession, quiz_id: int) -> int | None:
+    """Get the content version of a quiz."""
+
+    return (await session.exec(select(Quiz.version).where(Quiz.id == quiz_id))).first()
+
+
+async def get_quiz_document(session: AsyncSession, quiz_id: int) -> QuizDocument | None:
+    """Get the serialized quiz, building it if the cached one is outdated."""
+
+    # The version is read before the quiz so a cached document is never older
+    # than the version it is stored under.
+    version = await get_quiz_version(session, quiz_id)
+
+    if version is None:
+        return None
+
+    document = quiz_document_cache.get(quiz_id)
+
+    if document is not None and document.version == version:
+        return document
+
+    document = await build_quiz_document(session, quiz_id, version)
+
+    if document is not None:
+        quiz_document_cache.set(quiz_id, document)
+
+    return document
+
+
+async def build_quiz_document(
+    session: AsyncSession, quiz_id: int, version: int
+) -> QuizDocument | None:
+    """Serialize a quiz without reading or writing the cache."""
+
+    quiz = await session.get(Quiz, quiz_id)
+
+    if quiz is None:
+        return None
+
+    for label in quiz.labels:
+        await session.refresh(label)
+
+    body = QuizRead.model_validate(quiz).model_dump_json().encode("utf-8")
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+    return QuizDocument(version=version, etag=etag, body=body)
+
+
+async def touch_quizzes(
+    session: AsyncSession, quiz_ids: Iterable[int | None] | Select
+) -> None:
+    """Bump the content version of quizzes, invalidating their documents."""
+
+    if not isinstance(quiz_ids, Select):
+        quiz_ids = [quiz_id for quiz_id in quiz_ids if quiz_id is not None]
+
+        if not quiz_ids:
+            return
+
+    touched_ids = await session.exec(
+        update(Quiz)
+        .where(Quiz.id.in_(quiz_ids))
+        .values(version=Quiz.version + 1)
+        .returning(Quiz.id)
+        .execution_options(synchronize_session=False)
+    )
+
+    for quiz_id in touched_ids.scalars():
+        quiz_document_cache.invalidate(quiz_id)
+
+
+async def touch_questions(
+    session: AsyncSession, question_model: type[SQLModel], *question_ids: int | None
+) -> None:
+    """Bump the content version of the quizzes owning questions."""
+
+    await touch_quizzes(
+        session,
+        select(question_model.quiz_id).where(question_model.id.in_(question_ids)),
+    )
+
+
+async def touch_sub_questions(
+    session: AsyncSession, *sub_question_ids: int | None
+) -> None:
+    """Bump the content version of the quizzes owning gap text sub questions."""
+
+    await touch_questions(
+        session,
+        GapTextQuestion,
+        *(
+            await session.exec(
+                select(GapTextSubQuestion.question_id).where(
+                    GapTextSubQuestion.id.in_(sub_question_ids)
+                )
+            )
+        ).all(),
+    )
+
+
+async def touch_labels(session: AsyncSession, *label_ids: int | None) -> None:
+    """Bump the content version of the quizzes carrying labels.
+
+    The documents of quizzes list the quiz IDs of their labels, so a quiz
+    joining or leaving a label changes every quiz sharing it.
+    """
+
+    await touch_quizzes(
+        session,
+        select(QuizLabelRelation.quiz_id).where(
+            QuizLabelRelation.label_id.in_(label_ids)
+        ),
+    )
@@ -0,0 +1,264 @@
+"""Streaming export of quizzes and results for the quiz-api application."""
+
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterable, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from quiz_api.const import EXPORT_BATCH_SIZE, ExportFormat
+from quiz_api.db import async_db_engine
+from quiz_api.documents import build_quiz_document
+from quiz_api.models import (
+    ANSWER_MODELS,
+    QUESTION_MODELS_BY_TYPE,
+    Quiz,
+    Result,
+    ResultRead,
+)
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+QUESTION_COLUMNS = ("id", "index", "title", "text", "difficulty")
+ANSWER_COLUMNS = ("id", "question_id", "score", "max_score")
+RESPONSE_COLUMNS = {
+    question_type: [
+        column.name
+        for column in answer_model.__table__.columns
+        if column.name not in (*ANSWER_COLUMNS, "result_id")
+    ]
+    for question_type, answer_model in ANSWER_MODELS.items()
+}
+
+QUIZ_CSV_HEADER = (
+    "quiz_id",
+    "quiz_title",
+    "is_practice",
+    "labels",
+    "question_type",
+    *(f"question_{column}" for column in QUESTION_COLUMNS),
+    "details",
+)
+RESULT_CSV_HEADER = (
+    "result_id",
+    "quiz_id",
+    "user_id",
+    "created_at",
+    "result_score",
+    "result_max_score",
+    "question_type",
+    *(f"answer_{column}" for column in ANSWER_COLUMNS),
+    "response",
+)
+
+
+def write_csv(rows: Iterable[Sequence]) -> bytes:
+    """Write rows as CSV."""
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+
+    return buffer.getvalue().encode("utf-8")
+
+
+def export_response(
+    content: AsyncIterator[bytes], format: ExportFormat, name: str
+) -> StreamingResponse:
+    """Create the response streaming an export."""
+
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'},
+    )
+
+
+def get_quiz_rows(quiz: dict) -> list[list]:
+    """Get the CSV rows of a serialized quiz, one per question."""
+
+    quiz_columns = [
+        quiz["id"],
+        quiz["title"],
+        quiz["is_practice"],
+        json.dumps([label["text"] for label in quiz["labels"]]),
+    ]
+    rows = [
+        [
+            *quiz_columns,
+            question_type,
+            *(question[column] for column in QUESTION_COLUMNS),
+            json.dumps(
+                {
+                    key: value
+                    for key, value in question.items()
+                    if key not in QUESTION_COLUMNS and key != "quiz_id"
+                }
+            ),
+        ]
+        for question_type in QUESTION_MODELS_BY_TYPE
+        for question in quiz[f"{question_type}_questions"]
+    ]
+
+    return rows or [quiz_columns]
+
+
+async def stream_quizzes(format: ExportFormat) -> AsyncIterator[bytes]:
+    """Stream all quizzes with their questions, options and labels.
+
+    Quiz IDs are read from a server-side cursor in batches, so memory use is
+    bounded by the batch size no matter how many quizzes there are. Documents
+    are built without the quiz document cache, so an export does not evict
+    the quizzes being served.
+    """
+
+    async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+        quizzes = await session.stream(
+            select(Quiz.id, Quiz.version)
+            .order_by(Quiz.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        if format == ExportFormat.CSV:
+            yield write_csv([QUIZ_CSV_HEADER])
+
+        async for batch in quizzes.partitions():
+            chunks = []
+
+            for quiz_id, version in batch:
+                document = await build_quiz_document(session, quiz_id, version)
+
+                # Building a document also loads the quizzes sharing its labels,
+                # which must not be reused half loaded for the next document.
+                session.expunge_all()
+
+                if document is None:
+                    continue
+
+                if format == ExportFormat.CSV:
+                    chunks.append(write_csv(get_quiz_rows(json.loads(document.body))))
+                else:
+                    chunks.append(document.body + b"\n")
+
+            yield b"".join(chunks)
+
+
+async def get_answers(
+    session: AsyncSession, result_ids: list[int]
+) -> dict[str, dict[int, list[Row]]]:
+    """Get the answers of results by question type and result ID."""
+
+    answers: dict[str, dict[int, list[Row]]] = {}
+
+    for question_type, answer_model in ANSWER_MODELS.items():
+        answers[question_type] = {}
+
+        # Columns are selected in a fixed order, so rows can be written by
+        # position: result ID, answer columns, then response columns.
+        for answer in await session.exec(
+            select(
+                *(
+                    getattr(answer_model, column)
+                    for column in (
+                        "result_id",
+                        *ANSWER_COLUMNS,
+                        *RESPONSE_COLUMNS[question_type],
+                    )
+                )
+            )
+            .where(answer_model.result_id.in_(result_ids))
+            .order_by(answer_model.id)
+        ):
+            answers[question_type].setdefault(answer[0], []).append(answer)
+
+    return answers
+
+
+def get_result_rows(result: Row, answers: dict[str, dict[int, list[Row]]]) -> list:
+    """Get the CSV rows of a result, one per answer."""
+
+    result_columns = [
+        result.id,
+        result.quiz_id,
+        result.user_id,
+        result.created_at.isoformat(),
+        result.score,
+        result.max_score,
+    ]
+    rows = [
+        [
+            *result_columns,
+            question_type,
+            *answer[1:5],
+            json.dumps(dict(zip(RESPONSE_COLUMNS[question_type], answer[5:]))),
+        ]
+        for question_type, answers_by_result in answers.items()
+        for answer in answers_by_result.get(result.id, [])
+    ]
+
+    return rows or [result_columns]
+
+
+async def stream_results(
+    format: ExportFormat, quiz_id: int | None = None, user_id: int | None = None
+) -> AsyncIterator[bytes]:
+    """Stream results with their answers, ordered by ID.
+
+    Results are read from a server-side cursor in batches, and the answers of
+    each batch are loaded with one query per answer table.
+    """
+
+    query = select(
+        Result.id,
+        Result.quiz_id,
+        Result.user_id,
+        Result.score,
+        Result.max_score,
+        Result.created_at,
+    ).order_by(Result.id)
+
+    if quiz_id is not None:
+        query = query.where(Result.quiz_id == quiz_id)
+
+    if user_id is not None:
+        query = query.where(Result.user_id == user_id)
+
+    async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+        results = await session.stream(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        if format == ExportFormat.CSV:
+            yield write_csv([RESULT_CSV_HEADER])
+
+        async for batch in results.partitions():
+            answers = await get_answers(session, [result.id for result in batch])
+
+            if format == ExportFormat.CSV:
+                yield write_csv(
+                    row for result in batch for row in get_result_rows(result, answers)
+                )
+                continue
+
+            yield "".join(
+                ResultRead.model_validate(
+                    {
+                        **result._mapping,
+                        **{
+                            f"{question_type}_answers": [
+                                answer._mapping
+                                for answer in answers_by_result.get(result.id, [])
+                            ]
+                            for question_type, answers_by_result in answers.items()
+                        },
+                    }
+                ).model_dump_json()
+                + "\n"
+                for result in batch
+            ).encode("utf-8")
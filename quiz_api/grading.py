@@ -0,0 +1,315 @@
+"""Grading engine for the quiz-api application.
+
+Each question type registers a key loader, which reads the solutions of a
+quiz into compact ``QuestionKey`` objects, and a scorer, which grades a single
+answer against such a key. Answers can be submitted payloads or stored answer
+rows, as both expose the same attributes.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from quiz_api.cache import TTLCache
+from quiz_api.config import config
+from quiz_api.const import QuestionDifficulty
+from quiz_api.documents import get_quiz_version
+from quiz_api.models import (
+    AssignmentQuestion,
+    GapTextQuestion,
+    MultipleChoiceQuestion,
+    OpenOption,
+    OpenQuestion,
+    SingleChoiceQuestion,
+)
+
+DIFFICULTY_WEIGHTS = {
+    QuestionDifficulty.EASY: 1,
+    QuestionDifficulty.MEDIUM: 2,
+    QuestionDifficulty.HARD: 3,
+}
+
+
+class UnknownQuestionError(Exception):
+    """Raised when an answer references a question outside the quiz."""
+
+    def __init__(self, question_type: str, question_id: int | None):
+        super().__init__(f"Question with ID {question_id} is not part of this quiz.")
+        self.question_type = question_type
+        self.question_id = question_id
+
+
+@dataclass(frozen=True, slots=True)
+class QuestionKey:
+    """Precomputed solution of a single question."""
+
+    max_score: int
+    correct: Any
+
+
+@dataclass
+class AnswerKey:
+    """Solutions of all questions of a quiz, by question type and ID."""
+
+    version: int
+    questions: dict[str, dict[int, QuestionKey]] = field(default_factory=dict)
+
+    def get(self, question_type: str, question_id: int | None) -> QuestionKey:
+        """Get the solution of a question."""
+
+        question_key = self.questions.get(question_type, {}).get(question_id)
+
+        if question_key is None:
+            raise UnknownQuestionError(question_type, question_id)
+
+        return question_key
+
+
+KeyLoader = Callable[[AsyncSession, int], Awaitable[dict[int, QuestionKey]]]
+Scorer = Callable[[QuestionKey, Any], int]
+
+key_loaders: dict[str, KeyLoader] = {}
+scorers: dict[str, Scorer] = {}
+
+answer_key_cache: TTLCache[int, AnswerKey] = TTLCache(
+    "answer_key",
+    maxsize=config.answer_key_cache_size,
+    ttl=config.quiz_document_cache_ttl,
+)
+
+
+def key_loader(question_type: str) -> Callable[[KeyLoader], KeyLoader]:
+    """Register the key loader of a question type."""
+
+    def register(loader: KeyLoader) -> KeyLoader:
+        key_loaders[question_type] = loader
+        return loader
+
+    return register
+
+
+def scorer(question_type: str) -> Callable[[Scorer], Scorer]:
+    """Register the scorer of a question type."""
+
+    def register(score: Scorer) -> Scorer:
+        scorers[question_type] = score
+        return score
+
+    return register
+
+
+def get_weight(difficulty: str) -> int:
+    """Get the score weight of a question difficulty."""
+
+    return DIFFICULTY_WEIGHTS.get(
+        difficulty, DIFFICULTY_WEIGHTS[QuestionDifficulty.HARD]
+    )
+
+
+def grade_answer(answer_key: AnswerKey, question_type: str, answer) -> tuple[int, int]:
+    """Grade an answer, returning its score and maximum score."""
+
+    question_key = answer_key.get(question_type, answer.question_id)
+
+    return scorers[question_type](question_key, answer), question_key.max_score
+
+
+@key_loader("single_choice")
+async def load_single_choice_keys(
+    session: AsyncSession, quiz_id: int
+) -> dict[int, QuestionKey]:
+    """Load the solutions of the single choice questions of a quiz."""
+
+    rows = await session.exec(
+        select(
+            SingleChoiceQuestion.id,
+            SingleChoiceQuestion.difficulty,
+            SingleChoiceQuestion.correct_index,
+        ).where(SingleChoiceQuestion.quiz_id == quiz_id)
+    )
+
+    return {
+        question_id: QuestionKey(
+            max_score=get_weight(difficulty), correct=correct_index
+        )
+        for question_id, difficulty, correct_index in rows
+    }
+
+
+@scorer("single_choice")
+def score_single_choice(question_key: QuestionKey, answer) -> int:
+    """Score a single choice answer by its selected index."""
+
+    return (
+        question_key.max_score if answer.selected_index == question_key.correct else 0
+    )
+
+
+@key_loader("multiple_choice")
+async def load_multiple_choice_keys(
+    session: AsyncSession, quiz_id: int
+) -> dict[int, QuestionKey]:
+    """Load the solutions of the multiple choice questions of a quiz."""
+
+    rows = await session.exec(
+        select(
+            MultipleChoiceQuestion.id,
+            MultipleChoiceQuestion.difficulty,
+            MultipleChoiceQuestion.correct_indices,
+        ).where(MultipleChoiceQuestion.quiz_id == quiz_id)
+    )
+
+    return {
+        question_id: QuestionKey(
+            max_score=get_weight(difficulty), correct=frozenset(correct_indices)
+        )
+        for question_id, difficulty, correct_indices in rows
+    }
+
+
+@scorer("multiple_choice")
+def score_multiple_choice(question_key: QuestionKey, answer) -> int:
+    """Score a multiple choice answer by its set of selected indices."""
+
+    return (
+        question_key.max_score
+        if set(answer.selected_indices) == question_key.correct
+        else 0
+    )
+
+
+@key_loader("open")
+async def load_open_keys(session: AsyncSession, quiz_id: int) -> dict[int, QuestionKey]:
+    """Load the solutions of the open questions of a quiz."""
+
+    option_texts: dict[int, list[str]] = {}
+
+    for question_id, text in await session.exec(
+        select(OpenOption.question_id, OpenOption.text)
+        .join(OpenQuestion, OpenOption.question_id == OpenQuestion.id)
+        .where(OpenQuestion.quiz_id == quiz_id)
+    ):
+        option_texts.setdefault(question_id, []).append(text.lower())
+
+    rows = await session.exec(
+        select(OpenQuestion.id, OpenQuestion.difficulty).where(
+            OpenQuestion.quiz_id == quiz_id
+        )
+    )
+
+    return {
+        question_id: QuestionKey(
+            max_score=get_weight(difficulty),
+            correct=tuple(option_texts.get(question_id, ())),
+        )
+        for question_id, difficulty in rows
+    }
+
+
+@scorer("open")
+def score_open(question_key: QuestionKey, answer) -> int:
+    """Score an open answer by whether it contains all option texts."""
+
+    text = answer.text.lower()
+
+    return (
+        question_key.max_score
+        if all(option_text in text for option_text in question_key.correct)
+        else 0
+    )
+
+
+@key_loader("assignment")
+async def load_assignment_keys(
+    session: AsyncSession, quiz_id: int
+) -> dict[int, QuestionKey]:
+    """Load the solutions of the assignment questions of a quiz."""
+
+    rows = await session.exec(
+        select(
+            AssignmentQuestion.id,
+            AssignmentQuestion.difficulty,
+            AssignmentQuestion.correct_indices,
+        ).where(AssignmentQuestion.quiz_id == quiz_id)
+    )
+
+    return {
+        question_id: QuestionKey(
+            max_score=get_weight(difficulty), correct=list(correct_indices)
+        )
+        for question_id, difficulty, correct_indices in rows
+    }
+
+
+@scorer("assignment")
+def score_assignment(question_key: QuestionKey, answer) -> int:
+    """Score an assignment answer by its ordered selected indices."""
+
+    return (
+        question_key.max_score if answer.selected_indices == question_key.correct else 0
+    )
+
+
+@key_loader("gap_text")
+async def load_gap_text_keys(
+    session: AsyncSession, quiz_id: int
+) -> dict[int, QuestionKey]:
+    """Load the solutions of the gap text questions of a quiz."""
+
+    rows = await session.exec(
+        select(
+            GapTextQuestion.id,
+            GapTextQuestion.difficulty,
+            GapTextQuestion.correct_indices,
+        ).where(GapTextQuestion.quiz_id == quiz_id)
+    )
+
+    # Every gap is weighted like a question of its own.
+    return {
+        question_id: QuestionKey(
+            max_score=get_weight(difficulty) * len(correct_indices),
+            correct=list(correct_indices),
+        )
+        for question_id, difficulty, correct_indices in rows
+    }
+
+
+@scorer("gap_text")
+def score_gap_text(question_key: QuestionKey, answer) -> int:
+    """Score a gap text answer by its ordered selected indices."""
+
+    return (
+        question_key.max_score if answer.selected_indices == question_key.correct else 0
+    )
+
+
+async def build_answer_key(
+    session: AsyncSession, quiz_id: int, version: int
+) -> AnswerKey:
+    """Load the answer key of a quiz with the registered key loaders."""
+
+    answer_key = AnswerKey(version=version)
+
+    for question_type, load_keys in key_loaders.items():
+        answer_key.questions[question_type] = await load_keys(session, quiz_id)
+
+    return answer_key
+
+
+async def get_answer_key(session: AsyncSession, quiz_id: int) -> AnswerKey | None:
+    """Get the answer key of a quiz, loading it if the cached one is outdated."""
+
+    version = await get_quiz_version(session, quiz_id)
+
+    if version is None:
+        return None
+
+    answer_key = answer_key_cache.get(quiz_id)
+
+    if answer_key is None or answer_key.version != version:
+        answer_key = await build_answer_key(session, quiz_id, version)
+        answer_key_cache.set(quiz_id, answer_key)
+
+    return answer_key
@@ -0,0 +1,86 @@
+"""Worker pool for password hashing."""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Literal, TypeVar
+
+from quiz_api.log import logger
+from quiz_api.metrics import (
+    hash_duration,
+    hash_pool_in_flight,
+    hash_pool_queue_depth,
+    hash_pool_rejected,
+)
+
+T = TypeVar("T")
+
+HashExecutorType = Literal["thread", "process"]
+
+
+class HashPoolSaturatedError(Exception):
+    """Raised when the hash pool queue is full."""
+
+
+class HashPool:
+    """Bounded worker pool running bcrypt outside the event loop.
+
+    At most ``workers`` calls run at the same time and at most ``queue_size``
+    further calls wait for a worker. Calls beyond that are rejected with
+    ``HashPoolSaturatedError`` instead of queueing without limit.
+    """
+
+    def __init__(self, executor_type: HashExecutorType, workers: int, queue_size: int):
+        self.executor_type = executor_type
+        self.workers = workers
+        self.queue_size = queue_size
+        self.in_flight = 0
+        self._executor: Executor | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a worker."""
+
+        return max(self.in_flight - self.workers, 0)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="quiz-api-hash"
+                )
+
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a hashing function on the pool."""
+
+        if self.in_flight >= self.workers + self.queue_size:
+            hash_pool_rejected.inc()
+            logger.warning(
+                f"Password hashing pool saturated ({self.queue_depth} queued)."
+            )
+            raise HashPoolSaturatedError()
+
+        self.in_flight += 1
+        hash_pool_in_flight.inc()
+        hash_pool_queue_depth.set(self.queue_depth)
+        start = time.perf_counter()
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            hash_pool_in_flight.dec()
+            hash_pool_queue_depth.set(self.queue_depth)
+            hash_duration.observe(time.perf_counter() - start)
+
+    def shutdown(self) -> None:
+        """Shut down the worker pool."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,138 @@
+"""Bulk import of quizzes for the quiz-api application."""
+
+import time
+
+from sqlalchemy import insert
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from quiz_api.db import insert_all, insert_values
+from quiz_api.deletion import OPTION_MODELS
+from quiz_api.documents import touch_labels
+from quiz_api.log import logger
+from quiz_api.models import (
+    QUESTION_MODELS_BY_TYPE,
+    GapTextOption,
+    GapTextSubQuestion,
+    Label,
+    Quiz,
+    QuizImport,
+    QuizLabelRelation,
+    QuizSummary,
+)
+
+Imported = list[tuple[SQLModel, int]]
+
+
+async def insert_children(
+    session: AsyncSession,
+    model: type[SQLModel],
+    parents: Imported,
+    children: str,
+    foreign_key: str,
+) -> Imported:
+    """Insert the children of imported items, pairing each item with its ID."""
+
+    columns = set(model.model_fields) - {"id"}
+    items = [
+        (item, {**item.model_dump(include=columns), foreign_key: parent_id})
+        for parent, parent_id in parents
+        for item in getattr(parent, children)
+    ]
+    row_ids = await insert_values(session, model, [values for _, values in items])
+
+    return [(item, row_id) for (item, _), row_id in zip(items, row_ids)]
+
+
+async def import_quiz(session: AsyncSession, document: QuizImport) -> QuizSummary:
+    """Insert a quiz with its questions, options and labels.
+
+    Every level of the tree is written with one batched INSERT per table, and
+    the IDs returned for one level become the foreign keys of the next, so the
+    number of statements depends on the number of tables rather than rows.
+    Labels are matched by text and only created if they do not exist yet. The
+    caller commits, so the import happens in one transaction.
+    """
+
+    start = time.perf_counter()
+    quiz = Quiz.model_validate(document.model_dump(include=set(Quiz.model_fields)))
+    await insert_all(session, [quiz])
+
+    question_count = 0
+    option_count = 0
+
+    for question_type, question_model in QUESTION_MODELS_BY_TYPE.items():
+        questions = await insert_children(
+            session,
+            question_model,
+            [(document, quiz.id)],
+            f"{question_type}_questions",
+            "quiz_id",
+        )
+        question_count += len(questions)
+
+        if question_model in OPTION_MODELS:
+            options = await insert_children(
+                session,
+                OPTION_MODELS[question_model],
+                questions,
+                f"{question_type}_options",
+                "question_id",
+            )
+        else:
+            sub_questions = await insert_children(
+                session,
+                GapTextSubQuestion,
+                questions,
+                "gap_text_sub_questions",
+                "question_id",
+            )
+            options = await insert_children(
+                session,
+                GapTextOption,
+                sub_questions,
+                "gap_text_options",
+                "sub_question_id",
+            )
+
+        option_count += len(options)
+
+    label_texts = list(dict.fromkeys(label.text for label in document.labels))
+
+    if label_texts:
+        label_ids = dict(
+            (
+                await session.exec(
+                    select(Label.text, Label.id).where(Label.text.in_(label_texts))
+                )
+            ).all()
+        )
+
+        await touch_labels(session, *label_ids.values())
+
+        new_labels = [Label(text=text) for text in label_texts if text not in label_ids]
+        await insert_all(session, new_labels)
+        label_ids.update((label.text, label.id) for label in new_labels)
+
+        await session.exec(
+            insert(QuizLabelRelation).values(
+                [
+                    {"quiz_id": quiz.id, "label_id": label_id}
+                    for label_id in label_ids.values()
+                ]
+            )
+        )
+
+    seconds = time.perf_counter() - start
+    logger.info(
+        f"Imported quiz {quiz.id} with {question_count} questions and "
+        f"{option_count} options in {seconds:.3f}s "
+        f"({question_count / seconds if seconds else 0:.0f} questions/s)."
+    )
+
+    return QuizSummary(
+        id=quiz.id,
+        title=quiz.title,
+        is_practice=quiz.is_practice,
+        question_count=question_count,
+    )
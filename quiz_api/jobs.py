@@ -0,0 +1,546 @@
+"""Background jobs for the quiz-api application.
+
+Heavy admin operations are submitted as jobs and run by a bounded number of
+workers on the event loop, so they cannot take over request handling. Jobs
+are kept in memory by default. With the database store they are persisted
+in the ``job`` table, so they survive restarts and can be polled and
+cancelled from any worker process.
+"""
+
+import asyncio
+import time
+from collections import deque
+from datetime import UTC, datetime, timedelta
+from typing import Awaitable, Callable
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import and_, or_, update
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from quiz_api.config import config
+from quiz_api.const import DEFAULT_REGRADE_CHUNK_SIZE, JobStatus
+from quiz_api.db import async_db_engine
+from quiz_api.deletion import delete_quizzes
+from quiz_api.importing import import_quiz
+from quiz_api.labels import edit_label
+from quiz_api.log import logger
+from quiz_api.models import Job, LabelCreate, QuizImport, Result
+from quiz_api.regrade import regrade_quiz_results
+
+FINISHED_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class UnknownJobKindError(Exception):
+    """Raised when a job of an unregistered kind is submitted."""
+
+
+class JobContext:
+    """Handle passed to a running job to report its progress."""
+
+    def __init__(self, job: Job):
+        self.job = job
+
+    def set_progress(self, done: int, total: int) -> None:
+        """Set the fraction of work done, persisted with the next heartbeat."""
+
+        self.job.progress = min(done / total, 1.0) if total else 1.0
+
+
+JobHandler = Callable[[JobContext, BaseModel], Awaitable[dict | None]]
+
+job_handlers: dict[str, tuple[type[BaseModel], JobHandler]] = {}
+
+
+def job_handler(
+    kind: str, params_model: type[BaseModel]
+) -> Callable[[JobHandler], JobHandler]:
+    """Register the handler of a job kind with the model of its parameters."""
+
+    def register(handler: JobHandler) -> JobHandler:
+        job_handlers[kind] = (params_model, handler)
+        return handler
+
+    return register
+
+
+def get_job_handler(kind: str, params: dict) -> tuple[JobHandler, BaseModel]:
+    """Get the handler of a job kind with the validated parameters of a job.
+
+    Raises ``UnknownJobKindError`` for unregistered kinds and
+    ``ValidationError`` for invalid parameters.
+    """
+
+    if kind not in job_handlers:
+        raise UnknownJobKindError(f"Unknown job kind '{kind}'.")
+
+    params_model, handler = job_handlers[kind]
+
+    return handler, params_model.model_validate(params)
+
+
+class MemoryJobStore:
+    """Job store keeping the jobs of this process in memory.
+
+    Only the latest ``history_size`` finished jobs are kept, so the parameters
+    and results of old jobs do not accumulate.
+    """
+
+    def __init__(self, history_size: int):
+        self.history_size = history_size
+        self.jobs: dict[int, Job] = {}
+        self.finished: deque[int] = deque()
+        self.queue: asyncio.Queue[int] | None = None
+        self.last_id = 0
+
+    def start(self) -> None:
+        """Create the queue of pending jobs on the running event loop."""
+
+        # Queues are bound to the loop that first uses them, so every start of
+        # the application gets a new one with the jobs still pending.
+        self.queue = asyncio.Queue()
+
+        for job in sorted(self.jobs.values(), key=lambda job: job.id):
+            if job.status == JobStatus.PENDING:
+                self.queue.put_nowait(job.id)
+
+    def finish(self, job: Job) -> None:
+        """Record a finished job, forgetting the oldest ones beyond the limit."""
+
+        self.finished.append(job.id)
+
+        while len(self.finished) > self.history_size:
+            self.jobs.pop(self.finished.popleft(), None)
+
+    async def add(self, job: Job) -> Job:
+        """Add a pending job."""
+
+        self.last_id += 1
+        job.id = self.last_id
+        self.jobs[job.id] = job
+
+        if self.queue is not None:
+            self.queue.put_nowait(job.id)
+
+        return job
+
+    async def get(self, job_id: int) -> Job | None:
+        """Get a job by ID."""
+
+        return self.jobs.get(job_id)
+
+    async def list(self, limit: int) -> list[Job]:
+        """Get the latest jobs."""
+
+        return sorted(self.jobs.values(), key=lambda job: job.id, reverse=True)[:limit]
+
+    async def claim(self) -> Job:
+        """Wait for a pending job and mark it as running."""
+
+        while True:
+            job = self.jobs.get(await self.queue.get())
+
+            if job is not None and job.status == JobStatus.PENDING:
+                job.status = JobStatus.RUNNING
+                job.started_at = job.updated_at = datetime.now(UTC)
+                return job
+
+    async def save(self, job: Job) -> bool:
+        """Save the state of a running job and get whether it should stop."""
+
+        job.updated_at = datetime.now(UTC)
+
+        if job.status in FINISHED_STATUSES:
+            self.finish(job)
+
+        return job.cancel_requested
+
+    async def request_cancel(self, job_id: int) -> Job | None:
+        """Cancel a pending job or ask a running job to stop."""
+
+        job = self.jobs.get(job_id)
+
+        if job is None or job.status in FINISHED_STATUSES:
+            return job
+
+        if job.status == JobStatus.PENDING:
+            job.status = JobStatus.CANCELLED
+            job.finished_at = datetime.now(UTC)
+            self.finish(job)
+        else:
+            job.cancel_requested = True
+
+        return job
+
+
+class DatabaseJobStore:
+    """Job store persisting jobs in the database.
+
+    Running jobs renew a lease with every heartbeat. Jobs whose lease expired,
+    because their process died, are claimed again by the next free worker.
+    """
+
+    def __init__(self, poll_interval: float, lease: float):
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.wakeup: asyncio.Event | None = None
+
+    def start(self) -> None:
+        """Create the wakeup event on the running event loop."""
+
+        self.wakeup = asyncio.Event()
+
+    async def add(self, job: Job) -> Job:
+        """Add a pending job."""
+
+        async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+            session.add(job)
+            await session.commit()
+
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+        return job
+
+    async def get(self, job_id: int) -> Job | None:
+        """Get a job by ID."""
+
+        async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+            return await session.get(Job, job_id)
+
+    async def list(self, limit: int) -> list[Job]:
+        """Get the latest jobs."""
+
+        async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+            return (
+                await session.exec(select(Job).order_by(Job.id.desc()).limit(limit))
+            ).all()
+
+    async def claim(self) -> Job:
+        """Wait for a pending job and mark it as running."""
+
+        while True:
+            now = datetime.now(UTC)
+            claimable = or_(
+                Job.status == JobStatus.PENDING,
+                and_(
+                    Job.status == JobStatus.RUNNING,
+                    Job.updated_at < now - timedelta(seconds=self.lease),
+                ),
+            )
+
+            async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+                # The claim condition is repeated outside the subquery so two
+                # processes never claim the same job.
+                job = (
+                    await session.exec(
+                        update(Job)
+                        .where(
+                            Job.id
+                            == select(Job.id)
+                            .where(claimable)
+                            .order_by(Job.id)
+                            .limit(1)
+                            .scalar_subquery(),
+                            claimable,
+                        )
+                        .values(
+                            status=JobStatus.RUNNING, started_at=now, updated_at=now
+                        )
+                        .returning(Job)
+                        .execution_options(synchronize_session=False)
+                    )
+                ).scalar_one_or_none()
+                await session.commit()
+
+            if job is not None:
+                return job
+
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+
+            self.wakeup.clear()
+
+    async def save(self, job: Job) -> bool:
+        """Save the state of a running job and get whether it should stop."""
+
+        job.updated_at = datetime.now(UTC)
+
+        async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+            cancel_requested = (
+                await session.exec(
+                    update(Job)
+                    .where(Job.id == job.id)
+                    .values(
+                        status=job.status,
+                        progress=job.progress,
+                        result=job.result,
+                        error=job.error,
+                        started_at=job.started_at,
+                        finished_at=job.finished_at,
+                        updated_at=job.updated_at,
+                    )
+                    .returning(Job.cancel_requested)
+                    .execution_options(synchronize_session=False)
+                )
+            ).scalar_one_or_none()
+            await session.commit()
+
+        return bool(cancel_requested)
+
+    async def request_cancel(self, job_id: int) -> Job | None:
+        """Cancel a pending job or ask a running job to stop."""
+
+        async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+            await session.exec(
+                update(Job)
+                .where(Job.id == job_id, Job.status == JobStatus.PENDING)
+                .values(status=JobStatus.CANCELLED, finished_at=datetime.now(UTC))
+                .execution_options(synchronize_session=False)
+            )
+            await session.exec(
+                update(Job)
+                .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+                .values(cancel_requested=True)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+            return await session.get(Job, job_id)
+
+
+JobStore = MemoryJobStore | DatabaseJobStore
+
+
+class JobRunner:
+    """Runs submitted jobs on a bounded number of workers."""
+
+    def __init__(self, store: JobStore, workers: int, heartbeat_interval: float):
+        self.store = store
+        self.workers = workers
+        self.heartbeat_interval = heartbeat_interval
+        self.running: dict[int, asyncio.Task] = {}
+        self._worker_tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the workers."""
+
+        self.store.start()
+        self._worker_tasks = [
+            asyncio.create_task(self.work(), name=f"quiz-api-job-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Stop the workers, returning interrupted jobs to the queue."""
+
+        for worker_task in self._worker_tasks:
+            worker_task.cancel()
+
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    async def submit(self, kind: str, params: dict) -> Job:
+        """Submit a job.
+
+        Raises ``UnknownJobKindError`` for unregistered kinds and
+        ``ValidationError`` for invalid parameters.
+        """
+
+        _, validated_params = get_job_handler(kind, params)
+
+        job = await self.store.add(Job(kind=kind, params=validated_params.model_dump()))
+        logger.info(f"Submitted job {job.id} ({kind}).")
+
+        return job
+
+    async def cancel(self, job_id: int) -> Job | None:
+        """Cancel a job."""
+
+        # A job running in this process is stopped right away instead of with
+        # the next heartbeat.
+        if job_id in self.running:
+            self.running[job_id].cancel()
+
+        return await self.store.request_cancel(job_id)
+
+    async def work(self) -> None:
+        """Run jobs one after another.
+
+        When no job can be claimed, for example while the database is locked,
+        the worker waits for a poll interval and tries again.
+        """
+
+        while True:
+            try:
+                job = await self.store.claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error claiming a job: {e}")
+                await asyncio.sleep(self.heartbeat_interval)
+                continue
+
+            try:
+                await self.run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error running job {job.id}: {e}")
+
+    async def save(self, job: Job) -> bool:
+        """Save the state of a running job and get whether it should stop.
+
+        Errors are logged instead of raised, so a busy database never
+        abandons a running job. A job whose state cannot be saved keeps its
+        last state and is claimed again once its lease expires, so jobs run
+        at least once.
+        """
+
+        try:
+            return await self.store.save(job)
+        except Exception as e:
+            logger.warning(f"Error saving job {job.id}: {e}")
+            return False
+
+    async def run(self, job: Job) -> None:
+        """Run a claimed job until it finishes, fails or is cancelled."""
+
+        # Jobs of the database store may have been submitted by another version
+        # of the application, so they fail instead of being claimed again.
+        try:
+            handler, params = get_job_handler(job.kind, job.params)
+        except (UnknownJobKindError, ValidationError) as e:
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+            job.finished_at = datetime.now(UTC)
+            await self.save(job)
+
+            logger.error(f"Job {job.id} ({job.kind}) failed to start: {e}")
+            return
+
+        context = JobContext(job)
+        start = time.perf_counter()
+        task = asyncio.create_task(handler(context, params))
+        self.running[job.id] = task
+
+        logger.info(f"Started job {job.id} ({job.kind}).")
+
+        try:
+            while not task.done():
+                await asyncio.wait({task}, timeout=self.heartbeat_interval)
+
+                if not task.done() and await self.save(job):
+                    task.cancel()
+        except asyncio.CancelledError:
+            # The runner is stopping, so the job is handed back to the queue.
+            task.cancel()
+            job.status = JobStatus.PENDING
+            job.started_at = None
+            await asyncio.shield(self.save(job))
+            raise
+        finally:
+            self.running.pop(job.id, None)
+
+        if task.cancelled():
+            job.status = JobStatus.CANCELLED
+        elif task.exception() is not None:
+            job.status = JobStatus.FAILED
+            job.error = str(task.exception())
+        else:
+            job.status = JobStatus.SUCCEEDED
+            job.progress = 1.0
+            job.result = task.result()
+
+        job.finished_at = datetime.now(UTC)
+        await self.save(job)
+
+        logger.info(
+            f"Job {job.id} ({job.kind}) {job.status} in "
+            f"{time.perf_counter() - start:.3f}s."
+        )
+
+
+def create_job_runner() -> JobRunner:
+    """Create the job runner from the configuration."""
+
+    if config.job_store == "database":
+        store = DatabaseJobStore(config.job_poll_interval, config.job_lease)
+    else:
+        store = MemoryJobStore(config.job_history_size)
+
+    return JobRunner(store, config.job_workers, config.job_poll_interval)
+
+
+class DeleteQuizzesParams(BaseModel):
+    quiz_ids: list[int]
+
+
+class RegradeParams(BaseModel):
+    quiz_id: int
+    chunk_size: int = DEFAULT_REGRADE_CHUNK_SIZE
+
+
+class UpdateLabelParams(LabelCreate):
+    label_id: int
+
+
+@job_handler("delete_quiz", DeleteQuizzesParams)
+async def run_delete_quizzes(context: JobContext, params: DeleteQuizzesParams):
+    """Delete quizzes with everything that belongs to them."""
+
+    async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+        deleted = await delete_quizzes(session, params.quiz_ids)
+        await session.commit()
+
+    return {"deleted": deleted}
+
+
+@job_handler("regrade", RegradeParams)
+async def run_regrade(context: JobContext, params: RegradeParams):
+    """Re-grade all results of a quiz."""
+
+    async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+        total = (
+            await session.exec(
+                select(func.count(Result.id)).where(Result.quiz_id == params.quiz_id)
+            )
+        ).one()
+        report = await regrade_quiz_results(
+            session,
+            params.quiz_id,
+            params.chunk_size,
+            on_chunk=lambda report: context.set_progress(report.results, total),
+        )
+
+    if report is None:
+        raise ValueError(f"Quiz with ID {params.quiz_id} not found.")
+
+    return report.model_dump()
+
+
+@job_handler("import_quiz", QuizImport)
+async def run_import_quiz(context: JobContext, params: QuizImport):
+    """Create a quiz with all its questions, options and labels."""
+
+    async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+        summary = await import_quiz(session, params)
+        await session.commit()
+
+    return summary.model_dump()
+
+
+@job_handler("update_label", UpdateLabelParams)
+async def run_update_label(context: JobContext, params: UpdateLabelParams):
+    """Set the text and the quizzes of a label."""
+
+    async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+        await edit_label(session, params.label_id, params)
+        await session.commit()
+
+    return {"label_id": params.label_id, "quiz_ids": params.quiz_ids}
+
+
+job_runner = create_job_runner()
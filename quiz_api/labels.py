@@ -0,0 +1,43 @@
+"""Label updates for the quiz-api application."""
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from quiz_api.documents import touch_labels, touch_quizzes
+from quiz_api.models import Label, LabelCreate, Quiz
+
+
+class NotFoundError(Exception):
+    """Raised when a label or one of its quizzes does not exist."""
+
+
+async def edit_label(session: AsyncSession, label_id: int, label: LabelCreate) -> Label:
+    """Set the text and the quizzes of a label.
+
+    The documents of the quizzes losing or gaining the label are invalidated.
+    Raises ``NotFoundError`` for a missing label or quiz. The caller commits.
+    """
+
+    db_label = await session.get(Label, label_id)
+
+    if db_label is None:
+        raise NotFoundError(f"Label with ID {label_id} not found.")
+
+    db_quizzes: list[Quiz] = []
+
+    for quiz_id in label.quiz_ids:
+        db_quiz = await session.get(Quiz, quiz_id)
+
+        if db_quiz is None:
+            raise NotFoundError(f"Quiz with ID {quiz_id} not found.")
+
+        db_quizzes.append(db_quiz)
+
+    await touch_labels(session, label_id)
+    await touch_quizzes(session, label.quiz_ids)
+
+    db_label.text = label.text
+    db_label.quizzes = db_quizzes
+
+    session.add(db_label)
+
+    return db_label
@@ -1,16 +1,164 @@
-"""Logging configuration for the quiz-api application."""
+"""Logging configuration for the quiz-api application.
 
+The handlers of ``LOGGING_CONFIG`` run on background threads. Loggers only
+put records on bounded queues, so a slow stream or log volume never blocks
+request handling. Records are dropped while a queue is full.
+"""
+
+import atexit
+import json
 import logging
+import queue
+import re
+import time
+import uuid
+from contextvars import ContextVar
 from logging import config as logging_config
+from logging.handlers import QueueHandler, QueueListener
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from quiz_api.config import config
-from quiz_api.const import LOGGING_CONFIG
+from quiz_api.const import LOGGING_CONFIG, REQUEST_ID_PATTERN
+from quiz_api.metrics import log_records_dropped
+
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as JSON objects including their extra attributes."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in RECORD_ATTRIBUTES
+        )
+
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(data, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the ID of the current request to records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        current_request_id = request_id.get()
+
+        if current_request_id is not None:
+            record.request_id = current_request_id
+
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler dropping records instead of blocking when the queue is full."""
+
+    def __init__(self, record_queue: queue.Queue):
+        super().__init__(record_queue)
+        self.addFilter(RequestIdFilter())
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+
+
+def start_queue_handlers(logger_names: list[str]) -> None:
+    """Move the handlers of loggers to background threads."""
+
+    queue_handlers: dict[logging.Handler, DroppingQueueHandler] = {}
+
+    for logger_name in logger_names:
+        named_logger = logging.getLogger(logger_name)
+
+        for handler in named_logger.handlers[:]:
+            if handler not in queue_handlers:
+                queue_handler = DroppingQueueHandler(queue.Queue(config.log_queue_size))
+                listener = QueueListener(
+                    queue_handler.queue, handler, respect_handler_level=True
+                )
+                listener.start()
+                atexit.register(listener.stop)
+                queue_handlers[handler] = queue_handler
+
+            named_logger.removeHandler(handler)
+            named_logger.addHandler(queue_handlers[handler])
+
 
 LOGGING_CONFIG["handlers"]["file"]["filename"] = config.log_path
-# LOGGING_CONFIG["loggers"]["uvicorn.error"]["level"] = config.log_level
-# LOGGING_CONFIG["loggers"]["uvicorn.access"]["level"] = config.log_level
-# LOGGING_CONFIG["loggers"]["quiz_api"]["level"] = config.log_level
+LOGGING_CONFIG["loggers"]["uvicorn.error"]["level"] = config.log_level
+LOGGING_CONFIG["loggers"]["uvicorn.access"]["level"] = config.log_level
+LOGGING_CONFIG["loggers"]["quiz_api"]["level"] = config.log_level
+
+if config.log_format == "json":
+    for formatter in LOGGING_CONFIG["formatters"].values():
+        formatter.clear()
+        formatter["()"] = JsonFormatter
 
 logging_config.dictConfig(LOGGING_CONFIG)
+start_queue_handlers(list(LOGGING_CONFIG["loggers"]))
 
 logger = logging.getLogger("quiz_api")
+access_logger = logging.getLogger("quiz_api.access")
+
+
+class RequestLogMiddleware:
+    """Assign an ID to every request and log the request with its latency.
+
+    The ID is taken from the X-Request-ID header when the client sends a valid
+    one and is returned in the same header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        current_request_id = Headers(scope=scope).get("x-request-id", "")
+
+        if not re.fullmatch(REQUEST_ID_PATTERN, current_request_id):
+            current_request_id = uuid.uuid4().hex
+
+        token = request_id.set(current_request_id)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", current_request_id)
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            access_logger.info(
+                f"{scope['method']} {scope['path']} {status} {latency_ms:.1f}ms",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "latency_ms": round(latency_ms, 1),
+                },
+            )
+            request_id.reset(token)
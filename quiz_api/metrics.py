@@ -0,0 +1,143 @@
+"""Prometheus metrics for the quiz-api application.
+
+When the metrics directory was prepared by ``prepare_metrics_path``, metric
+values are kept in memory-mapped files there, so a scrape of ``/metrics``
+served by any worker process reports the aggregate of all of them. Gauges
+describing the state of a process are summed over the processes that are
+still alive. Otherwise the metrics of the current process are reported.
+"""
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from quiz_api.const import POOL_CHECKOUT_BUCKETS, REQUEST_DURATION_BUCKETS
+
+requests_total = Counter(
+    "quiz_api_requests_total",
+    "Handled HTTP requests.",
+    ["operation_id", "method", "status"],
+)
+request_duration = Histogram(
+    "quiz_api_request_duration_seconds",
+    "Time until the response of an HTTP request was sent.",
+    ["operation_id", "method"],
+    buckets=REQUEST_DURATION_BUCKETS,
+)
+requests_in_progress = Gauge(
+    "quiz_api_requests_in_progress",
+    "HTTP requests being handled.",
+    multiprocess_mode="livesum",
+)
+db_pool_checkout_duration = Histogram(
+    "quiz_api_db_pool_checkout_seconds",
+    "Time spent waiting for a database connection from the pool.",
+    buckets=POOL_CHECKOUT_BUCKETS,
+)
+db_pool_checked_out = Gauge(
+    "quiz_api_db_pool_checked_out",
+    "Database connections checked out from the pool.",
+    multiprocess_mode="livesum",
+)
+hash_pool_in_flight = Gauge(
+    "quiz_api_hash_pool_in_flight",
+    "Password hashing calls running or waiting for a worker.",
+    multiprocess_mode="livesum",
+)
+hash_pool_queue_depth = Gauge(
+    "quiz_api_hash_pool_queue_depth",
+    "Password hashing calls waiting for a worker.",
+    multiprocess_mode="livesum",
+)
+hash_pool_rejected = Counter(
+    "quiz_api_hash_pool_rejected_total",
+    "Password hashing calls rejected because the pool was saturated.",
+)
+hash_duration = Histogram(
+    "quiz_api_hash_duration_seconds",
+    "Time spent on a password hashing call, including queueing.",
+    buckets=REQUEST_DURATION_BUCKETS,
+)
+cache_lookups = Counter(
+    "quiz_api_cache_lookups_total",
+    "Cache lookups by cache and result, hit ratios are derived from these.",
+    ["cache", "result"],
+)
+log_records_dropped = Counter(
+    "quiz_api_log_records_dropped_total",
+    "Log records dropped because a log queue was full.",
+)
+
+
+def get_scope_operation_id(scope: Scope) -> str:
+    """Get the operation ID of the route a request matched."""
+
+    # The router stores the matched route in the shared scope.
+    return getattr(scope.get("route"), "operation_id", None) or getattr(
+        scope.get("endpoint"), "__name__", "unmatched"
+    )
+
+
+def get_metrics(request: Request) -> Response:
+    """Get the metrics of all worker processes."""
+
+    registry = REGISTRY
+
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """Record the count, latency and concurrency of HTTP requests.
+
+    Requests are labeled with the operation ID of the route they matched, so
+    path parameters do not create new series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+            await send(message)
+
+        start = time.perf_counter()
+        requests_in_progress.inc()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            requests_in_progress.dec()
+
+            operation_id = get_scope_operation_id(scope)
+            requests_total.labels(operation_id, scope["method"], status).inc()
+            request_duration.labels(operation_id, scope["method"]).observe(
+                time.perf_counter() - start
+            )
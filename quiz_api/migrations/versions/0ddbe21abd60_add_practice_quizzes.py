@@ -21,6 +21,11 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
+    # Databases created through SQLModel.metadata.create_all already have it.
+    columns = sa.inspect(op.get_bind()).get_columns("quiz")
+    if any(column["name"] == "is_practice" for column in columns):
+        return
+
     # ### commands auto generated by Alembic - please adjust! ###
     op.add_column(
         "quiz",
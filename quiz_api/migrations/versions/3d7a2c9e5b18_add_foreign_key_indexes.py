@@ -0,0 +1,58 @@
+import sqlmodel
+
+"""Add foreign key indexes
+
+Revision ID: 3d7a2c9e5b18
+Revises: 9f3d6b1a7c42
+Create Date: 2026-10-18 06:24:11.305817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3d7a2c9e5b18"
+down_revision: Union[str, None] = "9f3d6b1a7c42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+columns = {
+    "result": ["user_id"],
+    "quiz_label_relation": ["label_id"],
+    "single_choice_question": ["quiz_id"],
+    "multiple_choice_question": ["quiz_id"],
+    "open_question": ["quiz_id"],
+    "assignment_question": ["quiz_id"],
+    "gap_text_question": ["quiz_id"],
+    "single_choice_option": ["question_id"],
+    "multiple_choice_option": ["question_id"],
+    "open_option": ["question_id"],
+    "assignment_option": ["question_id"],
+    "gap_text_sub_question": ["question_id"],
+    "gap_text_option": ["sub_question_id"],
+    "single_choice_answer": ["result_id", "question_id"],
+    "multiple_choice_answer": ["result_id", "question_id"],
+    "open_answer": ["result_id", "question_id"],
+    "assignment_answer": ["result_id", "question_id"],
+    "gap_text_answer": ["result_id", "question_id"],
+}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    for table, table_columns in columns.items():
+        existing = {index["name"] for index in inspector.get_indexes(table)}
+
+        for column in table_columns:
+            if f"ix_{table}_{column}" not in existing:
+                op.create_index(f"ix_{table}_{column}", table, [column])
+
+
+def downgrade() -> None:
+    for table, table_columns in columns.items():
+        for column in table_columns:
+            op.drop_index(f"ix_{table}_{column}", table_name=table)
@@ -0,0 +1,35 @@
+import sqlmodel
+
+"""Add quiz version
+
+Revision ID: 7b0cb97e610e
+Revises: 0ddbe21abd60
+Create Date: 2026-10-18 04:45:12.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7b0cb97e610e"
+down_revision: Union[str, None] = "0ddbe21abd60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = sa.inspect(op.get_bind()).get_columns("quiz")
+    if any(column["name"] == "version" for column in columns):
+        return
+
+    op.add_column(
+        "quiz",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("quiz", "version")
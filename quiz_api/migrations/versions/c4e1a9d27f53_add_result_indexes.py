@@ -0,0 +1,38 @@
+import sqlmodel
+
+"""Add result indexes
+
+Revision ID: c4e1a9d27f53
+Revises: 7b0cb97e610e
+Create Date: 2026-10-18 05:02:37.184520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e1a9d27f53"
+down_revision: Union[str, None] = "7b0cb97e610e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+indexes = {
+    "ix_result_quiz_id_user_id_created_at": ["quiz_id", "user_id", "created_at"],
+    "ix_result_created_at": ["created_at"],
+}
+
+
+def upgrade() -> None:
+    existing = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("result")}
+
+    for name, columns in indexes.items():
+        if name not in existing:
+            op.create_index(name, "result", columns)
+
+
+def downgrade() -> None:
+    for name in indexes:
+        op.drop_index(name, table_name="result")
@@ -0,0 +1,36 @@
+import sqlmodel
+
+"""Add result score index
+
+Revision ID: e82b5f0c3d19
+Revises: c4e1a9d27f53
+Create Date: 2026-10-18 05:14:09.527361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e82b5f0c3d19"
+down_revision: Union[str, None] = "c4e1a9d27f53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    indexes = sa.inspect(op.get_bind()).get_indexes("result")
+    if any(index["name"] == "ix_result_quiz_id_user_id_score_created_at" for index in indexes):
+        return
+
+    op.create_index(
+        "ix_result_quiz_id_user_id_score_created_at",
+        "result",
+        ["quiz_id", "user_id", "score", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_result_quiz_id_user_id_score_created_at", table_name="result")
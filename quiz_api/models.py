@@ -2,10 +2,10 @@ from datetime import datetime, timezone
 from typing import List
 
 from pydantic import BaseModel
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, Index
 from sqlmodel import Field, Relationship, SQLModel
 
-from quiz_api.const import QuestionDifficulty
+from quiz_api.const import JobStatus, QuestionDifficulty
 
 
 class HasTitle(SQLModel):
@@ -26,18 +26,18 @@ class QuizBase(HasTitle):
 
 class ResultBase(SQLModel):
     quiz_id: int | None = Field(default=None, foreign_key="quiz.id")
-    user_id: int | None = Field(default=None, foreign_key="user.id")
+    user_id: int | None = Field(default=None, foreign_key="user.id", index=True)
     score: int = Field(default=0)
     max_score: int = Field(default=0)
 
 
 class QuestionBase(HasTitle, HasText, HasIndex):
-    quiz_id: int | None = Field(default=None, foreign_key="quiz.id")
+    quiz_id: int | None = Field(default=None, foreign_key="quiz.id", index=True)
     difficulty: QuestionDifficulty = Field(default=QuestionDifficulty.EASY)
 
 
 class AnswerBase(SQLModel):
-    result_id: int | None = Field(default=None, foreign_key="result.id")
+    result_id: int | None = Field(default=None, foreign_key="result.id", index=True)
 
 
 class SingleChoiceQuestionBase(QuestionBase):
@@ -61,62 +61,74 @@ class GapTextQuestionBase(QuestionBase):
 
 
 class GapTextSubQuestionBase(HasIndex):
-    question_id: int | None = Field(default=None, foreign_key="gap_text_question.id")
+    question_id: int | None = Field(
+        default=None, foreign_key="gap_text_question.id", index=True
+    )
 
 
 class SingleChoiceOptionBase(HasText, HasIndex):
     question_id: int | None = Field(
-        default=None, foreign_key="single_choice_question.id"
+        default=None, foreign_key="single_choice_question.id", index=True
     )
 
 
 class MultipleChoiceOptionBase(HasText, HasIndex):
     question_id: int | None = Field(
-        default=None, foreign_key="multiple_choice_question.id"
+        default=None, foreign_key="multiple_choice_question.id", index=True
     )
 
 
 class OpenOptionBase(HasText, HasIndex):
-    question_id: int | None = Field(default=None, foreign_key="open_question.id")
+    question_id: int | None = Field(
+        default=None, foreign_key="open_question.id", index=True
+    )
 
 
 class AssignmentOptionBase(HasText, HasIndex):
-    question_id: int | None = Field(default=None, foreign_key="assignment_question.id")
+    question_id: int | None = Field(
+        default=None, foreign_key="assignment_question.id", index=True
+    )
     correct_index: int
 
 
 class GapTextOptionBase(HasText, HasIndex):
     sub_question_id: int | None = Field(
-        default=None, foreign_key="gap_text_sub_question.id"
+        default=None, foreign_key="gap_text_sub_question.id", index=True
     )
 
 
 class SingleChoiceAnswerBase(AnswerBase):
     question_id: int | None = Field(
-        default=None, foreign_key="single_choice_question.id"
+        default=None, foreign_key="single_choice_question.id", index=True
     )
     selected_index: int
 
 
 class MultipleChoiceAnswerBase(AnswerBase):
     question_id: int | None = Field(
-        default=None, foreign_key="multiple_choice_question.id"
+        default=None, foreign_key="multiple_choice_question.id", index=True
     )
     selected_indices: List[int]
 
 
 class OpenAnswerBase(AnswerBase):
-    question_id: int | None = Field(default=None, foreign_key="open_question.id")
+    question_id: int | None = Field(
+        default=None, foreign_key="open_question.id", index=True
+    )
     text: str
 
 
 class AssignmentAnswerBase(AnswerBase):
-    question_id: int | None = Field(default=None, foreign_key="assignment_question.id")
+    question_id: int | None = Field(
+        default=None, foreign_key="assignment_question.id", index=True
+    )
     selected_indices: List[int] = Field(sa_column=Column(JSON))
 
 
 class GapTextAnswerBase(AnswerBase):
-    question_id: int | None = Field(default=None, foreign_key="gap_text_question.id")
+    question_id: int | None = Field(
+        default=None, foreign_key="gap_text_question.id", index=True
+    )
     selected_indices: List[int] = Field(sa_column=Column(JSON))
 
 
@@ -129,17 +141,25 @@ class LabelBase(SQLModel):
     text: str = Field(index=True, unique=True)
 
 
+class JobBase(SQLModel):
+    kind: str
+    params: dict = Field(default_factory=dict)
+
+
 class QuizLabelRelation(SQLModel, table=True):
     __tablename__ = "quiz_label_relation"
 
     quiz_id: int | None = Field(default=None, foreign_key="quiz.id", primary_key=True)
-    label_id: int | None = Field(default=None, foreign_key="label.id", primary_key=True)
+    label_id: int | None = Field(
+        default=None, foreign_key="label.id", primary_key=True, index=True
+    )
 
 
 class Quiz(QuizBase, table=True):
     __tablename__ = "quiz"
 
     id: int | None = Field(default=None, primary_key=True)
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
     single_choice_questions: List["SingleChoiceQuestion"] = Relationship(
         sa_relationship_kwargs={"lazy": "selectin"}
     )
@@ -164,6 +184,19 @@ class Quiz(QuizBase, table=True):
 
 class Result(ResultBase, table=True):
     __tablename__ = "result"
+    __table_args__ = (
+        Index(
+            "ix_result_quiz_id_user_id_created_at", "quiz_id", "user_id", "created_at"
+        ),
+        Index("ix_result_created_at", "created_at"),
+        Index(
+            "ix_result_quiz_id_user_id_score_created_at",
+            "quiz_id",
+            "user_id",
+            "score",
+            "created_at",
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     user: "User" = Relationship(sa_relationship_kwargs={"lazy": "selectin"})
@@ -351,6 +384,22 @@ class Label(LabelBase, table=True):
         return [quiz.id for quiz in self.quizzes]
 
 
+class Job(JobBase, table=True):
+    __tablename__ = "job"
+
+    id: int | None = Field(default=None, primary_key=True)
+    params: dict = Field(default_factory=dict, sa_column=Column(JSON))
+    status: str = Field(default=JobStatus.PENDING, index=True)
+    progress: float = Field(default=0.0)
+    result: dict | None = Field(default=None, sa_column=Column(JSON))
+    error: str | None = None
+    cancel_requested: bool = Field(default=False)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -441,6 +490,43 @@ class LabelCreate(LabelBase):
     quiz_ids: List[int] = []
 
 
+class JobCreate(JobBase):
+    pass
+
+
+class QuizImport(QuizBase):
+    single_choice_questions: List["SingleChoiceQuestionImport"] = []
+    multiple_choice_questions: List["MultipleChoiceQuestionImport"] = []
+    open_questions: List["OpenQuestionImport"] = []
+    assignment_questions: List["AssignmentQuestionImport"] = []
+    gap_text_questions: List["GapTextQuestionImport"] = []
+    labels: List[LabelBase] = []
+
+
+class SingleChoiceQuestionImport(SingleChoiceQuestionBase):
+    single_choice_options: List[SingleChoiceOptionCreate] = []
+
+
+class MultipleChoiceQuestionImport(MultipleChoiceQuestionBase):
+    multiple_choice_options: List[MultipleChoiceOptionCreate] = []
+
+
+class OpenQuestionImport(OpenQuestionBase):
+    open_options: List[OpenOptionCreate] = []
+
+
+class AssignmentQuestionImport(AssignmentQuestionBase):
+    assignment_options: List[AssignmentOptionCreate] = []
+
+
+class GapTextQuestionImport(GapTextQuestionBase):
+    gap_text_sub_questions: List["GapTextSubQuestionImport"] = []
+
+
+class GapTextSubQuestionImport(GapTextSubQuestionBase):
+    gap_text_options: List[GapTextOptionCreate] = []
+
+
 class QuizRead(QuizBase):
     id: int
     single_choice_questions: List["SingleChoiceQuestionRead"] = []
@@ -451,6 +537,27 @@ class QuizRead(QuizBase):
     labels: List["LabelRead"] = []
 
 
+class QuizSummary(QuizBase):
+    id: int
+    question_count: int
+
+
+class QuizSummaryPage(BaseModel):
+    items: List[QuizSummary] = []
+    next_cursor: int | None = None
+
+
+class RegradeReport(BaseModel):
+    quiz_id: int
+    results: int = 0
+    answers: int = 0
+    updated_results: int = 0
+    updated_answers: int = 0
+    skipped_answers: int = 0
+    seconds: float = 0.0
+    answers_per_second: float = 0.0
+
+
 class ResultRead(ResultBase):
     id: int
     created_at: datetime
@@ -549,9 +656,40 @@ class LabelRead(LabelBase):
     quiz_ids: List[int] = []
 
 
+class JobRead(JobBase):
+    id: int
+    status: JobStatus
+    progress: float
+    result: dict | None = None
+    error: str | None = None
+    cancel_requested: bool
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
 class Answers(BaseModel):
     single_choice_answers: List[SingleChoiceAnswerCreate] = []
     multiple_choice_answers: List[MultipleChoiceAnswerCreate] = []
     open_answers: List[OpenAnswerCreate] = []
     assignment_answers: List[AssignmentAnswerCreate] = []
     gap_text_answers: List[GapTextAnswerCreate] = []
+
+
+QUESTION_MODELS_BY_TYPE: dict[str, type[SQLModel]] = {
+    "single_choice": SingleChoiceQuestion,
+    "multiple_choice": MultipleChoiceQuestion,
+    "open": OpenQuestion,
+    "assignment": AssignmentQuestion,
+    "gap_text": GapTextQuestion,
+}
+
+QUESTION_MODELS: tuple[type[SQLModel], ...] = tuple(QUESTION_MODELS_BY_TYPE.values())
+
+ANSWER_MODELS: dict[str, type[SQLModel]] = {
+    "single_choice": SingleChoiceAnswer,
+    "multiple_choice": MultipleChoiceAnswer,
+    "open": OpenAnswer,
+    "assignment": AssignmentAnswer,
+    "gap_text": GapTextAnswer,
+}
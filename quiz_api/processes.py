@@ -0,0 +1,83 @@
+"""Coordination of the worker processes of the quiz-api application.
+
+Nothing here may import the metrics, because the metrics directory has to be
+prepared before the first metric is created.
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+from quiz_api.config import config
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+@contextmanager
+def startup_lock(path: Path):
+    """Serialize startup tasks across worker processes."""
+
+    with open(path, "a", encoding="utf-8") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def get_startup_lock_path() -> Path:
+    """Get the path of the lock serializing startup tasks."""
+
+    state_path = Path(config.startup_state_path)
+
+    return state_path.with_name(f"{state_path.name}.lock")
+
+
+def is_process_alive(pid: int) -> bool:
+    """Get whether a process is running."""
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
+
+
+def prepare_metrics_path() -> None:
+    """Share the metrics of worker processes through the metrics directory.
+
+    This has to run before the metrics are created. The first worker of a
+    server start finds no running processes in the directory and removes the
+    files left by earlier runs. A worker started while others are running, for
+    example after a crash, only removes the gauges of dead processes, so the
+    totals of counters do not drop.
+    """
+
+    path = Path(config.metrics_path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    with startup_lock(get_startup_lock_path()):
+        pids = {
+            metrics_file: int(pid)
+            for metrics_file in path.glob("*.db")
+            for pid in [metrics_file.stem.rsplit("_", 1)[-1]]
+            if pid.isdigit()
+        }
+        live_pids = {pid for pid in set(pids.values()) if is_process_alive(pid)}
+
+        for metrics_file, pid in pids.items():
+            if not live_pids or (
+                pid not in live_pids and metrics_file.name.startswith("gauge_live")
+            ):
+                metrics_file.unlink(missing_ok=True)
+
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(path)
@@ -0,0 +1,165 @@
+"""Re-grading of stored results for the quiz-api application."""
+
+import argparse
+import asyncio
+import time
+from typing import Callable, Sequence
+
+from sqlalchemy import Row, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from quiz_api.const import DEFAULT_REGRADE_CHUNK_SIZE
+from quiz_api.db import async_db_engine
+from quiz_api.grading import (
+    AnswerKey,
+    UnknownQuestionError,
+    get_answer_key,
+    grade_answer,
+)
+from quiz_api.log import logger
+from quiz_api.models import ANSWER_MODELS, RegradeReport, Result
+
+
+async def regrade_results(
+    session: AsyncSession,
+    answer_key: AnswerKey,
+    results: Sequence[Row],
+    report: RegradeReport,
+) -> None:
+    """Re-grade the answers of a chunk of results and update changed scores."""
+
+    totals = {result.id: [0, 0] for result in results}
+
+    for question_type, answer_model in ANSWER_MODELS.items():
+        answer_updates = []
+
+        for answer in await session.exec(
+            select(*answer_model.__table__.columns).where(
+                answer_model.result_id.in_(list(totals))
+            )
+        ):
+            report.answers += 1
+
+            try:
+                score, max_score = grade_answer(answer_key, question_type, answer)
+            except UnknownQuestionError:
+                # The question was removed from the quiz, keep the stored score.
+                report.skipped_answers += 1
+                score, max_score = answer.score, answer.max_score
+
+            if score != answer.score or max_score != answer.max_score:
+                answer_updates.append(
+                    {"id": answer.id, "score": score, "max_score": max_score}
+                )
+
+            totals[answer.result_id][0] += score
+            totals[answer.result_id][1] += max_score
+
+        if answer_updates:
+            await session.exec(update(answer_model), params=answer_updates)
+            report.updated_answers += len(answer_updates)
+
+    result_updates = [
+        {"id": result.id, "score": score, "max_score": max_score}
+        for result in results
+        for score, max_score in [totals[result.id]]
+        if score != result.score or max_score != result.max_score
+    ]
+
+    if result_updates:
+        await session.exec(update(Result), params=result_updates)
+        report.updated_results += len(result_updates)
+
+    report.results += len(results)
+
+
+async def regrade_quiz_results(
+    session: AsyncSession,
+    quiz_id: int,
+    chunk_size: int = DEFAULT_REGRADE_CHUNK_SIZE,
+    on_chunk: Callable[[RegradeReport], None] | None = None,
+) -> RegradeReport | None:
+    """Re-grade all results of a quiz against its current answer key.
+
+    Results are read in chunks ordered by ID and every chunk is committed on
+    its own, so memory use is bounded by the chunk size and the database is
+    not locked for the whole run.
+    """
+
+    answer_key = await get_answer_key(session, quiz_id)
+
+    if answer_key is None:
+        return None
+
+    report = RegradeReport(quiz_id=quiz_id)
+    start = time.perf_counter()
+    last_result_id = 0
+
+    while True:
+        results = (
+            await session.exec(
+                select(Result.id, Result.score, Result.max_score)
+                .where(Result.quiz_id == quiz_id, Result.id > last_result_id)
+                .order_by(Result.id)
+                .limit(chunk_size)
+            )
+        ).all()
+
+        if not results:
+            break
+
+        await regrade_results(session, answer_key, results, report)
+        await session.commit()
+        last_result_id = results[-1].id
+
+        if on_chunk is not None:
+            on_chunk(report)
+
+    report.seconds = time.perf_counter() - start
+    report.answers_per_second = (
+        report.answers / report.seconds if report.seconds else 0.0
+    )
+
+    logger.info(
+        f"Re-graded {report.answers} answers of {report.results} results of quiz "
+        f"{quiz_id} in {report.seconds:.3f}s ({report.answers_per_second:.0f} "
+        f"answers/s, {report.updated_answers} answers and "
+        f"{report.updated_results} results changed)."
+    )
+
+    return report
+
+
+async def regrade(quiz_ids: list[int], chunk_size: int) -> list[RegradeReport]:
+    """Re-grade the results of several quizzes."""
+
+    reports = []
+
+    async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+        for quiz_id in quiz_ids:
+            report = await regrade_quiz_results(session, quiz_id, chunk_size)
+
+            if report is None:
+                logger.warning(f"Quiz with ID {quiz_id} not found.")
+                continue
+
+            reports.append(report)
+
+    return reports
+
+
+def main():
+    """Re-grade the results of quizzes from the command line."""
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("quiz_ids", type=int, nargs="+", metavar="quiz_id")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_REGRADE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    for report in asyncio.run(regrade(args.quiz_ids, args.chunk_size)):
+        print(report.model_dump_json())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 """AssignmentAnswer router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
 from quiz_api.models import (
     AssignmentAnswer,
     AssignmentAnswerCreate,
@@ -21,11 +22,10 @@ assignment_answer_router = APIRouter(
     response_model=list[AssignmentAnswerRead],
     operation_id="get_assignment_answers",
 )
-async def get_assignment_answers():
+async def get_assignment_answers(session: AsyncSession = Depends(get_session)):
     """Get all assignment answers."""
 
-    with Session(db_engine) as session:
-        answers = session.exec(select(AssignmentAnswer)).all()
+    answers = (await session.exec(select(AssignmentAnswer))).all()
 
     return answers
 
@@ -35,11 +35,12 @@ async def get_assignment_answers():
     response_model=AssignmentAnswerRead,
     operation_id="get_assignment_answer",
 )
-async def get_assignment_answer(answer_id: int):
+async def get_assignment_answer(
+    answer_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get an assignment answer by ID."""
 
-    with Session(db_engine) as session:
-        answer = session.get(AssignmentAnswer, answer_id)
+    answer = await session.get(AssignmentAnswer, answer_id)
 
     return answer
 
@@ -50,13 +51,14 @@ async def get_assignment_answer(answer_id: int):
     operation_id="create_assignment_answer",
     dependencies=[Depends(require_admin)],
 )
-async def create_assignment_answer(answer: AssignmentAnswerCreate):
+async def create_assignment_answer(
+    answer: AssignmentAnswerCreate, session: AsyncSession = Depends(get_session)
+):
     """Create an assignment answer."""
 
-    with Session(db_engine) as session:
-        db_answer = AssignmentAnswer.model_validate(answer)
-        session.add(db_answer)
-        session.commit()
+    db_answer = AssignmentAnswer.model_validate(answer)
+    session.add(db_answer)
+    await session.commit()
 
     return db_answer
 
@@ -67,19 +69,22 @@ async def create_assignment_answer(answer: AssignmentAnswerCreate):
     operation_id="update_assignment_answer",
     dependencies=[Depends(require_admin)],
 )
-async def update_assignment_answer(answer_id: int, answer: AssignmentAnswerCreate):
+async def update_assignment_answer(
+    answer_id: int,
+    answer: AssignmentAnswerCreate,
+    session: AsyncSession = Depends(get_session),
+):
     """Update an assignment answer."""
 
-    with Session(db_engine) as session:
-        db_answer = session.get(AssignmentAnswer, answer_id)
+    db_answer = await session.get(AssignmentAnswer, answer_id)
 
-        db_answer.question_id = answer.question_id
-        db_answer.result_id = answer.result_id
-        db_answer.selected_indices = answer.selected_indices
+    db_answer.question_id = answer.question_id
+    db_answer.result_id = answer.result_id
+    db_answer.selected_indices = answer.selected_indices
 
-        session.add(db_answer)
-        session.commit()
-        session.refresh(db_answer)
+    session.add(db_answer)
+    await session.commit()
+    await session.refresh(db_answer)
 
     return db_answer
 
@@ -90,12 +95,13 @@ async def update_assignment_answer(answer_id: int, answer: AssignmentAnswerCreat
     operation_id="delete_assignment_answer",
     dependencies=[Depends(require_admin)],
 )
-async def delete_assignment_answer(answer_id: int):
+async def delete_assignment_answer(
+    answer_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete an assignment answer."""
 
-    with Session(db_engine) as session:
-        answer = session.get(AssignmentAnswer, answer_id)
-        session.delete(answer)
-        session.commit()
+    answer = await session.get(AssignmentAnswer, answer_id)
+    await session.delete(answer)
+    await session.commit()
 
     return answer_id
@@ -1,10 +1,12 @@
 """AssignmentOption router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
-from quiz_api.models import AssignmentOption, AssignmentOptionRead
+from quiz_api.db import get_session
+from quiz_api.documents import touch_questions
+from quiz_api.models import AssignmentOption, AssignmentOptionRead, AssignmentQuestion
 from quiz_api.security import require_admin
 
 assignment_option_router = APIRouter(
@@ -18,11 +20,10 @@ assignment_option_router = APIRouter(
     operation_id="get_assignment_options",
     dependencies=[Depends(require_admin)],
 )
-async def get_assignment_options():
+async def get_assignment_options(session: AsyncSession = Depends(get_session)):
     """Get all assignment options."""
 
-    with Session(db_engine) as session:
-        assignment_options = session.exec(select(AssignmentOption)).all()
+    assignment_options = (await session.exec(select(AssignmentOption))).all()
 
     return assignment_options
 
@@ -33,11 +34,12 @@ async def get_assignment_options():
     operation_id="get_assignment_option",
     dependencies=[Depends(require_admin)],
 )
-async def get_assignment_option(assignment_option_id: int):
+async def get_assignment_option(
+    assignment_option_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get an assignment option by ID."""
 
-    with Session(db_engine) as session:
-        assignment_option = session.get(AssignmentOption, assignment_option_id)
+    assignment_option = await session.get(AssignmentOption, assignment_option_id)
 
     return assignment_option
 
@@ -48,14 +50,16 @@ async def get_assignment_option(assignment_option_id: int):
     operation_id="create_assignment_option",
     dependencies=[Depends(require_admin)],
 )
-async def create_assignment_option(assignment_option: AssignmentOption):
+async def create_assignment_option(
+    assignment_option: AssignmentOption, session: AsyncSession = Depends(get_session)
+):
     """Create an assignment option."""
 
-    with Session(db_engine) as session:
-        db_assignment_option = AssignmentOption.model_validate(assignment_option)
-        session.add(db_assignment_option)
-        session.commit()
-        session.refresh(db_assignment_option)
+    db_assignment_option = AssignmentOption.model_validate(assignment_option)
+    session.add(db_assignment_option)
+    await touch_questions(session, AssignmentQuestion, db_assignment_option.question_id)
+    await session.commit()
+    await session.refresh(db_assignment_option)
 
     return db_assignment_option
 
@@ -67,21 +71,29 @@ async def create_assignment_option(assignment_option: AssignmentOption):
     dependencies=[Depends(require_admin)],
 )
 async def update_assignment_option(
-    assignment_option_id: int, assignment_option: AssignmentOption
+    assignment_option_id: int,
+    assignment_option: AssignmentOption,
+    session: AsyncSession = Depends(get_session),
 ):
     """Update an assignment option."""
 
-    with Session(db_engine) as session:
-        db_assignment_option = session.get(AssignmentOption, assignment_option_id)
+    db_assignment_option = await session.get(AssignmentOption, assignment_option_id)
 
-        db_assignment_option.text = assignment_option.text
-        db_assignment_option.correct_index = assignment_option.correct_index
-        db_assignment_option.index = assignment_option.index
-        db_assignment_option.question_id = assignment_option.question_id
+    await touch_questions(
+        session,
+        AssignmentQuestion,
+        db_assignment_option.question_id,
+        assignment_option.question_id,
+    )
 
-        session.add(db_assignment_option)
-        session.commit()
-        session.refresh(db_assignment_option)
+    db_assignment_option.text = assignment_option.text
+    db_assignment_option.correct_index = assignment_option.correct_index
+    db_assignment_option.index = assignment_option.index
+    db_assignment_option.question_id = assignment_option.question_id
+
+    session.add(db_assignment_option)
+    await session.commit()
+    await session.refresh(db_assignment_option)
 
     return db_assignment_option
 
@@ -92,12 +104,14 @@ async def update_assignment_option(
     operation_id="delete_assignment_option",
     dependencies=[Depends(require_admin)],
 )
-async def delete_assignment_option(assignment_option_id: int):
+async def delete_assignment_option(
+    assignment_option_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete an assignment option by ID."""
 
-    with Session(db_engine) as session:
-        assignment_option = session.get(AssignmentOption, assignment_option_id)
-        session.delete(assignment_option)
-        session.commit()
+    assignment_option = await session.get(AssignmentOption, assignment_option_id)
+    await touch_questions(session, AssignmentQuestion, assignment_option.question_id)
+    await session.delete(assignment_option)
+    await session.commit()
 
     return assignment_option_id
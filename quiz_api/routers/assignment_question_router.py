@@ -1,9 +1,11 @@
 """AssignmentQuestion router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
+from quiz_api.documents import touch_quizzes
 from quiz_api.models import AssignmentQuestion, AssignmentQuestionRead
 from quiz_api.security import require_admin
 
@@ -18,11 +20,10 @@ assignment_question_router = APIRouter(
     operation_id="get_assignment_questions",
     dependencies=[Depends(require_admin)],
 )
-async def get_assignment_questions():
+async def get_assignment_questions(session: AsyncSession = Depends(get_session)):
     """Get all assignment questions."""
 
-    with Session(db_engine) as session:
-        assignment_questions = session.exec(select(AssignmentQuestion)).all()
+    assignment_questions = (await session.exec(select(AssignmentQuestion))).all()
 
     return assignment_questions
 
@@ -33,11 +34,12 @@ async def get_assignment_questions():
     operation_id="get_assignment_question",
     dependencies=[Depends(require_admin)],
 )
-async def get_assignment_question(assignment_question_id: int):
+async def get_assignment_question(
+    assignment_question_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get an assignment question by ID."""
 
-    with Session(db_engine) as session:
-        assignment_question = session.get(AssignmentQuestion, assignment_question_id)
+    assignment_question = await session.get(AssignmentQuestion, assignment_question_id)
 
     return assignment_question
 
@@ -48,14 +50,17 @@ async def get_assignment_question(assignment_question_id: int):
     operation_id="create_assignment_question",
     dependencies=[Depends(require_admin)],
 )
-async def create_assignment_question(assignment_question: AssignmentQuestion):
+async def create_assignment_question(
+    assignment_question: AssignmentQuestion,
+    session: AsyncSession = Depends(get_session),
+):
     """Create an assignment question."""
 
-    with Session(db_engine) as session:
-        db_assignment_question = AssignmentQuestion.model_validate(assignment_question)
-        session.add(db_assignment_question)
-        session.commit()
-        session.refresh(db_assignment_question)
+    db_assignment_question = AssignmentQuestion.model_validate(assignment_question)
+    session.add(db_assignment_question)
+    await touch_quizzes(session, [db_assignment_question.quiz_id])
+    await session.commit()
+    await session.refresh(db_assignment_question)
 
     return db_assignment_question
 
@@ -67,21 +72,28 @@ async def create_assignment_question(assignment_question: AssignmentQuestion):
     dependencies=[Depends(require_admin)],
 )
 async def update_assignment_question(
-    assignment_question_id: int, assignment_question: AssignmentQuestion
+    assignment_question_id: int,
+    assignment_question: AssignmentQuestion,
+    session: AsyncSession = Depends(get_session),
 ):
     """Update an assignment question by ID."""
 
-    with Session(db_engine) as session:
-        db_assignment_question = session.get(AssignmentQuestion, assignment_question_id)
+    db_assignment_question = await session.get(
+        AssignmentQuestion, assignment_question_id
+    )
 
-        db_assignment_question.title = assignment_question.title
-        db_assignment_question.text = assignment_question.text
-        db_assignment_question.index = assignment_question.index
-        db_assignment_question.quiz_id = assignment_question.quiz_id
+    await touch_quizzes(
+        session, [db_assignment_question.quiz_id, assignment_question.quiz_id]
+    )
 
-        session.add(db_assignment_question)
-        session.commit()
-        session.refresh(db_assignment_question)
+    db_assignment_question.title = assignment_question.title
+    db_assignment_question.text = assignment_question.text
+    db_assignment_question.index = assignment_question.index
+    db_assignment_question.quiz_id = assignment_question.quiz_id
+
+    session.add(db_assignment_question)
+    await session.commit()
+    await session.refresh(db_assignment_question)
 
     return db_assignment_question
 
@@ -92,12 +104,14 @@ async def update_assignment_question(
     operation_id="delete_assignment_question",
     dependencies=[Depends(require_admin)],
 )
-async def delete_assignment_question(assignment_question_id: int):
+async def delete_assignment_question(
+    assignment_question_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete an assignment question by ID."""
 
-    with Session(db_engine) as session:
-        assignment_question = session.get(AssignmentQuestion, assignment_question_id)
-        session.delete(assignment_question)
-        session.commit()
+    assignment_question = await session.get(AssignmentQuestion, assignment_question_id)
+    await touch_quizzes(session, [assignment_question.quiz_id])
+    await session.delete(assignment_question)
+    await session.commit()
 
     return assignment_question_id
@@ -3,9 +3,11 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.status import HTTP_401_UNAUTHORIZED
 
 from quiz_api.const import ACCESS_TOKEN_EXPIRE_MINUTES
+from quiz_api.db import get_session
 from quiz_api.models import Token
 from quiz_api.security import (
     authenticate_user,
@@ -18,8 +20,9 @@ auth_router = APIRouter(tags=["auth"])
 @auth_router.post("/token", operation_id="login")
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    session: Annotated[AsyncSession, Depends(get_session)],
 ) -> Token:
-    user = authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user(session, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=HTTP_401_UNAUTHORIZED,
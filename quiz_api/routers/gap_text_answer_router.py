@@ -1,9 +1,10 @@
 """GapTextAnswer router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
 from quiz_api.models import (
     GapTextAnswer,
     GapTextAnswerCreate,
@@ -19,11 +20,10 @@ gap_text_answer_router = APIRouter(prefix="/gap_text_answer", tags=["gap_text_an
     response_model=list[GapTextAnswerRead],
     operation_id="get_gap_text_answers",
 )
-async def get_gap_text_answers():
+async def get_gap_text_answers(session: AsyncSession = Depends(get_session)):
     """Get all gap text answers."""
 
-    with Session(db_engine) as session:
-        answers = session.exec(select(GapTextAnswer)).all()
+    answers = (await session.exec(select(GapTextAnswer))).all()
 
     return answers
 
@@ -33,11 +33,12 @@ async def get_gap_text_answers():
     response_model=GapTextAnswerRead,
     operation_id="get_gap_text_answer",
 )
-async def get_gap_text_answer(answer_id: int):
+async def get_gap_text_answer(
+    answer_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get a gap text answer by ID."""
 
-    with Session(db_engine) as session:
-        answer = session.get(GapTextAnswer, answer_id)
+    answer = await session.get(GapTextAnswer, answer_id)
 
     return answer
 
@@ -48,13 +49,14 @@ async def get_gap_text_answer(answer_id: int):
     operation_id="create_gap_text_answer",
     dependencies=[Depends(require_admin)],
 )
-async def create_gap_text_answer(answer: GapTextAnswerCreate):
+async def create_gap_text_answer(
+    answer: GapTextAnswerCreate, session: AsyncSession = Depends(get_session)
+):
     """Create a gap text answer."""
 
-    with Session(db_engine) as session:
-        db_answer = GapTextAnswer.model_validate(answer)
-        session.add(db_answer)
-        session.commit()
+    db_answer = GapTextAnswer.model_validate(answer)
+    session.add(db_answer)
+    await session.commit()
 
     return db_answer
 
@@ -65,19 +67,22 @@ async def create_gap_text_answer(answer: GapTextAnswerCreate):
     operation_id="update_gap_text_answer",
     dependencies=[Depends(require_admin)],
 )
-async def update_gap_text_answer(answer_id: int, answer: GapTextAnswerCreate):
+async def update_gap_text_answer(
+    answer_id: int,
+    answer: GapTextAnswerCreate,
+    session: AsyncSession = Depends(get_session),
+):
     """Update a gap text answer by ID."""
 
-    with Session(db_engine) as session:
-        db_answer = session.get(GapTextAnswer, answer_id)
+    db_answer = await session.get(GapTextAnswer, answer_id)
 
-        db_answer.question_id = answer.question_id
-        db_answer.result_id = answer.result_id
-        db_answer.selected_indices = answer.selected_indices
+    db_answer.question_id = answer.question_id
+    db_answer.result_id = answer.result_id
+    db_answer.selected_indices = answer.selected_indices
 
-        session.add(db_answer)
-        session.commit()
-        session.refresh(db_answer)
+    session.add(db_answer)
+    await session.commit()
+    await session.refresh(db_answer)
 
     return db_answer
 
@@ -88,12 +93,13 @@ async def update_gap_text_answer(answer_id: int, answer: GapTextAnswerCreate):
     operation_id="delete_gap_text_answer",
     dependencies=[Depends(require_admin)],
 )
-async def delete_gap_text_answer(answer_id: int):
+async def delete_gap_text_answer(
+    answer_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete a gap text answer by ID."""
 
-    with Session(db_engine) as session:
-        answer = session.get(GapTextAnswer, answer_id)
-        session.delete(answer)
-        session.commit()
+    answer = await session.get(GapTextAnswer, answer_id)
+    await session.delete(answer)
+    await session.commit()
 
     return answer_id
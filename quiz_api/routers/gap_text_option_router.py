@@ -1,9 +1,11 @@
 """GapTextOption router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
+from quiz_api.documents import touch_sub_questions
 from quiz_api.models import GapTextOption, GapTextOptionRead
 from quiz_api.security import require_admin
 
@@ -16,11 +18,10 @@ gap_text_option_router = APIRouter(prefix="/gap_text_option", tags=["gap_text_op
     operation_id="get_gap_text_options",
     dependencies=[Depends(require_admin)],
 )
-async def get_gap_text_options():
+async def get_gap_text_options(session: AsyncSession = Depends(get_session)):
     """Get all gap text options."""
 
-    with Session(db_engine) as session:
-        gap_text_options = session.exec(select(GapTextOption)).all()
+    gap_text_options = (await session.exec(select(GapTextOption))).all()
 
     return gap_text_options
 
@@ -31,11 +32,12 @@ async def get_gap_text_options():
     operation_id="get_gap_text_option",
     dependencies=[Depends(require_admin)],
 )
-async def get_gap_text_option(gap_text_option_id: int):
+async def get_gap_text_option(
+    gap_text_option_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get a gap text option by ID."""
 
-    with Session(db_engine) as session:
-        gap_text_option = session.get(GapTextOption, gap_text_option_id)
+    gap_text_option = await session.get(GapTextOption, gap_text_option_id)
 
     return gap_text_option
 
@@ -46,14 +48,16 @@ async def get_gap_text_option(gap_text_option_id: int):
     operation_id="create_gap_text_option",
     dependencies=[Depends(require_admin)],
 )
-async def create_gap_text_option(gap_text_option: GapTextOption):
+async def create_gap_text_option(
+    gap_text_option: GapTextOption, session: AsyncSession = Depends(get_session)
+):
     """Create a gap text option."""
 
-    with Session(db_engine) as session:
-        db_gap_text_option = GapTextOption.model_validate(gap_text_option)
-        session.add(db_gap_text_option)
-        session.commit()
-        session.refresh(db_gap_text_option)
+    db_gap_text_option = GapTextOption.model_validate(gap_text_option)
+    session.add(db_gap_text_option)
+    await touch_sub_questions(session, db_gap_text_option.sub_question_id)
+    await session.commit()
+    await session.refresh(db_gap_text_option)
 
     return db_gap_text_option
 
@@ -65,20 +69,25 @@ async def create_gap_text_option(gap_text_option: GapTextOption):
     dependencies=[Depends(require_admin)],
 )
 async def update_gap_text_option(
-    gap_text_option_id: int, gap_text_option: GapTextOption
+    gap_text_option_id: int,
+    gap_text_option: GapTextOption,
+    session: AsyncSession = Depends(get_session),
 ):
     """Update a gap text option by ID."""
 
-    with Session(db_engine) as session:
-        db_gap_text_option = session.get(GapTextOption, gap_text_option_id)
+    db_gap_text_option = await session.get(GapTextOption, gap_text_option_id)
 
-        db_gap_text_option.text = gap_text_option.text
-        db_gap_text_option.index = gap_text_option.index
-        db_gap_text_option.sub_question_id = gap_text_option.sub_question_id
+    await touch_sub_questions(
+        session, db_gap_text_option.sub_question_id, gap_text_option.sub_question_id
+    )
 
-        session.add(db_gap_text_option)
-        session.commit()
-        session.refresh(db_gap_text_option)
+    db_gap_text_option.text = gap_text_option.text
+    db_gap_text_option.index = gap_text_option.index
+    db_gap_text_option.sub_question_id = gap_text_option.sub_question_id
+
+    session.add(db_gap_text_option)
+    await session.commit()
+    await session.refresh(db_gap_text_option)
 
     return db_gap_text_option
 
@@ -89,12 +98,14 @@ async def update_gap_text_option(
     operation_id="delete_gap_text_option",
     dependencies=[Depends(require_admin)],
 )
-async def delete_gap_text_option(gap_text_option_id: int):
+async def delete_gap_text_option(
+    gap_text_option_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete a gap text option by ID."""
 
-    with Session(db_engine) as session:
-        gap_text_option = session.get(GapTextOption, gap_text_option_id)
-        session.delete(gap_text_option)
-        session.commit()
+    gap_text_option = await session.get(GapTextOption, gap_text_option_id)
+    await touch_sub_questions(session, gap_text_option.sub_question_id)
+    await session.delete(gap_text_option)
+    await session.commit()
 
     return gap_text_option_id
@@ -1,9 +1,11 @@
 """GapTextQuestion router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
+from quiz_api.documents import touch_quizzes
 from quiz_api.models import GapTextQuestion, GapTextQuestionRead
 from quiz_api.security import require_admin
 
@@ -18,11 +20,10 @@ gap_text_question_router = APIRouter(
     operation_id="get_gap_text_questions",
     dependencies=[Depends(require_admin)],
 )
-async def get_gap_text_questions():
+async def get_gap_text_questions(session: AsyncSession = Depends(get_session)):
     """Get all gap text questions."""
 
-    with Session(db_engine) as session:
-        gap_text_questions = session.exec(select(GapTextQuestion)).all()
+    gap_text_questions = (await session.exec(select(GapTextQuestion))).all()
 
     return gap_text_questions
 
@@ -33,11 +34,12 @@ async def get_gap_text_questions():
     operation_id="get_gap_text_question",
     dependencies=[Depends(require_admin)],
 )
-async def get_gap_text_question(gap_text_question_id: int):
+async def get_gap_text_question(
+    gap_text_question_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get a gap text question by ID."""
 
-    with Session(db_engine) as session:
-        gap_text_question = session.get(GapTextQuestion, gap_text_question_id)
+    gap_text_question = await session.get(GapTextQuestion, gap_text_question_id)
 
     return gap_text_question
 
@@ -48,14 +50,16 @@ async def get_gap_text_question(gap_text_question_id: int):
     operation_id="create_gap_text_question",
     dependencies=[Depends(require_admin)],
 )
-async def create_gap_text_question(gap_text_question: GapTextQuestion):
+async def create_gap_text_question(
+    gap_text_question: GapTextQuestion, session: AsyncSession = Depends(get_session)
+):
     """Create a gap text question."""
 
-    with Session(db_engine) as session:
-        db_gap_text_question = GapTextQuestion.model_validate(gap_text_question)
-        session.add(db_gap_text_question)
-        session.commit()
-        session.refresh(db_gap_text_question)
+    db_gap_text_question = GapTextQuestion.model_validate(gap_text_question)
+    session.add(db_gap_text_question)
+    await touch_quizzes(session, [db_gap_text_question.quiz_id])
+    await session.commit()
+    await session.refresh(db_gap_text_question)
 
     return db_gap_text_question
 
@@ -67,21 +71,26 @@ async def create_gap_text_question(gap_text_question: GapTextQuestion):
     dependencies=[Depends(require_admin)],
 )
 async def update_gap_text_question(
-    gap_text_question_id: int, gap_text_question: GapTextQuestion
+    gap_text_question_id: int,
+    gap_text_question: GapTextQuestion,
+    session: AsyncSession = Depends(get_session),
 ):
     """Update a gap text question by ID."""
 
-    with Session(db_engine) as session:
-        db_gap_text_question = session.get(GapTextQuestion, gap_text_question_id)
+    db_gap_text_question = await session.get(GapTextQuestion, gap_text_question_id)
 
-        db_gap_text_question.title = gap_text_question.title
-        db_gap_text_question.text = gap_text_question.text
-        db_gap_text_question.index = gap_text_question.index
-        db_gap_text_question.quiz_id = gap_text_question.quiz_id
+    await touch_quizzes(
+        session, [db_gap_text_question.quiz_id, gap_text_question.quiz_id]
+    )
 
-        session.add(db_gap_text_question)
-        session.commit()
-        session.refresh(db_gap_text_question)
+    db_gap_text_question.title = gap_text_question.title
+    db_gap_text_question.text = gap_text_question.text
+    db_gap_text_question.index = gap_text_question.index
+    db_gap_text_question.quiz_id = gap_text_question.quiz_id
+
+    session.add(db_gap_text_question)
+    await session.commit()
+    await session.refresh(db_gap_text_question)
 
     return db_gap_text_question
 
@@ -92,12 +101,14 @@ async def update_gap_text_question(
     operation_id="delete_gap_text_question",
     dependencies=[Depends(require_admin)],
 )
-async def delete_gap_text_question(gap_text_question_id: int):
+async def delete_gap_text_question(
+    gap_text_question_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete a gap text question by ID."""
 
-    with Session(db_engine) as session:
-        gap_text_question = session.get(GapTextQuestion, gap_text_question_id)
-        session.delete(gap_text_question)
-        session.commit()
+    gap_text_question = await session.get(GapTextQuestion, gap_text_question_id)
+    await touch_quizzes(session, [gap_text_question.quiz_id])
+    await session.delete(gap_text_question)
+    await session.commit()
 
     return gap_text_question_id
@@ -1,10 +1,12 @@
 """GapTextSubQuestion router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
-from quiz_api.models import GapTextSubQuestion, GapTextSubQuestionRead
+from quiz_api.db import get_session
+from quiz_api.documents import touch_questions
+from quiz_api.models import GapTextQuestion, GapTextSubQuestion, GapTextSubQuestionRead
 from quiz_api.security import require_admin
 
 gap_text_sub_question_router = APIRouter(
@@ -18,11 +20,10 @@ gap_text_sub_question_router = APIRouter(
     operation_id="get_gap_text_sub_questions",
     dependencies=[Depends(require_admin)],
 )
-async def get_gap_text_sub_questions():
+async def get_gap_text_sub_questions(session: AsyncSession = Depends(get_session)):
     """Get all gap text sub questions."""
 
-    with Session(db_engine) as session:
-        gap_text_sub_questions = session.exec(select(GapTextSubQuestion)).all()
+    gap_text_sub_questions = (await session.exec(select(GapTextSubQuestion))).all()
 
     return gap_text_sub_questions
 
@@ -33,13 +34,14 @@ async def get_gap_text_sub_questions():
     operation_id="get_gap_text_sub_question",
     dependencies=[Depends(require_admin)],
 )
-async def get_gap_text_sub_question(gap_text_sub_question_id: int):
+async def get_gap_text_sub_question(
+    gap_text_sub_question_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get a gap text sub question by ID."""
 
-    with Session(db_engine) as session:
-        gap_text_sub_question = session.get(
-            GapTextSubQuestion, gap_text_sub_question_id
-        )
+    gap_text_sub_question = await session.get(
+        GapTextSubQuestion, gap_text_sub_question_id
+    )
 
     return gap_text_sub_question
 
@@ -50,16 +52,19 @@ async def get_gap_text_sub_question(gap_text_sub_question_id: int):
     operation_id="create_gap_text_sub_question",
     dependencies=[Depends(require_admin)],
 )
-async def create_gap_text_sub_question(gap_text_sub_question: GapTextSubQuestion):
+async def create_gap_text_sub_question(
+    gap_text_sub_question: GapTextSubQuestion,
+    session: AsyncSession = Depends(get_session),
+):
     """Create a gap text sub question."""
 
-    with Session(db_engine) as session:
-        db_gap_text_sub_question = GapTextSubQuestion.model_validate(
-            gap_text_sub_question
-        )
-        session.add(db_gap_text_sub_question)
-        session.commit()
-        session.refresh(db_gap_text_sub_question)
+    db_gap_text_sub_question = GapTextSubQuestion.model_validate(gap_text_sub_question)
+    session.add(db_gap_text_sub_question)
+    await touch_questions(
+        session, GapTextQuestion, db_gap_text_sub_question.question_id
+    )
+    await session.commit()
+    await session.refresh(db_gap_text_sub_question)
 
     return db_gap_text_sub_question
 
@@ -71,21 +76,28 @@ async def create_gap_text_sub_question(gap_text_sub_question: GapTextSubQuestion
     dependencies=[Depends(require_admin)],
 )
 async def update_gap_text_sub_question(
-    gap_text_sub_question_id: int, gap_text_sub_question: GapTextSubQuestion
+    gap_text_sub_question_id: int,
+    gap_text_sub_question: GapTextSubQuestion,
+    session: AsyncSession = Depends(get_session),
 ):
     """Update a gap text sub question by ID."""
 
-    with Session(db_engine) as session:
-        db_gap_text_sub_question = session.get(
-            GapTextSubQuestion, gap_text_sub_question_id
-        )
+    db_gap_text_sub_question = await session.get(
+        GapTextSubQuestion, gap_text_sub_question_id
+    )
+
+    await touch_questions(
+        session,
+        GapTextQuestion,
+        db_gap_text_sub_question.question_id,
+        gap_text_sub_question.question_id,
+    )
 
-        db_gap_text_sub_question.text = gap_text_sub_question.text
-        db_gap_text_sub_question.index = gap_text_sub_question.index
-        db_gap_text_sub_question.quiz_id = gap_text_sub_question.quiz_id
+    db_gap_text_sub_question.index = gap_text_sub_question.index
+    db_gap_text_sub_question.question_id = gap_text_sub_question.question_id
 
-        session.add(db_gap_text_sub_question)
-        session.commit()
-        session.refresh(db_gap_text_sub_question)
+    session.add(db_gap_text_sub_question)
+    await session.commit()
+    await session.refresh(db_gap_text_sub_question)
 
     return db_gap_text_sub_question
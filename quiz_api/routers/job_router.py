@@ -0,0 +1,74 @@
+"""Job router."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import ValidationError
+
+from quiz_api.const import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from quiz_api.jobs import UnknownJobKindError, job_runner
+from quiz_api.models import JobCreate, JobRead
+from quiz_api.security import require_admin
+
+job_router = APIRouter(prefix="/job", tags=["job"])
+
+
+@job_router.post(
+    "",
+    response_model=JobRead,
+    operation_id="create_job",
+    dependencies=[Depends(require_admin)],
+)
+async def create_job(job: JobCreate):
+    """Submit a background job."""
+
+    try:
+        return await job_runner.submit(job.kind, job.params)
+    except UnknownJobKindError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+
+@job_router.get(
+    "",
+    response_model=list[JobRead],
+    operation_id="get_jobs",
+    dependencies=[Depends(require_admin)],
+)
+async def get_jobs(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """Get the latest jobs."""
+
+    return await job_runner.store.list(limit)
+
+
+@job_router.get(
+    "/{job_id}",
+    response_model=JobRead,
+    operation_id="get_job",
+    dependencies=[Depends(require_admin)],
+)
+async def get_job(job_id: int):
+    """Get a job by ID."""
+
+    job = await job_runner.store.get(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job with ID {job_id} not found.")
+
+    return job
+
+
+@job_router.post(
+    "/{job_id}/cancel",
+    response_model=JobRead,
+    operation_id="cancel_job",
+    dependencies=[Depends(require_admin)],
+)
+async def cancel_job(job_id: int):
+    """Cancel a pending or running job."""
+
+    job = await job_runner.cancel(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job with ID {job_id} not found.")
+
+    return job
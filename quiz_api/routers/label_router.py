@@ -1,9 +1,12 @@
 """Label router."""
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
+from quiz_api.documents import touch_labels, touch_quizzes
+from quiz_api.labels import NotFoundError, edit_label
 from quiz_api.models import Label, LabelCreate, LabelRead, Quiz
 from quiz_api.security import require_admin
 
@@ -16,33 +19,35 @@ label_router = APIRouter(prefix="/label", tags=["label"])
     operation_id="create_label",
     dependencies=[Depends(require_admin)],
 )
-async def create_label(label: LabelCreate):
+async def create_label(
+    label: LabelCreate, session: AsyncSession = Depends(get_session)
+):
     """Create a label."""
 
-    with Session(db_engine) as session:
-        db_quizzes: list[Quiz] = []
+    db_quizzes: list[Quiz] = []
 
-        for quiz_id in label.quiz_ids:
-            db_quiz = session.get(Quiz, quiz_id)
+    for quiz_id in label.quiz_ids:
+        db_quiz = await session.get(Quiz, quiz_id)
 
-            if db_quiz is None:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Quiz with ID {quiz_id} not found.",
-                )
+        if db_quiz is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Quiz with ID {quiz_id} not found.",
+            )
 
-            db_quizzes.append(db_quiz)
+        db_quizzes.append(db_quiz)
 
-        db_label = Label(
-            text=label.text,
-            quizzes=db_quizzes,
-        )
+    db_label = Label(
+        text=label.text,
+        quizzes=db_quizzes,
+    )
 
-        session.add(db_label)
-        session.commit()
-        session.refresh(db_label)
-        for db_quiz in db_quizzes:
-            session.refresh(db_quiz)
+    session.add(db_label)
+    await touch_quizzes(session, label.quiz_ids)
+    await session.commit()
+    await session.refresh(db_label)
+    for db_quiz in db_quizzes:
+        await session.refresh(db_quiz)
 
     return db_label
 
@@ -52,17 +57,16 @@ async def create_label(label: LabelCreate):
     response_model=list[LabelRead],
     operation_id="get_labels",
 )
-async def get_labels():
+async def get_labels(session: AsyncSession = Depends(get_session)):
     """Get all labels."""
 
-    with Session(db_engine) as session:
-        labels = session.exec(select(Label)).all()
+    labels = (await session.exec(select(Label))).all()
 
-        for label in labels:
-            session.refresh(label)
+    for label in labels:
+        await session.refresh(label)
 
-            for quiz in label.quizzes:
-                session.refresh(quiz)
+        for quiz in label.quizzes:
+            await session.refresh(quiz)
 
     return labels
 
@@ -72,17 +76,16 @@ async def get_labels():
     response_model=LabelRead,
     operation_id="get_label",
 )
-async def get_label(label_id: int):
+async def get_label(label_id: int, session: AsyncSession = Depends(get_session)):
     """Get a label by ID."""
 
-    with Session(db_engine) as session:
-        db_label = session.get(Label, label_id)
+    db_label = await session.get(Label, label_id)
 
-        if db_label is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Label with ID {label_id} not found.",
-            )
+    if db_label is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Label with ID {label_id} not found.",
+        )
 
     return db_label
 
@@ -93,42 +96,24 @@ async def get_label(label_id: int):
     operation_id="update_label",
     dependencies=[Depends(require_admin)],
 )
-async def update_label(label_id: int, label: LabelCreate):
-    """Update a label by ID."""
-
-    with Session(db_engine) as session:
-        db_label = session.get(Label, label_id)
-
-        if db_label is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Label with ID {label_id} not found.",
-            )
-
-        db_quizzes: list[Quiz] = []
-
-        for quiz_id in label.quiz_ids:
-            db_quiz = session.get(Quiz, quiz_id)
+async def update_label(
+    label_id: int, label: LabelCreate, session: AsyncSession = Depends(get_session)
+):
+    """Update a label by ID.
 
-            if db_quiz is None:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Quiz with ID {quiz_id} not found.",
-                )
+    Labels with many quizzes can also be updated with an update_label job.
+    """
 
-            db_quizzes.append(db_quiz)
+    try:
+        db_label = await edit_label(session, label_id, label)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-        db_label.text = label.text
-        db_label.quizzes = db_quizzes
+    await session.commit()
+    await session.refresh(db_label)
 
-        session.add(db_label)
-        session.commit()
-        session.refresh(db_label)
-        for db_quiz in db_quizzes:
-            session.refresh(db_quiz)
-
-        for quiz in db_label.quizzes:
-            session.refresh(quiz)
+    for quiz in db_label.quizzes:
+        await session.refresh(quiz)
 
     return db_label
 
@@ -139,26 +124,26 @@ async def update_label(label_id: int, label: LabelCreate):
     operation_id="delete_label",
     dependencies=[Depends(require_admin)],
 )
-async def delete_label(label_id: int):
+async def delete_label(label_id: int, session: AsyncSession = Depends(get_session)):
     """Delete a label by ID."""
 
-    with Session(db_engine) as session:
-        db_label = session.get(Label, label_id)
+    db_label = await session.get(Label, label_id)
 
-        if db_label is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Label with ID {label_id} not found.",
-            )
+    if db_label is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Label with ID {label_id} not found.",
+        )
 
-        for quiz in db_label.quizzes:
-            session.refresh(quiz)
+    for quiz in db_label.quizzes:
+        await session.refresh(quiz)
 
-        session.delete(db_label)
-        session.commit()
+    await touch_labels(session, label_id)
+    await session.delete(db_label)
+    await session.commit()
 
-        for quiz in db_label.quizzes:
-            session.refresh(quiz)
+    for quiz in db_label.quizzes:
+        await session.refresh(quiz)
 
     return label_id
 
@@ -168,31 +153,34 @@ async def delete_label(label_id: int):
     operation_id="delete_label_quiz",
     dependencies=[Depends(require_admin)],
 )
-async def delete_label_quiz(label_id: int, quiz_id: int):
+async def delete_label_quiz(
+    label_id: int, quiz_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete a quiz from a label by ID."""
 
-    with Session(db_engine) as session:
-        db_label = session.get(Label, label_id)
+    db_label = await session.get(Label, label_id)
 
-        if db_label is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Label with ID {label_id} not found.",
-            )
+    if db_label is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Label with ID {label_id} not found.",
+        )
 
-        db_quiz = session.get(Quiz, quiz_id)
+    db_quiz = await session.get(Quiz, quiz_id)
 
-        if db_quiz is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Quiz with ID {quiz_id} not found.",
-            )
+    if db_quiz is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Quiz with ID {quiz_id} not found.",
+        )
 
-        db_label.quizzes.remove(db_quiz)
+    await touch_labels(session, label_id)
 
-        if len(db_label.quizzes) == 0:
-            session.delete(db_label)
-        else:
-            session.add(db_label)
+    db_label.quizzes.remove(db_quiz)
+
+    if len(db_label.quizzes) == 0:
+        await session.delete(db_label)
+    else:
+        session.add(db_label)
 
-        session.commit()
+    await session.commit()
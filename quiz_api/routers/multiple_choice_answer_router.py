@@ -1,9 +1,10 @@
 """MultipleChoiceAnswer router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
 from quiz_api.models import (
     MultipleChoiceAnswer,
     MultipleChoiceAnswerCreate,
@@ -21,11 +22,10 @@ multiple_choice_answer_router = APIRouter(
     response_model=list[MultipleChoiceAnswerRead],
     operation_id="get_multiple_choice_answers",
 )
-async def get_multiple_choice_answers():
+async def get_multiple_choice_answers(session: AsyncSession = Depends(get_session)):
     """Get all multiple choice answers."""
 
-    with Session(db_engine) as session:
-        answers = session.exec(select(MultipleChoiceAnswer)).all()
+    answers = (await session.exec(select(MultipleChoiceAnswer))).all()
 
     return answers
 
@@ -35,11 +35,12 @@ async def get_multiple_choice_answers():
     response_model=MultipleChoiceAnswerRead,
     operation_id="get_multiple_choice_answer",
 )
-async def get_multiple_choice_answer(answer_id: int):
+async def get_multiple_choice_answer(
+    answer_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get a multiple choice answer by ID."""
 
-    with Session(db_engine) as session:
-        answer = session.get(MultipleChoiceAnswer, answer_id)
+    answer = await session.get(MultipleChoiceAnswer, answer_id)
 
     return answer
 
@@ -50,14 +51,15 @@ async def get_multiple_choice_answer(answer_id: int):
     operation_id="create_multiple_choice_answer",
     dependencies=[Depends(require_admin)],
 )
-async def create_multiple_choice_answer(answer: MultipleChoiceAnswerCreate):
+async def create_multiple_choice_answer(
+    answer: MultipleChoiceAnswerCreate, session: AsyncSession = Depends(get_session)
+):
     """Create a multiple choice answer."""
 
-    with Session(db_engine) as session:
-        db_answer = MultipleChoiceAnswer.model_validate(answer)
-        session.add(db_answer)
-        session.commit()
-        session.refresh(db_answer)
+    db_answer = MultipleChoiceAnswer.model_validate(answer)
+    session.add(db_answer)
+    await session.commit()
+    await session.refresh(db_answer)
 
     return db_answer
 
@@ -69,20 +71,21 @@ async def create_multiple_choice_answer(answer: MultipleChoiceAnswerCreate):
     dependencies=[Depends(require_admin)],
 )
 async def update_multiple_choice_answer(
-    answer_id: int, answer: MultipleChoiceAnswerCreate
+    answer_id: int,
+    answer: MultipleChoiceAnswerCreate,
+    session: AsyncSession = Depends(get_session),
 ):
     """Update a multiple choice answer."""
 
-    with Session(db_engine) as session:
-        db_answer = session.get(MultipleChoiceAnswer, answer_id)
+    db_answer = await session.get(MultipleChoiceAnswer, answer_id)
 
-        db_answer.question_id = answer.question_id
-        db_answer.result_id = answer.result_id
-        db_answer.selected_indices = answer.selected_indices
+    db_answer.question_id = answer.question_id
+    db_answer.result_id = answer.result_id
+    db_answer.selected_indices = answer.selected_indices
 
-        session.add(db_answer)
-        session.commit()
-        session.refresh(db_answer)
+    session.add(db_answer)
+    await session.commit()
+    await session.refresh(db_answer)
 
     return db_answer
 
@@ -93,12 +96,13 @@ async def update_multiple_choice_answer(
     operation_id="delete_multiple_choice_answer",
     dependencies=[Depends(require_admin)],
 )
-async def delete_multiple_choice_answer(answer_id: int):
+async def delete_multiple_choice_answer(
+    answer_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete a multiple choice answer."""
 
-    with Session(db_engine) as session:
-        answer = session.get(MultipleChoiceAnswer, answer_id)
-        session.delete(answer)
-        session.commit()
+    answer = await session.get(MultipleChoiceAnswer, answer_id)
+    await session.delete(answer)
+    await session.commit()
 
     return answer_id
@@ -1,13 +1,16 @@
 """Multiple choice option router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
+from quiz_api.documents import touch_questions
 from quiz_api.models import (
     MultipleChoiceOption,
     MultipleChoiceOptionCreate,
     MultipleChoiceOptionRead,
+    MultipleChoiceQuestion,
 )
 from quiz_api.security import require_admin
 
@@ -21,11 +24,10 @@ multiple_choice_option_router = APIRouter(
     response_model=list[MultipleChoiceOptionRead],
     operation_id="get_multiple_choice_options",
 )
-async def get_multiple_choice_options():
+async def get_multiple_choice_options(session: AsyncSession = Depends(get_session)):
     """Get all multiple choice options."""
 
-    with Session(db_engine) as session:
-        options = session.exec(select(MultipleChoiceOption)).all()
+    options = (await session.exec(select(MultipleChoiceOption))).all()
 
     return options
 
@@ -35,11 +37,12 @@ async def get_multiple_choice_options():
     response_model=MultipleChoiceOptionRead,
     operation_id="get_multiple_choice_option",
 )
-async def get_multiple_choice_option(option_id: int):
+async def get_multiple_choice_option(
+    option_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get a multiple choice option by ID."""
 
-    with Session(db_engine) as session:
-        option = session.get(MultipleChoiceOption, option_id)
+    option = await session.get(MultipleChoiceOption, option_id)
 
     return option
 
@@ -50,14 +53,16 @@ async def get_multiple_choice_option(option_id: int):
     operation_id="create_multiple_choice_option",
     dependencies=[Depends(require_admin)],
 )
-async def create_quiz(option: MultipleChoiceOptionCreate):
+async def create_quiz(
+    option: MultipleChoiceOptionCreate, session: AsyncSession = Depends(get_session)
+):
     """Create a multiple choice option."""
 
-    with Session(db_engine) as session:
-        db_option = MultipleChoiceOption.model_validate(option)
-        session.add(db_option)
-        session.commit()
-        session.refresh(db_option)
+    db_option = MultipleChoiceOption.model_validate(option)
+    session.add(db_option)
+    await touch_questions(session, MultipleChoiceQuestion, db_option.question_id)
+    await session.commit()
+    await session.refresh(db_option)
 
     return db_option
 
@@ -69,20 +74,25 @@ async def create_quiz(option: MultipleChoiceOptionCreate):
     dependencies=[Depends(require_admin)],
 )
 async def update_multiple_choice_option(
-    option_id: int, option: MultipleChoiceOptionCreate
+    option_id: int,
+    option: MultipleChoiceOptionCreate,
+    session: AsyncSession = Depends(get_session),
 ):
     """Update a multiple choice option by ID."""
 
-    with Session(db_engine) as session:
-        db_option = session.get(MultipleChoiceOption, option_id)
+    db_option = await session.get(MultipleChoiceOption, option_id)
 
-        db_option.text = option.text
-        db_option.question_id = option.question_id
-        db_option.index = option.index
+    await touch_questions(
+        session, MultipleChoiceQuestion, db_option.question_id, option.question_id
+    )
 
-        session.add(db_option)
-        session.commit()
-        session.refresh(db_option)
+    db_option.text = option.text
+    db_option.question_id = option.question_id
+    db_option.index = option.index
+
+    session.add(db_option)
+    await session.commit()
+    await session.refresh(db_option)
 
     return db_option
 
@@ -93,12 +103,14 @@ async def update_multiple_choice_option(
     operation_id="delete_multiple_choice_option",
     dependencies=[Depends(require_admin)],
 )
-async def delete_multiple_choice_option(option_id: int):
+async def delete_multiple_choice_option(
+    option_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete a multiple choice option by ID."""
 
-    with Session(db_engine) as session:
-        option = session.get(MultipleChoiceOption, option_id)
-        session.delete(option)
-        session.commit()
+    option = await session.get(MultipleChoiceOption, option_id)
+    await touch_questions(session, MultipleChoiceQuestion, option.question_id)
+    await session.delete(option)
+    await session.commit()
 
     return option_id
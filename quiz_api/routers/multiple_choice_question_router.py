@@ -1,9 +1,11 @@
 """Multiple choice question router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
+from quiz_api.documents import touch_quizzes
 from quiz_api.models import (
     MultipleChoiceQuestion,
     MultipleChoiceQuestionCreate,
@@ -21,11 +23,10 @@ multiple_choice_question_router = APIRouter(
     response_model=list[MultipleChoiceQuestionRead],
     operation_id="get_multiple_choice_questions",
 )
-async def get_multiple_choice_questions():
+async def get_multiple_choice_questions(session: AsyncSession = Depends(get_session)):
     """Get all multiple choice questions."""
 
-    with Session(db_engine) as session:
-        questions = session.exec(select(MultipleChoiceQuestion)).unique().all()
+    questions = (await session.exec(select(MultipleChoiceQuestion))).unique().all()
 
     return questions
 
@@ -35,11 +36,12 @@ async def get_multiple_choice_questions():
     response_model=MultipleChoiceQuestionRead,
     operation_id="get_multiple_choice_question",
 )
-async def get_multiple_choice_question(question_id: int):
+async def get_multiple_choice_question(
+    question_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get a multiple choice question by ID."""
 
-    with Session(db_engine) as session:
-        question = session.get(MultipleChoiceQuestion, question_id)
+    question = await session.get(MultipleChoiceQuestion, question_id)
 
     return question
 
@@ -50,14 +52,16 @@ async def get_multiple_choice_question(question_id: int):
     operation_id="create_multiple_choice_question",
     dependencies=[Depends(require_admin)],
 )
-async def create_quiz(question: MultipleChoiceQuestionCreate):
+async def create_quiz(
+    question: MultipleChoiceQuestionCreate, session: AsyncSession = Depends(get_session)
+):
     """Create a multiple choice question."""
 
-    with Session(db_engine) as session:
-        db_question = MultipleChoiceQuestion.model_validate(question)
-        session.add(db_question)
-        session.commit()
-        session.refresh(db_question)
+    db_question = MultipleChoiceQuestion.model_validate(question)
+    session.add(db_question)
+    await touch_quizzes(session, [db_question.quiz_id])
+    await session.commit()
+    await session.refresh(db_question)
 
     return db_question
 
@@ -69,22 +73,25 @@ async def create_quiz(question: MultipleChoiceQuestionCreate):
     dependencies=[Depends(require_admin)],
 )
 async def update_multiple_choice_question(
-    question_id: int, question: MultipleChoiceQuestionCreate
+    question_id: int,
+    question: MultipleChoiceQuestionCreate,
+    session: AsyncSession = Depends(get_session),
 ):
     """Update a multiple choice question."""
 
-    with Session(db_engine) as session:
-        db_question = session.get(MultipleChoiceQuestion, question_id)
+    db_question = await session.get(MultipleChoiceQuestion, question_id)
 
-        db_question.title = question.title
-        db_question.text = question.text
-        db_question.index = question.index
-        db_question.correct_indices = question.correct_indices
-        db_question.quiz_id = question.quiz_id
+    await touch_quizzes(session, [db_question.quiz_id, question.quiz_id])
 
-        session.add(db_question)
-        session.commit()
-        session.refresh(db_question)
+    db_question.title = question.title
+    db_question.text = question.text
+    db_question.index = question.index
+    db_question.correct_indices = question.correct_indices
+    db_question.quiz_id = question.quiz_id
+
+    session.add(db_question)
+    await session.commit()
+    await session.refresh(db_question)
 
     return db_question
 
@@ -95,12 +102,14 @@ async def update_multiple_choice_question(
     operation_id="delete_multiple_choice_question",
     dependencies=[Depends(require_admin)],
 )
-async def delete_multiple_choice_question(question_id: int):
+async def delete_multiple_choice_question(
+    question_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete a multiple choice question."""
 
-    with Session(db_engine) as session:
-        question = session.get(MultipleChoiceQuestion, question_id)
-        session.delete(question)
-        session.commit()
+    question = await session.get(MultipleChoiceQuestion, question_id)
+    await touch_quizzes(session, [question.quiz_id])
+    await session.delete(question)
+    await session.commit()
 
     return question_id
@@ -1,9 +1,10 @@
 """OpenAnswer router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
 from quiz_api.models import (
     OpenAnswer,
     OpenAnswerCreate,
@@ -19,11 +20,10 @@ open_answer_router = APIRouter(prefix="/open_answer", tags=["open_answer"])
     response_model=list[OpenAnswerRead],
     operation_id="get_open_answers",
 )
-async def get_open_answers():
+async def get_open_answers(session: AsyncSession = Depends(get_session)):
     """Get all open answers."""
 
-    with Session(db_engine) as session:
-        answers = session.exec(select(OpenAnswer)).all()
+    answers = (await session.exec(select(OpenAnswer))).all()
 
     return answers
 
@@ -33,11 +33,10 @@ async def get_open_answers():
     response_model=OpenAnswerRead,
     operation_id="get_open_answer",
 )
-async def get_open_answer(answer_id: int):
+async def get_open_answer(answer_id: int, session: AsyncSession = Depends(get_session)):
     """Get an open answer by ID."""
 
-    with Session(db_engine) as session:
-        answer = session.get(OpenAnswer, answer_id)
+    answer = await session.get(OpenAnswer, answer_id)
 
     return answer
 
@@ -48,14 +47,15 @@ async def get_open_answer(answer_id: int):
     operation_id="create_open_answer",
     dependencies=[Depends(require_admin)],
 )
-async def create_open_answer(answer: OpenAnswerCreate):
+async def create_open_answer(
+    answer: OpenAnswerCreate, session: AsyncSession = Depends(get_session)
+):
     """Create an open answer."""
 
-    with Session(db_engine) as session:
-        db_answer = OpenAnswer.model_validate(answer)
-        session.add(db_answer)
-        session.commit()
-        session.refresh(db_answer)
+    db_answer = OpenAnswer.model_validate(answer)
+    session.add(db_answer)
+    await session.commit()
+    await session.refresh(db_answer)
 
     return db_answer
 
@@ -66,19 +66,22 @@ async def create_open_answer(answer: OpenAnswerCreate):
     operation_id="update_open_answer",
     dependencies=[Depends(require_admin)],
 )
-async def update_open_answer(answer_id: int, answer: OpenAnswerCreate):
+async def update_open_answer(
+    answer_id: int,
+    answer: OpenAnswerCreate,
+    session: AsyncSession = Depends(get_session),
+):
     """Update an open answer."""
 
-    with Session(db_engine) as session:
-        db_answer = session.get(OpenAnswer, answer_id)
+    db_answer = await session.get(OpenAnswer, answer_id)
 
-        db_answer.question_id = answer.question_id
-        db_answer.result_id = answer.result_id
-        db_answer.text = answer.text
+    db_answer.question_id = answer.question_id
+    db_answer.result_id = answer.result_id
+    db_answer.text = answer.text
 
-        session.add(db_answer)
-        session.commit()
-        session.refresh(db_answer)
+    session.add(db_answer)
+    await session.commit()
+    await session.refresh(db_answer)
 
     return db_answer
 
@@ -89,12 +92,13 @@ async def update_open_answer(answer_id: int, answer: OpenAnswerCreate):
     operation_id="delete_open_answer",
     dependencies=[Depends(require_admin)],
 )
-async def delete_open_answer(answer_id: int):
+async def delete_open_answer(
+    answer_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete an open answer."""
 
-    with Session(db_engine) as session:
-        answer = session.get(OpenAnswer, answer_id)
-        session.delete(answer)
-        session.commit()
+    answer = await session.get(OpenAnswer, answer_id)
+    await session.delete(answer)
+    await session.commit()
 
     return answer_id
@@ -1,10 +1,12 @@
 """OpenOption router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
-from quiz_api.models import OpenOption, OpenOptionRead
+from quiz_api.db import get_session
+from quiz_api.documents import touch_questions
+from quiz_api.models import OpenOption, OpenOptionRead, OpenQuestion
 from quiz_api.security import require_admin
 
 open_option_router = APIRouter(prefix="/open_option", tags=["open_option"])
@@ -16,11 +18,10 @@ open_option_router = APIRouter(prefix="/open_option", tags=["open_option"])
     operation_id="get_open_options",
     dependencies=[Depends(require_admin)],
 )
-async def get_open_options():
+async def get_open_options(session: AsyncSession = Depends(get_session)):
     """Get all open options."""
 
-    with Session(db_engine) as session:
-        open_options = session.exec(select(OpenOption)).all()
+    open_options = (await session.exec(select(OpenOption))).all()
 
     return open_options
 
@@ -31,11 +32,12 @@ async def get_open_options():
     operation_id="get_open_option",
     dependencies=[Depends(require_admin)],
 )
-async def get_open_option(open_option_id: int):
+async def get_open_option(
+    open_option_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get an open option by ID."""
 
-    with Session(db_engine) as session:
-        open_option = session.get(OpenOption, open_option_id)
+    open_option = await session.get(OpenOption, open_option_id)
 
     return open_option
 
@@ -46,14 +48,16 @@ async def get_open_option(open_option_id: int):
     operation_id="create_open_option",
     dependencies=[Depends(require_admin)],
 )
-async def create_open_option(open_option: OpenOption):
+async def create_open_option(
+    open_option: OpenOption, session: AsyncSession = Depends(get_session)
+):
     """Create an open option."""
 
-    with Session(db_engine) as session:
-        db_open_option = OpenOption.model_validate(open_option)
-        session.add(db_open_option)
-        session.commit()
-        session.refresh(db_open_option)
+    db_open_option = OpenOption.model_validate(open_option)
+    session.add(db_open_option)
+    await touch_questions(session, OpenQuestion, db_open_option.question_id)
+    await session.commit()
+    await session.refresh(db_open_option)
 
     return db_open_option
 
@@ -64,19 +68,26 @@ async def create_open_option(open_option: OpenOption):
     operation_id="update_open_option",
     dependencies=[Depends(require_admin)],
 )
-async def update_open_option(open_option_id: int, open_option: OpenOption):
+async def update_open_option(
+    open_option_id: int,
+    open_option: OpenOption,
+    session: AsyncSession = Depends(get_session),
+):
     """Update an open option."""
 
-    with Session(db_engine) as session:
-        db_open_option = session.get(OpenOption, open_option_id)
+    db_open_option = await session.get(OpenOption, open_option_id)
 
-        db_open_option.text = open_option.text
-        db_open_option.index = open_option.index
-        db_open_option.question_id = open_option.question_id
+    await touch_questions(
+        session, OpenQuestion, db_open_option.question_id, open_option.question_id
+    )
 
-        session.add(db_open_option)
-        session.commit()
-        session.refresh(db_open_option)
+    db_open_option.text = open_option.text
+    db_open_option.index = open_option.index
+    db_open_option.question_id = open_option.question_id
+
+    session.add(db_open_option)
+    await session.commit()
+    await session.refresh(db_open_option)
 
     return db_open_option
 
@@ -87,12 +98,14 @@ async def update_open_option(open_option_id: int, open_option: OpenOption):
     operation_id="delete_open_option",
     dependencies=[Depends(require_admin)],
 )
-async def delete_open_option(open_option_id: int):
+async def delete_open_option(
+    open_option_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete an open option."""
 
-    with Session(db_engine) as session:
-        open_option = session.get(OpenOption, open_option_id)
-        session.delete(open_option)
-        session.commit()
+    open_option = await session.get(OpenOption, open_option_id)
+    await touch_questions(session, OpenQuestion, open_option.question_id)
+    await session.delete(open_option)
+    await session.commit()
 
     return open_option_id
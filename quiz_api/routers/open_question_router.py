@@ -1,9 +1,11 @@
 """OpenQuestion router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
+from quiz_api.documents import touch_quizzes
 from quiz_api.models import OpenQuestion, OpenQuestionRead
 from quiz_api.security import require_admin
 
@@ -15,11 +17,10 @@ open_question_router = APIRouter(prefix="/open_question", tags=["open_question"]
     response_model=list[OpenQuestionRead],
     operation_id="get_open_questions",
 )
-async def get_open_questions():
+async def get_open_questions(session: AsyncSession = Depends(get_session)):
     """Get all open questions."""
 
-    with Session(db_engine) as session:
-        open_questions = session.exec(select(OpenQuestion)).all()
+    open_questions = (await session.exec(select(OpenQuestion))).all()
 
     return open_questions
 
@@ -29,11 +30,12 @@ async def get_open_questions():
     response_model=OpenQuestionRead,
     operation_id="get_open_question",
 )
-async def get_open_question(open_question_id: int):
+async def get_open_question(
+    open_question_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get an open question by ID."""
 
-    with Session(db_engine) as session:
-        open_question = session.get(OpenQuestion, open_question_id)
+    open_question = await session.get(OpenQuestion, open_question_id)
 
     return open_question
 
@@ -44,14 +46,16 @@ async def get_open_question(open_question_id: int):
     operation_id="create_open_question",
     dependencies=[Depends(require_admin)],
 )
-async def create_open_question(open_question: OpenQuestion):
+async def create_open_question(
+    open_question: OpenQuestion, session: AsyncSession = Depends(get_session)
+):
     """Create an open question."""
 
-    with Session(db_engine) as session:
-        db_open_question = OpenQuestion.model_validate(open_question)
-        session.add(db_open_question)
-        session.commit()
-        session.refresh(db_open_question)
+    db_open_question = OpenQuestion.model_validate(open_question)
+    session.add(db_open_question)
+    await touch_quizzes(session, [db_open_question.quiz_id])
+    await session.commit()
+    await session.refresh(db_open_question)
 
     return db_open_question
 
@@ -62,20 +66,25 @@ async def create_open_question(open_question: OpenQuestion):
     operation_id="update_open_question",
     dependencies=[Depends(require_admin)],
 )
-async def update_open_question(open_question_id: int, open_question: OpenQuestion):
+async def update_open_question(
+    open_question_id: int,
+    open_question: OpenQuestion,
+    session: AsyncSession = Depends(get_session),
+):
     """Update an open question by ID."""
 
-    with Session(db_engine) as session:
-        db_open_question = session.get(OpenQuestion, open_question_id)
+    db_open_question = await session.get(OpenQuestion, open_question_id)
 
-        db_open_question.title = open_question.title
-        db_open_question.text = open_question.text
-        db_open_question.index = open_question.index
-        db_open_question.quiz_id = open_question.quiz_id
+    await touch_quizzes(session, [db_open_question.quiz_id, open_question.quiz_id])
 
-        session.add(db_open_question)
-        session.commit()
-        session.refresh(db_open_question)
+    db_open_question.title = open_question.title
+    db_open_question.text = open_question.text
+    db_open_question.index = open_question.index
+    db_open_question.quiz_id = open_question.quiz_id
+
+    session.add(db_open_question)
+    await session.commit()
+    await session.refresh(db_open_question)
 
     return db_open_question
 
@@ -86,12 +95,14 @@ async def update_open_question(open_question_id: int, open_question: OpenQuestio
     operation_id="delete_open_question",
     dependencies=[Depends(require_admin)],
 )
-async def delete_open_question(open_question_id: int):
+async def delete_open_question(
+    open_question_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete an open question by ID."""
 
-    with Session(db_engine) as session:
-        open_question = session.get(OpenQuestion, open_question_id)
-        session.delete(open_question)
-        session.commit()
+    open_question = await session.get(OpenQuestion, open_question_id)
+    await touch_quizzes(session, [open_question.quiz_id])
+    await session.delete(open_question)
+    await session.commit()
 
     return open_question_id
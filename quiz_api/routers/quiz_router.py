@@ -2,29 +2,42 @@
 
 from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
-
-from quiz_api.db import db_engine
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import noload
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from quiz_api.const import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_REGRADE_CHUNK_SIZE,
+    MAX_PAGE_SIZE,
+    ExportFormat,
+    ResultMode,
+)
+from quiz_api.db import get_session, insert_all
+from quiz_api.deletion import delete_quizzes
+from quiz_api.documents import get_quiz_document, get_quiz_version, touch_quizzes
+from quiz_api.exporting import export_response, stream_quizzes
+from quiz_api.grading import UnknownQuestionError, get_answer_key, grade_answer
+from quiz_api.importing import import_quiz
 from quiz_api.models import (
+    ANSWER_MODELS,
+    QUESTION_MODELS,
     Answers,
-    AssignmentAnswer,
-    AssignmentQuestion,
-    GapTextAnswer,
-    GapTextSubQuestion,
-    MultipleChoiceAnswer,
-    MultipleChoiceQuestion,
-    OpenAnswer,
-    OpenQuestion,
     Quiz,
     QuizCreate,
+    QuizImport,
+    QuizLabelRelation,
     QuizRead,
+    QuizSummary,
+    QuizSummaryPage,
+    RegradeReport,
     Result,
     ResultRead,
-    SingleChoiceAnswer,
-    SingleChoiceQuestion,
     User,
 )
+from quiz_api.regrade import regrade_quiz_results
 from quiz_api.security import get_current_user, require_admin
 
 quiz_router = APIRouter(prefix="/quiz", tags=["quiz"])
@@ -35,34 +48,117 @@ quiz_router = APIRouter(prefix="/quiz", tags=["quiz"])
     response_model=list[QuizRead],
     operation_id="get_quizzes",
 )
-async def get_quizzes():
+async def get_quizzes(session: AsyncSession = Depends(get_session)):
     """Get all quizzes."""
 
-    with Session(db_engine) as session:
-        quizzes = session.exec(select(Quiz)).unique().all()
+    quizzes = (await session.exec(select(Quiz))).unique().all()
 
-        for quiz in quizzes:
-            for label in quiz.labels:
-                session.refresh(label)
+    for quiz in quizzes:
+        for label in quiz.labels:
+            await session.refresh(label)
 
     return quizzes
 
 
+@quiz_router.get(
+    "/summary",
+    response_model=QuizSummaryPage,
+    operation_id="get_quiz_summaries",
+)
+async def get_quiz_summaries(
+    after: int | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    label_id: list[int] = Query(default=[]),
+    is_practice: bool | None = None,
+    session: AsyncSession = Depends(get_session),
+):
+    """Get a page of quiz summaries ordered by ID."""
+
+    question_count = sum(
+        select(func.count())
+        .where(question_model.quiz_id == Quiz.id)
+        .correlate(Quiz)
+        .scalar_subquery()
+        for question_model in QUESTION_MODELS
+    )
+
+    query = (
+        select(
+            Quiz.id,
+            Quiz.title,
+            Quiz.is_practice,
+            question_count.label("question_count"),
+        )
+        .order_by(Quiz.id)
+        .limit(limit + 1)
+    )
+
+    if after is not None:
+        query = query.where(Quiz.id > after)
+
+    if is_practice is not None:
+        query = query.where(Quiz.is_practice == is_practice)
+
+    if label_id:
+        query = query.where(
+            Quiz.id.in_(
+                select(QuizLabelRelation.quiz_id).where(
+                    QuizLabelRelation.label_id.in_(label_id)
+                )
+            )
+        )
+
+    rows = (await session.exec(query)).all()
+    items = [QuizSummary.model_validate(row._mapping) for row in rows[:limit]]
+
+    return QuizSummaryPage(
+        items=items,
+        next_cursor=items[-1].id if len(rows) > limit else None,
+    )
+
+
+@quiz_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    operation_id="export_quizzes",
+)
+async def export_quizzes(format: ExportFormat = ExportFormat.NDJSON):
+    """Export all quizzes as NDJSON, or as CSV with one row per question."""
+
+    return export_response(stream_quizzes(format), format, "quizzes")
+
+
 @quiz_router.get(
     "/{quiz_id}",
     response_model=QuizRead,
     operation_id="get_quiz",
 )
-async def get_quiz(quiz_id: int):
+async def get_quiz(
+    quiz_id: int,
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_session),
+):
     """Get a quiz by ID."""
 
-    with Session(db_engine) as session:
-        quiz = session.get(Quiz, quiz_id)
+    document = await get_quiz_document(session, quiz_id)
 
-        for label in quiz.labels:
-            session.refresh(label)
+    if document is None:
+        raise HTTPException(
+            status_code=404, detail=f"Quiz with ID {quiz_id} not found."
+        )
+
+    headers = {"ETag": document.etag, "Cache-Control": "private, no-cache"}
+
+    if if_none_match is not None and (
+        if_none_match.strip() == "*"
+        or document.etag
+        in [etag.strip().removeprefix("W/") for etag in if_none_match.split(",")]
+    ):
+        return Response(status_code=304, headers=headers)
 
-    return quiz
+    return Response(
+        content=document.body, media_type="application/json", headers=headers
+    )
 
 
 @quiz_router.post(
@@ -71,42 +167,60 @@ async def get_quiz(quiz_id: int):
     operation_id="create_quiz",
     dependencies=[Depends(require_admin)],
 )
-async def create_quiz(quiz: QuizCreate):
+async def create_quiz(quiz: QuizCreate, session: AsyncSession = Depends(get_session)):
     """Create a quiz."""
 
-    with Session(db_engine) as session:
-        db_quiz = Quiz.model_validate(quiz)
-        session.add(db_quiz)
-        session.commit()
-        session.refresh(db_quiz)
+    db_quiz = Quiz.model_validate(quiz)
+    session.add(db_quiz)
+    await session.commit()
+    await session.refresh(db_quiz)
 
-        for label in db_quiz.labels:
-            session.refresh(label)
+    for label in db_quiz.labels:
+        await session.refresh(label)
 
     return db_quiz
 
 
+@quiz_router.post(
+    "/import",
+    response_model=QuizSummary,
+    operation_id="import_quiz",
+    dependencies=[Depends(require_admin)],
+)
+async def import_quiz_document(
+    document: QuizImport, session: AsyncSession = Depends(get_session)
+):
+    """Create a quiz with all its questions, options and labels at once."""
+
+    summary = await import_quiz(session, document)
+    await session.commit()
+
+    return summary
+
+
 @quiz_router.put(
     "/{quiz_id}",
     response_model=QuizRead,
     operation_id="update_quiz",
     dependencies=[Depends(require_admin)],
 )
-async def update_quiz(quiz_id: int, quiz: QuizCreate):
+async def update_quiz(
+    quiz_id: int, quiz: QuizCreate, session: AsyncSession = Depends(get_session)
+):
     """Update a quiz by ID."""
 
-    with Session(db_engine) as session:
-        db_quiz = session.get(Quiz, quiz_id)
+    db_quiz = await session.get(Quiz, quiz_id)
 
-        db_quiz.title = quiz.title
-        db_quiz.is_practice = quiz.is_practice
+    db_quiz.title = quiz.title
+    db_quiz.is_practice = quiz.is_practice
 
-        session.add(db_quiz)
-        session.commit()
-        session.refresh(db_quiz)
+    session.add(db_quiz)
+    await touch_quizzes(session, [quiz_id])
+    await session.commit()
+    await session.refresh(db_quiz)
 
-        for label in db_quiz.labels:
-            session.refresh(label)
+    for label in db_quiz.labels:
+        await session.refresh(label)
 
     return db_quiz
 
@@ -117,41 +231,16 @@ async def update_quiz(quiz_id: int, quiz: QuizCreate):
     operation_id="delete_quiz",
     dependencies=[Depends(require_admin)],
 )
-async def delete_quiz(quiz_id: int):
+async def delete_quiz(quiz_id: int, session: AsyncSession = Depends(get_session)):
     """Delete a quiz by ID."""
 
-    with Session(db_engine) as session:
-        quiz = session.get(Quiz, quiz_id)
-
-        results = (
-            session.exec(select(Result).filter(Result.quiz_id == quiz_id))
-            .unique()
-            .all()
+    if await get_quiz_version(session, quiz_id) is None:
+        raise HTTPException(
+            status_code=404, detail=f"Quiz with ID {quiz_id} not found."
         )
 
-        for label in quiz.labels:
-            session.refresh(label)
-
-            if len(label.quizzes) == 1:
-                session.delete(label)
-
-        for result in results:
-            for single_choice_answer in result.single_choice_answers:
-                session.delete(single_choice_answer)
-            for multiple_choice_answer in result.multiple_choice_answers:
-                session.delete(multiple_choice_answer)
-            for open_answer in result.open_answers:
-                session.delete(open_answer)
-            for gap_text_answer in result.gap_text_answers:
-                session.delete(gap_text_answer)
-            for assignment_answer in result.assignment_answers:
-                session.delete(assignment_answer)
-
-            session.delete(result)
-
-        if quiz is not None:
-            session.delete(quiz)
-            session.commit()
+    await delete_quizzes(session, [quiz_id])
+    await session.commit()
 
     return quiz_id
 
@@ -161,19 +250,32 @@ async def delete_quiz(quiz_id: int):
     response_model=list[ResultRead],
     operation_id="get_quiz_results",
 )
-async def get_results(quiz_id: int, current_user: User = Depends(get_current_user)):
-    """Get all results for a quiz."""
-
-    with Session(db_engine) as session:
-        results = (
-            session.exec(
-                select(Result).filter(
-                    Result.quiz_id == quiz_id and Result.user_id == current_user.id
-                )
-            )
-            .unique()
-            .all()
-        )
+async def get_results(
+    quiz_id: int,
+    mode: ResultMode = ResultMode.ALL,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get the results of the current user for a quiz, newest first.
+
+    The latest and best modes only return the latest or highest scoring attempt.
+    """
+
+    query = (
+        select(Result)
+        .options(noload(Result.user))
+        .where(Result.quiz_id == quiz_id, Result.user_id == current_user.id)
+    )
+
+    if mode == ResultMode.BEST:
+        query = query.order_by(Result.score.desc())
+
+    query = query.order_by(Result.created_at.desc(), Result.id.desc())
+
+    if mode != ResultMode.ALL:
+        query = query.limit(1)
+
+    results = (await session.exec(query)).all()
 
     return results
 
@@ -184,179 +286,88 @@ async def get_results(quiz_id: int, current_user: User = Depends(get_current_use
     operation_id="submit_quiz",
 )
 async def submit_quiz(
-    quiz_id: int, answers: Answers, current_user: User = Depends(get_current_user)
+    quiz_id: int,
+    answers: Answers,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ):
     """Finish a quiz."""
 
-    with Session(db_engine) as session:
-        result = Result(
-            quiz_id=quiz_id, user_id=current_user.id, created_at=datetime.now(UTC)
-        )
-
-        session.add(result)
-        session.commit()
-        session.refresh(result)
-
-    with Session(db_engine) as session:
-        result = session.get(Result, result.id)
-
-        for single_choice_answer in answers.single_choice_answers:
-            single_choice_question = session.get(
-                SingleChoiceQuestion, single_choice_answer.question_id
-            )
-
-            db_single_choice_answer = SingleChoiceAnswer(
-                selected_index=single_choice_answer.selected_index,
-                result_id=result.id,
-                question_id=single_choice_question.id,
-            )
-
-            score = (
-                1
-                if single_choice_question.difficulty == "easy"
-                else 2
-                if single_choice_question.difficulty == "medium"
-                else 3
-            )
-
-            if (
-                single_choice_answer.selected_index
-                == single_choice_question.correct_index
-            ):
-                result.score += score
-                db_single_choice_answer.score = score
-
-            db_single_choice_answer.max_score = score
-            result.max_score += score
-
-            session.add(db_single_choice_answer)
-
-        for multiple_choice_answer in answers.multiple_choice_answers:
-            multiple_choice_question = session.get(
-                MultipleChoiceQuestion, multiple_choice_answer.question_id
-            )
-
-            db_multiple_choice_answer = MultipleChoiceAnswer(
-                selected_indices=multiple_choice_answer.selected_indices,
-                result_id=result.id,
-                question_id=multiple_choice_question.id,
-            )
-
-            score = (
-                1
-                if multiple_choice_question.difficulty == "easy"
-                else 2
-                if multiple_choice_question.difficulty == "medium"
-                else 3
-            )
-
-            if set(multiple_choice_answer.selected_indices) == set(
-                multiple_choice_question.correct_indices
-            ):
-                result.score += score
-                db_multiple_choice_answer.score = score
-
-            db_multiple_choice_answer.max_score = score
-            result.max_score += score
+    answer_key = await get_answer_key(session, quiz_id)
 
-            session.add(db_multiple_choice_answer)
-
-        for open_answer in answers.open_answers:
-            open_question = session.get(OpenQuestion, open_answer.question_id)
-
-            db_open_answer = OpenAnswer(
-                text=open_answer.text,
-                result_id=result.id,
-                question_id=open_question.id,
-            )
-
-            score = (
-                1
-                if open_question.difficulty == "easy"
-                else 2
-                if open_question.difficulty == "medium"
-                else 3
-            )
-
-            if all(
-                [
-                    open_option.text.lower() in open_answer.text.lower()
-                    for open_option in open_question.open_options
-                ]
-            ):
-                result.score += score
-                db_open_answer.score = score
-
-            db_open_answer.max_score = score
-            result.max_score += score
-
-            session.add(db_open_answer)
+    if answer_key is None:
+        raise HTTPException(
+            status_code=404, detail=f"Quiz with ID {quiz_id} not found."
+        )
 
-        for gap_text_answer in answers.gap_text_answers:
-            gap_text_question = session.get(
-                GapTextSubQuestion, gap_text_answer.question_id
-            )
+    db_answers: dict[str, list] = {}
 
-            db_gap_text_answer = GapTextAnswer(
-                selected_indices=gap_text_answer.selected_indices,
-                result_id=result.id,
-                question_id=gap_text_question.id,
-            )
+    try:
+        for question_type, answer_model in ANSWER_MODELS.items():
+            db_answers[question_type] = []
 
-            score = (
-                1
-                if gap_text_question.difficulty == "easy"
-                else 2
-                if gap_text_question.difficulty == "medium"
-                else 3
-            )
-
-            if gap_text_answer.selected_indices == gap_text_question.correct_indices:
-                result.score += score * len(gap_text_question.correct_indices)
-                db_gap_text_answer.score = score * len(
-                    gap_text_question.correct_indices
+            for answer in getattr(answers, f"{question_type}_answers"):
+                score, max_score = grade_answer(answer_key, question_type, answer)
+                db_answers[question_type].append(
+                    answer_model(
+                        **answer.model_dump(exclude={"result_id"}),
+                        score=score,
+                        max_score=max_score,
+                    )
                 )
+    except UnknownQuestionError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
-            db_gap_text_answer.max_score = score * len(
-                gap_text_question.correct_indices
-            )
-            result.max_score += score * len(gap_text_question.correct_indices)
+    result = Result(
+        quiz_id=quiz_id,
+        user_id=current_user.id,
+        created_at=datetime.now(UTC),
+        score=sum(
+            db_answer.score for rows in db_answers.values() for db_answer in rows
+        ),
+        max_score=sum(
+            db_answer.max_score for rows in db_answers.values() for db_answer in rows
+        ),
+    )
 
-            session.add(db_gap_text_answer)
+    session.add(result)
+    await session.flush()
 
-        for assignment_answer in answers.assignment_answers:
-            assignment_question = session.get(
-                AssignmentQuestion, assignment_answer.question_id
-            )
+    for rows in db_answers.values():
+        for db_answer in rows:
+            db_answer.result_id = result.id
 
-            db_assignment_answer = AssignmentAnswer(
-                selected_indices=assignment_answer.selected_indices,
-                result_id=result.id,
-                question_id=assignment_question.id,
-            )
+        await insert_all(session, rows)
 
-            score = (
-                1
-                if assignment_question.difficulty == "easy"
-                else 2
-                if assignment_question.difficulty == "medium"
-                else 3
-            )
+    await session.commit()
 
-            if (
-                assignment_answer.selected_indices
-                == assignment_question.correct_indices
-            ):
-                result.score += score
-                db_assignment_answer.score = score
+    return ResultRead(
+        **result.model_dump(),
+        **{
+            f"{question_type}_answers": rows
+            for question_type, rows in db_answers.items()
+        },
+    )
 
-            db_assignment_answer.max_score = score
-            result.max_score += score
 
-            session.add(db_assignment_answer)
+@quiz_router.post(
+    "/{quiz_id}/regrade",
+    response_model=RegradeReport,
+    operation_id="regrade_quiz",
+    dependencies=[Depends(require_admin)],
+)
+async def regrade_quiz(
+    quiz_id: int,
+    chunk_size: int = Query(DEFAULT_REGRADE_CHUNK_SIZE, ge=1),
+    session: AsyncSession = Depends(get_session),
+):
+    """Re-grade all results of a quiz against its current solutions."""
 
-        session.add(result)
-        session.commit()
-        session.refresh(result)
+    report = await regrade_quiz_results(session, quiz_id, chunk_size)
+
+    if report is None:
+        raise HTTPException(
+            status_code=404, detail=f"Quiz with ID {quiz_id} not found."
+        )
 
-        return result
+    return report
@@ -1,14 +1,55 @@
 """Result router."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-
-from quiz_api.db import db_engine
+import base64
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
+from sqlalchemy.orm import noload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from quiz_api.const import (
+    DEFAULT_RESULT_PAGE_SIZE,
+    MAX_RESULT_PAGE_SIZE,
+    ExportFormat,
+)
+from quiz_api.db import get_session
+from quiz_api.exporting import export_response, stream_results
 from quiz_api.models import Result, ResultRead
 from quiz_api.security import require_admin
 
 result_router = APIRouter(prefix="/result", tags=["result"])
 
+ANSWER_RELATIONSHIPS = (
+    Result.single_choice_answers,
+    Result.multiple_choice_answers,
+    Result.open_answers,
+    Result.assignment_answers,
+    Result.gap_text_answers,
+)
+
+
+def encode_cursor(result: Result) -> str:
+    """Encode the position after a result as an opaque cursor."""
+
+    position = f"{result.created_at.isoformat()}|{result.id}"
+
+    return base64.urlsafe_b64encode(position.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor into the creation time and ID of a result."""
+
+    try:
+        created_at, result_id = (
+            base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        )
+        return datetime.fromisoformat(created_at), int(result_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
 
 @result_router.get(
     "",
@@ -16,12 +57,27 @@ result_router = APIRouter(prefix="/result", tags=["result"])
     operation_id="get_results",
 )
 async def get_results(
+    response: Response,
     quiz_id: int | None = None,
     user_id: int | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    min_score: int | None = None,
+    max_score: int | None = None,
+    include_answers: bool = True,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_RESULT_PAGE_SIZE, ge=1, le=MAX_RESULT_PAGE_SIZE),
+    session: AsyncSession = Depends(get_session),
 ):
-    """Get all results for the current user."""
+    """Get a page of results, newest first.
 
-    query = select(Result)
+    The cursor of the next page is returned in the X-Next-Cursor header.
+    """
+
+    query = select(Result).options(noload(Result.user))
+
+    if not include_answers:
+        query = query.options(*(noload(answers) for answers in ANSWER_RELATIONSHIPS))
 
     if quiz_id is not None:
         query = query.filter(Result.quiz_id == quiz_id)
@@ -29,28 +85,64 @@ async def get_results(
     if user_id is not None:
         query = query.filter(Result.user_id == user_id)
 
-    with Session(db_engine) as session:
-        results = session.exec(query).unique().all()
+    if created_after is not None:
+        query = query.filter(Result.created_at >= created_after)
+
+    if created_before is not None:
+        query = query.filter(Result.created_at < created_before)
+
+    if min_score is not None:
+        query = query.filter(Result.score >= min_score)
+
+    if max_score is not None:
+        query = query.filter(Result.score <= max_score)
+
+    if cursor is not None:
+        query = query.filter(
+            tuple_(Result.created_at, Result.id) < tuple_(*decode_cursor(cursor))
+        )
+
+    query = query.order_by(Result.created_at.desc(), Result.id.desc()).limit(limit + 1)
+    results = (await session.exec(query)).all()
+
+    if len(results) > limit:
+        results = results[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(results[-1])
 
     return results
 
 
+@result_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    operation_id="export_results",
+    dependencies=[Depends(require_admin)],
+)
+async def export_results(
+    format: ExportFormat = ExportFormat.NDJSON,
+    quiz_id: int | None = None,
+    user_id: int | None = None,
+):
+    """Export results as NDJSON, or as CSV with one row per answer."""
+
+    return export_response(stream_results(format, quiz_id, user_id), format, "results")
+
+
 @result_router.delete(
     "/{result_id}",
     response_model=int,
     operation_id="delete_result",
     dependencies=[Depends(require_admin)],
 )
-async def delete_result(result_id: int):
+async def delete_result(result_id: int, session: AsyncSession = Depends(get_session)):
     """Delete a result by ID."""
 
-    with Session(db_engine) as session:
-        result = session.get(Result, result_id)
+    result = await session.get(Result, result_id)
 
-        if result is None:
-            raise HTTPException(status_code=404, detail="Result not found.")
+    if result is None:
+        raise HTTPException(status_code=404, detail="Result not found.")
 
-        session.delete(result)
-        session.commit()
+    await session.delete(result)
+    await session.commit()
 
     return result_id
@@ -1,9 +1,10 @@
 """SingleChoiceAnswer router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
 from quiz_api.models import (
     SingleChoiceAnswer,
     SingleChoiceAnswerCreate,
@@ -21,11 +22,10 @@ single_choice_answer_router = APIRouter(
     response_model=list[SingleChoiceAnswerRead],
     operation_id="get_single_choice_answers",
 )
-async def get_single_choice_answers():
+async def get_single_choice_answers(session: AsyncSession = Depends(get_session)):
     """Get all single choice answers."""
 
-    with Session(db_engine) as session:
-        answers = session.exec(select(SingleChoiceAnswer)).all()
+    answers = (await session.exec(select(SingleChoiceAnswer))).all()
 
     return answers
 
@@ -35,11 +35,12 @@ async def get_single_choice_answers():
     response_model=SingleChoiceAnswerRead,
     operation_id="get_single_choice_answer",
 )
-async def get_single_choice_answer(answer_id: int):
+async def get_single_choice_answer(
+    answer_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get a single choice answer by ID."""
 
-    with Session(db_engine) as session:
-        answer = session.get(SingleChoiceAnswer, answer_id)
+    answer = await session.get(SingleChoiceAnswer, answer_id)
 
     return answer
 
@@ -50,14 +51,15 @@ async def get_single_choice_answer(answer_id: int):
     operation_id="create_single_choice_answer",
     dependencies=[Depends(require_admin)],
 )
-async def create_single_choice_answer(answer: SingleChoiceAnswerCreate):
+async def create_single_choice_answer(
+    answer: SingleChoiceAnswerCreate, session: AsyncSession = Depends(get_session)
+):
     """Create a single choice answer."""
 
-    with Session(db_engine) as session:
-        db_answer = SingleChoiceAnswer.model_validate(answer)
-        session.add(db_answer)
-        session.commit()
-        session.refresh(db_answer)
+    db_answer = SingleChoiceAnswer.model_validate(answer)
+    session.add(db_answer)
+    await session.commit()
+    await session.refresh(db_answer)
 
     return db_answer
 
@@ -68,19 +70,22 @@ async def create_single_choice_answer(answer: SingleChoiceAnswerCreate):
     operation_id="update_single_choice_answer",
     dependencies=[Depends(require_admin)],
 )
-async def update_single_choice_answer(answer_id: int, answer: SingleChoiceAnswerCreate):
+async def update_single_choice_answer(
+    answer_id: int,
+    answer: SingleChoiceAnswerCreate,
+    session: AsyncSession = Depends(get_session),
+):
     """Update a single choice answer."""
 
-    with Session(db_engine) as session:
-        db_answer = session.get(SingleChoiceAnswer, answer_id)
+    db_answer = await session.get(SingleChoiceAnswer, answer_id)
 
-        db_answer.question_id = answer.question_id
-        db_answer.result_id = answer.result_id
-        db_answer.selected_index = answer.selected_index
+    db_answer.question_id = answer.question_id
+    db_answer.result_id = answer.result_id
+    db_answer.selected_index = answer.selected_index
 
-        session.add(db_answer)
-        session.commit()
-        session.refresh(db_answer)
+    session.add(db_answer)
+    await session.commit()
+    await session.refresh(db_answer)
 
     return db_answer
 
@@ -91,12 +96,13 @@ async def update_single_choice_answer(answer_id: int, answer: SingleChoiceAnswer
     operation_id="delete_single_choice_answer",
     dependencies=[Depends(require_admin)],
 )
-async def delete_single_choice_answer(answer_id: int):
+async def delete_single_choice_answer(
+    answer_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete a single choice answer."""
 
-    with Session(db_engine) as session:
-        answer = session.get(SingleChoiceAnswer, answer_id)
-        session.delete(answer)
-        session.commit()
+    answer = await session.get(SingleChoiceAnswer, answer_id)
+    await session.delete(answer)
+    await session.commit()
 
     return answer_id
@@ -1,13 +1,16 @@
 """Single choice option router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
+from quiz_api.documents import touch_questions
 from quiz_api.models import (
     SingleChoiceOption,
     SingleChoiceOptionCreate,
     SingleChoiceOptionRead,
+    SingleChoiceQuestion,
 )
 from quiz_api.security import require_admin
 
@@ -21,11 +24,10 @@ single_choice_option_router = APIRouter(
     response_model=list[SingleChoiceOptionRead],
     operation_id="get_single_choice_options",
 )
-async def get_single_choice_options():
+async def get_single_choice_options(session: AsyncSession = Depends(get_session)):
     """Get all single choice options."""
 
-    with Session(db_engine) as session:
-        options = session.exec(select(SingleChoiceOption)).all()
+    options = (await session.exec(select(SingleChoiceOption))).all()
 
     return options
 
@@ -35,11 +37,12 @@ async def get_single_choice_options():
     response_model=SingleChoiceOptionRead,
     operation_id="get_single_choice_option",
 )
-async def get_single_choice_option(option_id: int):
+async def get_single_choice_option(
+    option_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get a single choice option by ID."""
 
-    with Session(db_engine) as session:
-        option = session.get(SingleChoiceOption, option_id)
+    option = await session.get(SingleChoiceOption, option_id)
 
     return option
 
@@ -50,14 +53,16 @@ async def get_single_choice_option(option_id: int):
     operation_id="create_single_choice_option",
     dependencies=[Depends(require_admin)],
 )
-async def create_single_choice_option(option: SingleChoiceOptionCreate):
+async def create_single_choice_option(
+    option: SingleChoiceOptionCreate, session: AsyncSession = Depends(get_session)
+):
     """Create a single choice option."""
 
-    with Session(db_engine) as session:
-        db_option = SingleChoiceOption.model_validate(option)
-        session.add(db_option)
-        session.commit()
-        session.refresh(db_option)
+    db_option = SingleChoiceOption.model_validate(option)
+    session.add(db_option)
+    await touch_questions(session, SingleChoiceQuestion, db_option.question_id)
+    await session.commit()
+    await session.refresh(db_option)
 
     return db_option
 
@@ -68,19 +73,26 @@ async def create_single_choice_option(option: SingleChoiceOptionCreate):
     operation_id="update_single_choice_option",
     dependencies=[Depends(require_admin)],
 )
-async def update_single_choice_option(option_id: int, option: SingleChoiceOptionCreate):
+async def update_single_choice_option(
+    option_id: int,
+    option: SingleChoiceOptionCreate,
+    session: AsyncSession = Depends(get_session),
+):
     """Update a single choice option by ID."""
 
-    with Session(db_engine) as session:
-        db_option = session.get(SingleChoiceOption, option_id)
+    db_option = await session.get(SingleChoiceOption, option_id)
 
-        db_option.text = option.text
-        db_option.question_id = option.question_id
-        db_option.index = option.index
+    await touch_questions(
+        session, SingleChoiceQuestion, db_option.question_id, option.question_id
+    )
 
-        session.add(db_option)
-        session.commit()
-        session.refresh(db_option)
+    db_option.text = option.text
+    db_option.question_id = option.question_id
+    db_option.index = option.index
+
+    session.add(db_option)
+    await session.commit()
+    await session.refresh(db_option)
 
     return db_option
 
@@ -91,12 +103,14 @@ async def update_single_choice_option(option_id: int, option: SingleChoiceOption
     operation_id="delete_single_choice_option",
     dependencies=[Depends(require_admin)],
 )
-async def delete_single_choice_option(option_id: int):
+async def delete_single_choice_option(
+    option_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete a single choice option by ID."""
 
-    with Session(db_engine) as session:
-        option = session.get(SingleChoiceOption, option_id)
-        session.delete(option)
-        session.commit()
+    option = await session.get(SingleChoiceOption, option_id)
+    await touch_questions(session, SingleChoiceQuestion, option.question_id)
+    await session.delete(option)
+    await session.commit()
 
     return option_id
@@ -1,9 +1,11 @@
 """Single choice question router."""
 
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
+from quiz_api.documents import touch_quizzes
 from quiz_api.models import (
     SingleChoiceQuestion,
     SingleChoiceQuestionCreate,
@@ -21,11 +23,10 @@ single_choice_question_router = APIRouter(
     response_model=list[SingleChoiceQuestionRead],
     operation_id="get_single_choice_questions",
 )
-async def get_single_choice_questions():
+async def get_single_choice_questions(session: AsyncSession = Depends(get_session)):
     """Get all single choice questions."""
 
-    with Session(db_engine) as session:
-        questions = session.exec(select(SingleChoiceQuestion)).unique().all()
+    questions = (await session.exec(select(SingleChoiceQuestion))).unique().all()
 
     return questions
 
@@ -35,11 +36,12 @@ async def get_single_choice_questions():
     response_model=SingleChoiceQuestionRead,
     operation_id="get_single_choice_question",
 )
-async def get_single_choice_question(question_id: int):
+async def get_single_choice_question(
+    question_id: int, session: AsyncSession = Depends(get_session)
+):
     """Get a single choice question by ID."""
 
-    with Session(db_engine) as session:
-        question = session.get(SingleChoiceQuestion, question_id)
+    question = await session.get(SingleChoiceQuestion, question_id)
 
     return question
 
@@ -50,14 +52,16 @@ async def get_single_choice_question(question_id: int):
     operation_id="create_single_choice_question",
     dependencies=[Depends(require_admin)],
 )
-async def create_quiz(question: SingleChoiceQuestionCreate):
+async def create_quiz(
+    question: SingleChoiceQuestionCreate, session: AsyncSession = Depends(get_session)
+):
     """Create a single choice question."""
 
-    with Session(db_engine) as session:
-        db_question = SingleChoiceQuestion.model_validate(question)
-        session.add(db_question)
-        session.commit()
-        session.refresh(db_question)
+    db_question = SingleChoiceQuestion.model_validate(question)
+    session.add(db_question)
+    await touch_quizzes(session, [db_question.quiz_id])
+    await session.commit()
+    await session.refresh(db_question)
 
     return db_question
 
@@ -69,22 +73,25 @@ async def create_quiz(question: SingleChoiceQuestionCreate):
     dependencies=[Depends(require_admin)],
 )
 async def update_single_choice_question(
-    question_id: int, question: SingleChoiceQuestionCreate
+    question_id: int,
+    question: SingleChoiceQuestionCreate,
+    session: AsyncSession = Depends(get_session),
 ):
     """Update a single choice question."""
 
-    with Session(db_engine) as session:
-        db_question = session.get(SingleChoiceQuestion, question_id)
+    db_question = await session.get(SingleChoiceQuestion, question_id)
 
-        db_question.title = question.title
-        db_question.text = question.text
-        db_question.index = question.index
-        db_question.correct_index = question.correct_index
-        db_question.quiz_id = question.quiz_id
+    await touch_quizzes(session, [db_question.quiz_id, question.quiz_id])
 
-        session.add(db_question)
-        session.commit()
-        session.refresh(db_question)
+    db_question.title = question.title
+    db_question.text = question.text
+    db_question.index = question.index
+    db_question.correct_index = question.correct_index
+    db_question.quiz_id = question.quiz_id
+
+    session.add(db_question)
+    await session.commit()
+    await session.refresh(db_question)
 
     return db_question
 
@@ -95,12 +102,14 @@ async def update_single_choice_question(
     operation_id="delete_single_choice_question",
     dependencies=[Depends(require_admin)],
 )
-async def delete_single_choice_question(question_id: int):
+async def delete_single_choice_question(
+    question_id: int, session: AsyncSession = Depends(get_session)
+):
     """Delete a single choice question by ID."""
 
-    with Session(db_engine) as session:
-        question = session.get(SingleChoiceQuestion, question_id)
-        session.delete(question)
-        session.commit()
+    question = await session.get(SingleChoiceQuestion, question_id)
+    await touch_quizzes(session, [question.quiz_id])
+    await session.delete(question)
+    await session.commit()
 
     return question_id
@@ -1,11 +1,17 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
 from quiz_api.models import User, UserCreate, UserRead
-from quiz_api.security import get_current_user, get_password_hash, require_admin
+from quiz_api.security import (
+    get_current_user,
+    hash_password,
+    invalidate_principal,
+    require_admin,
+)
 
 user_router = APIRouter(prefix="/user", tags=["user"])
 
@@ -16,19 +22,20 @@ user_router = APIRouter(prefix="/user", tags=["user"])
     operation_id="create_user",
     dependencies=[Depends(require_admin)],
 )
-async def create_user(user_create: UserCreate):
+async def create_user(
+    user_create: UserCreate, session: AsyncSession = Depends(get_session)
+):
     """Create a user."""
 
     user = User(
         username=user_create.username,
-        hashed_password=get_password_hash(user_create.password),
+        hashed_password=await hash_password(user_create.password),
         is_admin=user_create.is_admin,
     )
 
-    with Session(db_engine) as session:
-        session.add(user)
-        session.commit()
-        session.refresh(user)
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
 
     return user
 
@@ -45,11 +52,10 @@ async def read_users_me(
     response_model=list[UserRead],
     operation_id="read_users",
 )
-async def read_users():
-    with Session(db_engine) as session:
-        users = session.exec(select(User)).unique().all()
+async def read_users(session: AsyncSession = Depends(get_session)):
+    users = (await session.exec(select(User))).unique().all()
 
-        return users
+    return users
 
 
 @user_router.get(
@@ -58,11 +64,10 @@ async def read_users():
     operation_id="read_user",
     dependencies=[Depends(require_admin)],
 )
-async def read_user(user_id: int):
-    with Session(db_engine) as session:
-        user = session.get(User, user_id)
+async def read_user(user_id: int, session: AsyncSession = Depends(get_session)):
+    user = await session.get(User, user_id)
 
-        return user
+    return user
 
 
 @user_router.put(
@@ -74,6 +79,7 @@ async def update_user(
     user_id: int,
     user_create: UserCreate,
     current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
 ):
     if current_user.id != user_id and not current_user.is_admin:
         raise HTTPException(
@@ -81,15 +87,16 @@ async def update_user(
             detail="You do not have permission to update this user.",
         )
 
-    with Session(db_engine) as session:
-        user = session.get(User, user_id)
-        user.is_admin = user_create.is_admin
+    user = await session.get(User, user_id)
+    user.is_admin = user_create.is_admin
 
-        if user_create.password:
-            user.hashed_password = get_password_hash(user_create.password)
+    if user_create.password:
+        user.hashed_password = await hash_password(user_create.password)
 
-        session.commit()
-        session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
+
+    invalidate_principal(user_id)
 
     return user
 
@@ -100,10 +107,11 @@ async def update_user(
     operation_id="delete_user",
     dependencies=[Depends(require_admin)],
 )
-async def delete_user(user_id: int):
-    with Session(db_engine) as session:
-        user = session.get(User, user_id)
-        session.delete(user)
-        session.commit()
+async def delete_user(user_id: int, session: AsyncSession = Depends(get_session)):
+    user = await session.get(User, user_id)
+    await session.delete(user)
+    await session.commit()
+
+    invalidate_principal(user_id)
 
     return user_id
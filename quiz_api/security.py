@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
@@ -5,17 +6,30 @@ import bcrypt
 import jwt
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session, select
-from starlette.status import HTTP_401_UNAUTHORIZED
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.status import HTTP_401_UNAUTHORIZED, HTTP_429_TOO_MANY_REQUESTS
 
+from quiz_api.cache import TTLCache
 from quiz_api.config import config
 from quiz_api.const import API_PREFIX, CRYPT_ALGORITHM
-from quiz_api.db import db_engine
+from quiz_api.db import get_session
+from quiz_api.hashing import HashPool, HashPoolSaturatedError
 from quiz_api.models import TokenData
 from quiz_api.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{API_PREFIX}/token")
 
+principal_cache: TTLCache[str, User] = TTLCache(
+    "principal", maxsize=config.principal_cache_size, ttl=config.principal_cache_ttl
+)
+
+hash_pool = HashPool(
+    executor_type=config.hash_executor,
+    workers=config.hash_workers,
+    queue_size=config.hash_queue_size,
+)
+
 
 def get_password_hash(password):
     pwd_bytes = password.encode("utf-8")
@@ -29,17 +43,39 @@ def verify_password(plain_password, hashed_password):
     return bcrypt.checkpw(password=password_byte_enc, hashed_password=hashed_password)
 
 
-def get_user(username: str) -> User | None:
-    with Session(db_engine) as session:
-        user = session.exec(select(User).where(User.username == username)).first()
-        return user
+async def run_hash_pool(func, *args):
+    try:
+        return await hash_pool.run(func, *args)
+    except HashPoolSaturatedError:
+        raise HTTPException(
+            status_code=HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many concurrent password operations, try again later",
+            headers={"Retry-After": "1"},
+        )
+
+
+async def hash_password(password: str) -> bytes:
+    return await run_hash_pool(get_password_hash, password)
+
+
+async def check_password(plain_password: str, hashed_password) -> bool:
+    return await run_hash_pool(verify_password, plain_password, hashed_password)
 
 
-def authenticate_user(username: str, password: str) -> User | bool:
-    user = get_user(username)
+async def get_user(session: AsyncSession, username: str) -> User | None:
+    user = (await session.exec(select(User).where(User.username == username))).first()
+    return user
+
+
+async def authenticate_user(
+    session: AsyncSession, username: str, password: str
+) -> User | bool:
+    user = await get_user(session, username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    # Release the connection while the password is being checked.
+    await session.commit()
+    if not await check_password(password, user.hashed_password):
         return False
     return user
 
@@ -60,7 +96,20 @@ def create_access_token(
     return encoded_jwt
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> User:
+def invalidate_principal(user_id: int) -> None:
+    """Drop all cached principals of a user."""
+
+    principal_cache.invalidate_where(lambda user: user.id == user_id)
+
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> User:
+    cached_user = principal_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
     credentials_exception = HTTPException(
         status_code=HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -77,10 +126,18 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
     except jwt.InvalidTokenError:
         raise credentials_exception
 
-    user = get_user(username=token_data.username)
+    user = await get_user(session, username=token_data.username)
     if user is None or user.is_admin != token_data.is_admin:
         raise credentials_exception
 
+    principal = User(
+        id=user.id,
+        username=user.username,
+        is_admin=user.is_admin,
+        hashed_password=user.hashed_password,
+    )
+    principal_cache.set(token, principal, ttl=payload["exp"] - time.time())
+
     return user
 
 
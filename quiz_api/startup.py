@@ -0,0 +1,154 @@
+"""Startup tasks for the quiz-api application."""
+
+import hashlib
+import hmac
+import json
+import os
+import time
+from pathlib import Path
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from quiz_api.config import config
+from quiz_api.db import Database, async_db_engine
+from quiz_api.log import logger
+from quiz_api.models import User
+from quiz_api.processes import get_startup_lock_path, startup_lock
+from quiz_api.security import check_password, get_user, hash_password
+
+
+def read_startup_state(path: Path) -> dict:
+    """Read the state left by a previous startup."""
+
+    try:
+        with open(path, "r", encoding="utf-8") as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_startup_state(path: Path, state: dict) -> None:
+    """Write the state for the next startup."""
+
+    temp_path = path.with_name(f"{path.name}.tmp")
+
+    with open(temp_path, "w", encoding="utf-8") as state_file:
+        json.dump(state, state_file)
+
+    os.replace(temp_path, path)
+
+
+def get_user_digest(username: str, password: str, hashed_password) -> str:
+    """Get a digest binding a configured password to a stored hash.
+
+    A matching digest from a previous startup proves the stored hash was
+    already verified against the configured password, so bcrypt is skipped.
+    """
+
+    if isinstance(hashed_password, str):
+        hashed_password = hashed_password.encode("utf-8")
+
+    message = b"\0".join(
+        [username.encode("utf-8"), password.encode("utf-8"), hashed_password]
+    )
+    return hmac.new(
+        config.secret_key.encode("utf-8"), message, hashlib.sha256
+    ).hexdigest()
+
+
+async def seed_user(
+    session: AsyncSession,
+    username: str,
+    password: str,
+    is_admin: bool,
+    verified_digests: set[str],
+) -> str:
+    """Create a user or update its password if the configured one changed."""
+
+    user = await get_user(session, username)
+
+    if user is None:
+        user = User(
+            username=username,
+            hashed_password=await hash_password(password),
+            is_admin=is_admin,
+        )
+        session.add(user)
+        logger.info(f"Created user '{username}'.")
+
+        return get_user_digest(username, password, user.hashed_password)
+
+    digest = get_user_digest(username, password, user.hashed_password)
+
+    if digest not in verified_digests and not await check_password(
+        password, user.hashed_password
+    ):
+        user.hashed_password = await hash_password(password)
+        session.add(user)
+        logger.info(f"Updated password of user '{username}'.")
+
+        digest = get_user_digest(username, password, user.hashed_password)
+
+    return digest
+
+
+def prepare_db() -> None:
+    """Create or migrate the database."""
+
+    if Database.is_empty():
+        Database.create_db()
+        Database.stamp_db()
+    elif not Database.is_up_to_date():
+        Database.create_db()
+
+        try:
+            Database.run_migrations()
+        except Exception as e:
+            logger.error(f"Error running migrations: {e}")
+
+
+async def seed_users() -> None:
+    """Create the configured users and keep their passwords up to date."""
+
+    state_path = Path(config.startup_state_path)
+    state = read_startup_state(state_path)
+    verified_digests = set(state.get("users", []))
+
+    async with AsyncSession(async_db_engine, expire_on_commit=False) as session:
+        digests = [
+            await seed_user(
+                session,
+                config.test_username,
+                config.test_password,
+                False,
+                verified_digests,
+            ),
+            await seed_user(
+                session,
+                config.admin_username,
+                config.admin_password,
+                True,
+                verified_digests,
+            ),
+        ]
+        await session.commit()
+
+    if set(digests) != verified_digests:
+        write_startup_state(state_path, {"users": digests})
+
+
+async def run_startup() -> dict[str, float]:
+    """Run the startup tasks and return the time spent on each."""
+
+    timings: dict[str, float] = {}
+
+    with startup_lock(get_startup_lock_path()):
+        start = time.perf_counter()
+        prepare_db()
+        timings["database"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await seed_users()
+        timings["users"] = time.perf_counter() - start
+
+    return timings
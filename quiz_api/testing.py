@@ -0,0 +1,170 @@
+"""Test utilities for the quiz-api application.
+
+Statements are recorded from the cursor events of both database engines, so
+everything issued while a recorder is active is counted, including the
+statements of background jobs running at the same time.
+"""
+
+import json
+import textwrap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import urlsplit
+
+from fastapi import FastAPI
+from sqlalchemy import event
+from starlette.routing import Match
+
+from quiz_api.const import SLOW_QUERY_LOG_WIDTH
+from quiz_api.db import async_db_engine, db_engine
+
+
+class StatementRecorder:
+    """Record the SQL statements issued through the database engines."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self) -> "StatementRecorder":
+        for engine in (db_engine, async_db_engine.sync_engine):
+            event.listen(engine, "before_cursor_execute", self.record)
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for engine in (db_engine, async_db_engine.sync_engine):
+            event.remove(engine, "before_cursor_execute", self.record)
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def describe(self) -> str:
+        """Describe the recorded statements, one per line."""
+
+        return "\n".join(
+            f"{number}. {textwrap.shorten(statement, SLOW_QUERY_LOG_WIDTH)}"
+            for number, statement in enumerate(self.statements, start=1)
+        )
+
+
+@contextmanager
+def assert_statements(
+    exactly: int | None = None, at_most: int | None = None
+) -> Iterator[StatementRecorder]:
+    """Assert the number of statements issued inside the block."""
+
+    with StatementRecorder() as recorder:
+        yield recorder
+
+    if exactly is not None and len(recorder) != exactly:
+        raise AssertionError(
+            f"Expected {exactly} statements, got {len(recorder)}:\n{recorder.describe()}"
+        )
+
+    if at_most is not None and len(recorder) > at_most:
+        raise AssertionError(
+            f"Expected at most {at_most} statements, got {len(recorder)}:\n"
+            f"{recorder.describe()}"
+        )
+
+
+def get_operation_id(app: FastAPI, method: str, url: str) -> str:
+    """Get the operation ID of the route a request would be routed to."""
+
+    scope = {"type": "http", "method": method.upper(), "path": urlsplit(url).path}
+
+    for route in app.routes:
+        match, _ = route.matches(scope)
+
+        if match == Match.FULL:
+            return getattr(route, "operation_id", None) or route.name
+
+    raise ValueError(f"No route matches {method.upper()} {url}.")
+
+
+class QuerySnapshot:
+    """Maximum statement counts per operation ID, stored in a JSON file.
+
+    In update mode, requests record their statement counts instead of being
+    checked, and saving writes the highest count seen for every operation.
+    Operations of the application without a count are written as null, so
+    the file lists every operation ID and missing ones stand out.
+    """
+
+    def __init__(self, app: FastAPI, path: Path, update: bool = False):
+        self.app = app
+        self.path = path
+        self.update = update
+        self.counts: dict[str, int | None] = {}
+
+        if path.exists():
+            self.counts = json.loads(path.read_text(encoding="utf-8"))
+
+        if update:
+            self.counts = {}
+
+    def get_operation_ids(self) -> list[str]:
+        """Get the operation IDs of the application."""
+
+        return sorted(
+            route.operation_id
+            for route in self.app.routes
+            if getattr(route, "operation_id", None)
+        )
+
+    def get_missing(self) -> list[str]:
+        """Get the operation IDs without a statement count."""
+
+        return [
+            operation_id
+            for operation_id in self.get_operation_ids()
+            if self.counts.get(operation_id) is None
+        ]
+
+    def check(self, operation_id: str, recorder: StatementRecorder) -> None:
+        """Check the statements of an operation against its count."""
+
+        if self.update:
+            self.counts[operation_id] = max(
+                self.counts.get(operation_id) or 0, len(recorder)
+            )
+            return
+
+        expected = self.counts.get(operation_id)
+
+        if expected is None:
+            raise AssertionError(
+                f"No statement count of {operation_id} in {self.path}, update the "
+                f"snapshot to record it."
+            )
+
+        if len(recorder) > expected:
+            raise AssertionError(
+                f"{operation_id} issued {len(recorder)} statements, at most "
+                f"{expected} are expected:\n{recorder.describe()}"
+            )
+
+    def request(self, client, method: str, url: str, **kwargs):
+        """Send a request through a test client and check its statements."""
+
+        operation_id = get_operation_id(self.app, method, url)
+
+        with StatementRecorder() as recorder:
+            response = client.request(method, url, **kwargs)
+
+        self.check(operation_id, recorder)
+
+        return response
+
+    def save(self) -> None:
+        """Write the statement counts of every operation of the application."""
+
+        counts = {
+            operation_id: self.counts.get(operation_id)
+            for operation_id in self.get_operation_ids()
+        }
+        self.path.write_text(json.dumps(counts, indent=2) + "\n", encoding="utf-8")
@@ -0,0 +1,102 @@
+"""Fixtures for the quiz-api tests.
+
+The application reads its config on import, so the config of a temporary
+directory is written first and every test session gets a fresh database.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from quiz_api.benchmarks.environment import ADMIN_PASSWORD, TEST_PASSWORD, write_config
+
+test_path = Path(tempfile.mkdtemp(prefix="quiz-api-test-"))
+
+# Jobs stay pending and nothing is cached, so every run of the tests issues the
+# same statements.
+os.environ["CONFIG_PATH"] = str(
+    write_config(
+        test_path,
+        job_workers=0,
+        principal_cache_size=0,
+        quiz_document_cache_size=0,
+        answer_key_cache_size=0,
+    )
+)
+
+from quiz_api.__main__ import app  # noqa: E402
+from quiz_api.testing import QuerySnapshot, StatementRecorder  # noqa: E402
+
+QUERY_SNAPSHOT_PATH = Path(__file__).with_name("query-snapshot.json")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(test_path, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    """Client of the application, started for the whole session."""
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def query_snapshot() -> Iterator[QuerySnapshot]:
+    """Check statement counts against the snapshot next to the tests.
+
+    The snapshot is rewritten at the end of the session when
+    UPDATE_QUERY_SNAPSHOT is set.
+    """
+
+    snapshot = QuerySnapshot(
+        app, QUERY_SNAPSHOT_PATH, update=bool(os.getenv("UPDATE_QUERY_SNAPSHOT"))
+    )
+    yield snapshot
+
+    if snapshot.update:
+        snapshot.save()
+
+
+@pytest.fixture
+def statement_recorder() -> Iterator[StatementRecorder]:
+    """Record the statements issued during a test."""
+
+    with StatementRecorder() as recorder:
+        yield recorder
+
+
+def login(
+    client: TestClient, query_snapshot: QuerySnapshot, username: str, password: str
+) -> dict[str, str]:
+    """Log in and get the headers authenticating as the user."""
+
+    response = query_snapshot.request(
+        client,
+        "POST",
+        "/api/token",
+        data={"username": username, "password": password},
+    )
+    assert response.status_code == 200, response.text
+
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client, query_snapshot) -> dict[str, str]:
+    """Headers authenticating as the admin user."""
+
+    return login(client, query_snapshot, "admin", ADMIN_PASSWORD)
+
+
+@pytest.fixture(scope="session")
+def test_headers(client, query_snapshot) -> dict[str, str]:
+    """Headers authenticating as the test user."""
+
+    return login(client, query_snapshot, "test", TEST_PASSWORD)
@@ -0,0 +1,50 @@
+"""Tests of the database helpers."""
+
+import asyncio
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from quiz_api.db import insert_values
+from quiz_api.models import SingleChoiceOption
+
+
+def test_insert_values_pairs_ids_with_rows():
+    values = [
+        {"text": text, "index": index, "question_id": question_id}
+        for question_id, index, text in [(2, 0, "a"), (1, 0, "a"), (2, 0, "a")]
+        + [(1, index, f"Option {index}") for index in range(1, 50)]
+    ]
+
+    async def run() -> tuple[list[int], dict[int, dict], list[str]]:
+        engine = create_async_engine("sqlite+aiosqlite://")
+        statements: list[str] = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        async with engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+
+        statements.clear()
+
+        async with AsyncSession(engine) as session:
+            row_ids = await insert_values(session, SingleChoiceOption, values)
+            rows = {
+                row.id: row.model_dump(exclude={"id"})
+                for row in (await session.exec(select(SingleChoiceOption))).all()
+            }
+
+        await engine.dispose()
+
+        return row_ids, rows, statements
+
+    row_ids, rows, statements = asyncio.run(run())
+
+    assert len(set(row_ids)) == len(values)
+    assert [rows[row_id] for row_id in row_ids] == values
+    assert sum(statement.startswith("INSERT") for statement in statements) == 1
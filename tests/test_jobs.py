@@ -0,0 +1,106 @@
+"""Tests of the background job runner."""
+
+import asyncio
+from typing import Iterator
+
+import pytest
+from pydantic import BaseModel
+
+from quiz_api.jobs import (
+    FINISHED_STATUSES,
+    JobContext,
+    JobRunner,
+    MemoryJobStore,
+    job_handlers,
+)
+from quiz_api.models import Job
+
+
+class DoubleParams(BaseModel):
+    value: int
+
+
+async def run_double(context: JobContext, params: DoubleParams):
+    return {"value": params.value * 2}
+
+
+@pytest.fixture
+def double_job() -> Iterator[str]:
+    """Register a job kind doubling a number."""
+
+    job_handlers["double"] = (DoubleParams, run_double)
+    yield "double"
+    job_handlers.pop("double")
+
+
+class FlakyJobStore(MemoryJobStore):
+    """Memory job store failing to claim the first job."""
+
+    def __init__(self):
+        super().__init__(history_size=10)
+        self.claim_failures = 1
+
+    async def claim(self) -> Job:
+        if self.claim_failures:
+            self.claim_failures -= 1
+            raise OSError("database is locked")
+
+        return await super().claim()
+
+
+def create_runner(store: MemoryJobStore | None = None) -> JobRunner:
+    return JobRunner(
+        store or MemoryJobStore(history_size=10), workers=1, heartbeat_interval=0.01
+    )
+
+
+async def run_job(runner: JobRunner, job: Job) -> Job:
+    """Start the runner, add a job once the workers wait for one and finish it."""
+
+    runner.start()
+
+    try:
+        await asyncio.sleep(0)
+        job = await runner.store.add(job)
+
+        async with asyncio.timeout(5):
+            while job.status not in FINISHED_STATUSES:
+                await asyncio.sleep(0.01)
+    finally:
+        await runner.stop()
+
+    return job
+
+
+def test_runner_restarts_on_new_event_loop(double_job):
+    runner = create_runner()
+
+    for value in (1, 2):
+        job = asyncio.run(
+            run_job(runner, Job(kind=double_job, params={"value": value}))
+        )
+
+        assert job.status == "succeeded"
+        assert job.result == {"value": value * 2}
+
+
+def test_worker_survives_claim_errors(double_job):
+    runner = create_runner(FlakyJobStore())
+
+    job = asyncio.run(run_job(runner, Job(kind=double_job, params={"value": 1})))
+
+    assert job.status == "succeeded"
+
+
+@pytest.mark.parametrize(
+    "kind, params, error",
+    [
+        ("missing", {}, "Unknown job kind 'missing'."),
+        ("double", {"value": "two"}, "validation error"),
+    ],
+)
+def test_invalid_jobs_fail(double_job, kind, params, error):
+    job = asyncio.run(run_job(create_runner(), Job(kind=kind, params=params)))
+
+    assert job.status == "failed"
+    assert error in job.error
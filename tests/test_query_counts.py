@@ -0,0 +1,293 @@
+"""Statement counts of every operation of the quiz-api application.
+
+Each operation is called through the query snapshot, which fails when it
+issues more statements than recorded in tests/query-snapshot.json. Run the
+tests with UPDATE_QUERY_SNAPSHOT=1 to record the counts again.
+"""
+
+import pytest
+
+QUESTION_TYPES = ["single_choice", "multiple_choice", "open", "assignment", "gap_text"]
+
+QUESTION_FIELDS = {
+    "single_choice": {"correct_index": 0},
+    "multiple_choice": {"correct_indices": [0, 1]},
+    "open": {},
+    "assignment": {"correct_indices": [1, 0]},
+    "gap_text": {"correct_indices": [0]},
+}
+
+OPTION_FIELDS = {
+    "single_choice": {},
+    "multiple_choice": {},
+    "open": {},
+    "assignment": {"correct_index": 0},
+    "gap_text": {},
+}
+
+ANSWER_FIELDS = {
+    "single_choice": {"selected_index": 0},
+    "multiple_choice": {"selected_indices": [0]},
+    "open": {"text": "First option"},
+    "assignment": {"selected_indices": [1, 0]},
+    "gap_text": {"selected_indices": [0]},
+}
+
+
+def request(query_snapshot, client, method: str, url: str, headers, **kwargs):
+    """Send a request through the snapshot and check that it succeeded."""
+
+    response = query_snapshot.request(client, method, url, headers=headers, **kwargs)
+    assert response.is_success, response.text
+
+    return response
+
+
+def check_crud(
+    query_snapshot, client, headers, prefix: str, body: dict, delete: bool = True
+) -> None:
+    """Create, read, update and delete a resource."""
+
+    created = request(query_snapshot, client, "POST", prefix, headers, json=body)
+    resource_id = created.json()["id"]
+
+    request(query_snapshot, client, "GET", prefix, headers)
+    request(query_snapshot, client, "GET", f"{prefix}/{resource_id}", headers)
+    request(
+        query_snapshot, client, "PUT", f"{prefix}/{resource_id}", headers, json=body
+    )
+
+    if delete:
+        request(query_snapshot, client, "DELETE", f"{prefix}/{resource_id}", headers)
+
+
+def make_options(question_type: str) -> list[dict]:
+    return [
+        {"text": text, "index": index, **OPTION_FIELDS[question_type]}
+        for index, text in enumerate(["First option", "Second option"])
+    ]
+
+
+def make_question(question_type: str, index: int) -> dict:
+    question = {
+        "title": f"Question {index}",
+        "text": f"Text of question {index}",
+        "index": index,
+        **QUESTION_FIELDS[question_type],
+    }
+
+    if question_type == "gap_text":
+        question["gap_text_sub_questions"] = [
+            {"index": 0, "gap_text_options": make_options(question_type)}
+        ]
+    else:
+        question[f"{question_type}_options"] = make_options(question_type)
+
+    return question
+
+
+@pytest.fixture(scope="module")
+def quiz(client, query_snapshot, admin_headers) -> dict:
+    """Quiz with two questions of every type, their options and a label."""
+
+    document = {
+        "title": "Quiz",
+        "labels": [{"text": "Imported"}],
+        **{
+            f"{question_type}_questions": [
+                make_question(question_type, index) for index in range(2)
+            ]
+            for question_type in QUESTION_TYPES
+        },
+    }
+    summary = request(
+        query_snapshot, client, "POST", "/api/quiz/import", admin_headers, json=document
+    ).json()
+
+    return request(
+        query_snapshot, client, "GET", f"/api/quiz/{summary['id']}", admin_headers
+    ).json()
+
+
+def make_answers(quiz: dict) -> dict:
+    return {
+        f"{question_type}_answers": [
+            {"question_id": question["id"], **ANSWER_FIELDS[question_type]}
+            for question in quiz[f"{question_type}_questions"]
+        ]
+        for question_type in QUESTION_TYPES
+    }
+
+
+@pytest.fixture(scope="module")
+def result(client, query_snapshot, test_headers, quiz) -> dict:
+    """Result of the test user answering every question of the quiz."""
+
+    return request(
+        query_snapshot,
+        client,
+        "POST",
+        f"/api/quiz/{quiz['id']}/submit",
+        test_headers,
+        json=make_answers(quiz),
+    ).json()
+
+
+def test_quizzes(client, query_snapshot, admin_headers, test_headers, quiz, result):
+    request(query_snapshot, client, "GET", "/api/quiz", test_headers)
+    request(query_snapshot, client, "GET", "/api/quiz/summary", test_headers)
+    request(query_snapshot, client, "GET", "/api/quiz/export", test_headers)
+    request(
+        query_snapshot,
+        client,
+        "GET",
+        f"/api/quiz/{quiz['id']}/results",
+        test_headers,
+    )
+    request(
+        query_snapshot,
+        client,
+        "POST",
+        f"/api/quiz/{quiz['id']}/regrade",
+        admin_headers,
+    )
+    check_crud(query_snapshot, client, admin_headers, "/api/quiz", {"title": "Created"})
+
+
+def test_results(client, query_snapshot, admin_headers, test_headers, quiz, result):
+    request(query_snapshot, client, "GET", "/api/result", admin_headers)
+    request(query_snapshot, client, "GET", "/api/result/export", admin_headers)
+
+    # Deleting a result keeps its answers without a result, so this one has none.
+    submitted = request(
+        query_snapshot,
+        client,
+        "POST",
+        f"/api/quiz/{quiz['id']}/submit",
+        test_headers,
+        json={},
+    ).json()
+    request(
+        query_snapshot,
+        client,
+        "DELETE",
+        f"/api/result/{submitted['id']}",
+        admin_headers,
+    )
+
+
+def test_users(client, query_snapshot, admin_headers, test_headers):
+    request(query_snapshot, client, "GET", "/api/user/me", test_headers)
+    check_crud(
+        query_snapshot,
+        client,
+        admin_headers,
+        "/api/user",
+        {"username": "created", "password": "created", "is_admin": False},
+    )
+
+
+def test_labels(client, query_snapshot, admin_headers, quiz):
+    label = request(
+        query_snapshot,
+        client,
+        "POST",
+        "/api/label",
+        admin_headers,
+        json={"text": "Removed", "quiz_ids": [quiz["id"]]},
+    ).json()
+    request(
+        query_snapshot,
+        client,
+        "DELETE",
+        f"/api/label/{label['id']}/quiz/{quiz['id']}",
+        admin_headers,
+    )
+    check_crud(
+        query_snapshot,
+        client,
+        admin_headers,
+        "/api/label",
+        {"text": "Created", "quiz_ids": [quiz["id"]]},
+    )
+
+
+def test_jobs(client, query_snapshot, admin_headers):
+    job = request(
+        query_snapshot,
+        client,
+        "POST",
+        "/api/job",
+        admin_headers,
+        json={"kind": "delete_quiz", "params": {"quiz_ids": []}},
+    ).json()
+    request(query_snapshot, client, "GET", "/api/job", admin_headers)
+    request(query_snapshot, client, "GET", f"/api/job/{job['id']}", admin_headers)
+    request(
+        query_snapshot, client, "POST", f"/api/job/{job['id']}/cancel", admin_headers
+    )
+
+
+@pytest.mark.parametrize("question_type", QUESTION_TYPES)
+def test_questions(client, query_snapshot, admin_headers, quiz, question_type):
+    check_crud(
+        query_snapshot,
+        client,
+        admin_headers,
+        f"/api/{question_type}_question",
+        {
+            "title": "Created",
+            "text": "Created",
+            "index": 2,
+            "quiz_id": quiz["id"],
+            **QUESTION_FIELDS[question_type],
+        },
+    )
+
+
+def test_gap_text_sub_questions(client, query_snapshot, admin_headers, quiz):
+    check_crud(
+        query_snapshot,
+        client,
+        admin_headers,
+        "/api/gap_text_sub_question",
+        {"index": 1, "question_id": quiz["gap_text_questions"][0]["id"]},
+        delete=False,
+    )
+
+
+@pytest.mark.parametrize("question_type", QUESTION_TYPES)
+def test_options(client, query_snapshot, admin_headers, quiz, question_type):
+    question = quiz[f"{question_type}_questions"][0]
+
+    if question_type == "gap_text":
+        parent = {"sub_question_id": question["gap_text_sub_questions"][0]["id"]}
+    else:
+        parent = {"question_id": question["id"]}
+
+    check_crud(
+        query_snapshot,
+        client,
+        admin_headers,
+        f"/api/{question_type}_option",
+        {"text": "Created", "index": 2, **parent, **OPTION_FIELDS[question_type]},
+    )
+
+
+@pytest.mark.parametrize("question_type", QUESTION_TYPES)
+def test_answers(client, query_snapshot, admin_headers, quiz, result, question_type):
+    check_crud(
+        query_snapshot,
+        client,
+        admin_headers,
+        f"/api/{question_type}_answer",
+        {
+            "result_id": result["id"],
+            "question_id": quiz[f"{question_type}_questions"][0]["id"],
+            **ANSWER_FIELDS[question_type],
+        },
+    )
+
+
+def test_every_operation_is_counted(query_snapshot):
+    assert query_snapshot.get_missing() == []